@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Activity Classifier for Trading Project 002
+סיווג פקודות ופעילויות לפי טבלת כללים - כל מילות המפתח מקומפלות לביטוי רגולרי אחד
+"""
+
+import re
+from collections import namedtuple
+
+# מילים שמקשרות פקודה ל-Claude או לפרויקט - רק פקודות כאלה נכנסות ליומן
+CLAUDE_KEYWORDS = ('claude', 'anthropic', 'claude-code', 'npx @anthropic-ai/claude-code',
+                   'trading project', 'project 002')
+
+# פעילות רלוונטית לפרויקט (בפקודה או בתיאור שלה)
+PROJECT_KEYWORDS = ('trading', 'project', '002', 'claude', 'mstr', 'html', 'dashboard', 'automation')
+
+# כללי סיווג לפי סדר עדיפות: (קטגוריה, חלופות, תיאור) - כלל מתאים אם כל המילים
+# של אחת החלופות מופיעות בפקודה
+COMMAND_RULES = (
+    ('claude_code', (('claude-code',), ('npx @anthropic-ai',)), "הפעלת Claude Code"),
+    ('git_commit', (('git', 'commit'),), "ביצוע Git commit"),
+    ('git_push', (('git', 'push'),), "ביצוע Git push"),
+    ('git_pull', (('git', 'pull'),), "ביצוע Git pull"),
+    ('git', (('git',),), "פעילות Git"),
+    ('python', (('python',), ('.py',)), "הרצת סקריפט Python"),
+    ('mkdir', (('mkdir',), ('md ',)), "יצירת תיקייה"),
+    ('new_file', (('touch',), ('new-item',)), "יצירת קובץ חדש"),
+    ('edit', (('edit',), ('code',)), "עריכת קבצים"),
+)
+
+# הישגים לפי תיאור הפעילות - אותו מבנה; {file} מוחלף בשם הקובץ של הפעילות
+ACHIEVEMENT_RULES = (
+    ('commit', (('commit',),), "ביצוע שמירה בגיט"),
+    ('file_update', (('קובץ', 'עודכן'),), "עדכון קובץ: {file}"),
+    ('claude', (('claude',),), "שימוש במערכת Claude Code"),
+    ('python', (('python',),), "הרצת סקריפט Python"),
+)
+
+Classification = namedtuple('Classification', 'category description mentions_claude relevant')
+
+
+def _rule_keywords(rules):
+    return {keyword for _, alternatives, _ in rules for alternative in alternatives for keyword in alternative}
+
+
+def trie_pattern(keywords):
+    """ביטוי רגולרי אחד לכל המילים, בצורת עץ תחיליות - "c(?:laude(?:-code)?|ommit)"
+
+    בכל מקום בטקסט נבדקת רק האות הראשונה מול קבוצה אחת, ולא כל המילים אחת אחרי
+    השנייה; המילה הארוכה ביותר שמתחילה במקום נתפסת.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    def __init__(self, keywords):
+        """כל מילות המפתח כביטוי אחד - מעבר יחיד על הטקסט מחזיר את כל המילים שבו
+
+        התוצאה היא מסכת ביטים (ביט לכל מילה). לכל מילה נדלקים גם הביטים של המילים
+        שמוכלות בה ("claude-code" מכילה את "claude" ואת "code").
+        """
+        self.keywords = sorted(set(keywords))
+        self.bits = {keyword: 1 << index for index, keyword in enumerate(self.keywords)}
+        self._pattern = re.compile(trie_pattern(self.keywords))
+        self._implied = {keyword: self.mask(other for other in self.keywords if other in keyword)
+                         for keyword in self.keywords}
+
+    def mask(self, keywords):
+        """מסכת הביטים של רשימת מילים"""
+        result = 0
+        for keyword in keywords:
+            result |= self.bits[keyword]
+        return result
+
+    def hits(self, text):
+        """מסכת מילות המפתח שמופיעות בטקסט (טקסט באותיות קטנות)"""
+        implied = self._implied
+        result = 0
+        for keyword in self._pattern.findall(text):
+            result |= implied[keyword]
+        return result
+
+
+class ActivityClassifier:
+    def __init__(self, command_rules=COMMAND_RULES, achievement_rules=ACHIEVEMENT_RULES,
+                 claude_keywords=CLAUDE_KEYWORDS, project_keywords=PROJECT_KEYWORDS):
+        """מסווג שמקומפל פעם אחת - סיווג, קשר ל-Claude ורלוונטיות בבדיקה אחת לכל שורה"""
+        self.matcher = KeywordMatcher(_rule_keywords(command_rules) | _rule_keywords(achievement_rules) |
+                                      set(claude_keywords) | set(project_keywords))
+        self.command_rules = self._compile_rules(command_rules)
+        self.achievement_rules = self._compile_rules(achievement_rules)
+        self.claude_mask = self.matcher.mask(claude_keywords)
+        self.project_mask = self.matcher.mask(project_keywords)
+
+        # רוב שורות ההיסטוריה לא קשורות ל-Claude - ביטוי קטן נפרד דוחה אותן בחיפוש אחד
+        self._claude_gate = re.compile(trie_pattern(claude_keywords)).search
+
+        # המילים שבתיאורים הקבועים מחושבות מראש
+        self._description_hits = {description: self.matcher.hits(description.lower())
+                                  for _, _, description in self.command_rules}
+
+        # הסיווג תלוי רק במסכה - שורות עם אותן מילות מפתח לא נבדקות שוב מול הכללים
+        self._by_mask = {}
+
+    def _compile_rules(self, rules):
+        """כל חלופה של כלל כמסכה - כלל מתאים אם כל הביטים של אחת החלופות דלוקים"""
+        return [(category, [self.matcher.mask(alternative) for alternative in alternatives], template)
+                for category, alternatives, template in rules]
+
+    @staticmethod
+    def _first_rule(rules, hits):
+        for category, masks, template in rules:
+            for required in masks:
+                if hits & required == required:
+                    return category, template
+        return None, None
+
+    def _classify_mask(self, hits):
+        """הסיווג של מסכה - Classification, או None לפקודה בלי כלל (התיאור שלה כולל אותה)"""
+        category, description = self._first_rule(self.command_rules, hits)
+        if category is None:
+            result = None
+        else:
+            result = Classification(category, description, bool(hits & self.claude_mask),
+                                    bool((hits | self._description_hits[description]) & self.project_mask))
+        self._by_mask[hits] = result
+        return result
+
+    def classify(self, command):
+        """סיווג פקודה (באותיות קטנות) - קטגוריה, תיאור, קשר ל-Claude ורלוונטיות לפרויקט"""
+        hits = self.matcher.hits(command)
+        result = self._by_mask[hits] if hits in self._by_mask else self._classify_mask(hits)
+        if result is None:
+            # התיאור מכיל את הפקודה עצמה - המילים שבו הן מילות הפקודה
+            result = Classification('terminal', f"פקודת טרמינל: {command[:50]}",
+                                    bool(hits & self.claude_mask), bool(hits & self.project_mask))
+        return result
+
+    def classify_command(self, command):
+        """כמו classify, אבל None לפקודה שלא קשורה ל-Claude או לפרויקט - בלי לסווג אותה"""
+        if self._claude_gate(command) is None:
+            return None
+        return self.classify(command)
+
+    def is_relevant(self, text):
+        """האם יש בטקסט מילה שקשורה לפרויקט"""
+        return bool(self.matcher.hits(text.lower()) & self.project_mask)
+
+    def achievement(self, description, file_name='קובץ'):
+        """ההישג שתיאור הפעילות מעיד עליו, או None"""
+        _, template = self._first_rule(self.achievement_rules, self.matcher.hits(description.lower()))
+        return template.format(file=file_name) if template else None
+
+
+# מסווג ברירת המחדל - מקומפל פעם אחת בטעינת המודול
+DEFAULT_CLASSIFIER = ActivityClassifier()
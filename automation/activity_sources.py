@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Activity Sources for Trading Project 002
+מקורות פעילות להיסטוריית הטרמינל - כל מקור מחזיר רשומות בעצלות (generator) עם זמן אמיתי
+"""
+
+import fnmatch
+import os
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from .history_tail import end_state, read_new_lines
+except ImportError:
+    from history_tail import end_state, read_new_lines
+
+# bash עם HISTTIMEFORMAT - שורת "#<epoch>" לפני כל פקודה
+BASH_TIMESTAMP = re.compile(r'#(\d{9,11})$')
+
+# zsh עם EXTENDED_HISTORY - ": <epoch>:<duration>;<command>"
+ZSH_ENTRY = re.compile(r': (\d{9,11}):\d+;(.*)$')
+
+# fish - רשומות YAML: "- cmd: ..." ואחריה "  when: <epoch>"
+FISH_COMMAND = '- cmd: '
+FISH_WHEN = re.compile(r'\s+when: (\d{9,11})$')
+
+
+class ActivitySource(ABC):
+    """מקור פעילות - מחלקת בסיס מופשטת (כל מקור מממש activities)
+
+    activities(since) מחזיר generator של רשומות {'type', 'source', 'command'/'description',
+    'timestamp'} חדשות מ-since בלבד. מקור שקורא קובץ היסטוריה ממשיך מה-state
+    שנשמר בריצה הקודמת, ואחרי שה-generator מוצה source.state הוא ה-state החדש.
+    """
+
+    name = 'source'
+
+    def __init__(self, path, state=None):
+        self.path = Path(path)
+        self.state = state
+
+    @property
+    def key(self):
+        """מפתח ה-state של המקור ב-last_conversation_update.json"""
+        return str(self.path)
+
+    def available(self):
+        return self.path.is_file()
+
+    @abstractmethod
+    def activities(self, since):
+        """generator של הרשומות החדשות מ-since"""
+
+    def _new_lines(self, since):
+        """השורות שנוספו מאז הקריאה הקודמת - בלי לקרוא בכלל קובץ שלא השתנה מאז since"""
+        try:
+            modified = datetime.fromtimestamp(self.path.stat().st_mtime)
+        except OSError:
+            return []
+
+        if modified <= since:
+            # כל מה שבקובץ ישן - רק מקדמים את ה-state לסוף הקובץ
+            self.state = end_state(self.path) or self.state
+            return []
+
+        lines, self.state, _ = read_new_lines(self.path, self.state)
+        return lines
+
+    def _command(self, command, timestamp):
+        return {'type': 'command', 'source': self.name, 'command': command, 'timestamp': timestamp}
+
+
+class PowerShellHistory(ActivitySource):
+    """PSReadLine - שורה לכל פקודה, בלי זמנים (הזמן הוא זמן השינוי של הקובץ)"""
+
+    name = 'powershell'
+
+    def activities(self, since):
+        lines = self._new_lines(since)
+        if not lines:
+            return
+        timestamp = datetime.fromtimestamp(self.path.stat().st_mtime)
+        for line in lines:
+            if line.strip():
+                yield self._command(line.strip(), timestamp)
+
+
+class BashHistory(ActivitySource):
+    """~/.bash_history - עם HISTTIMEFORMAT לכל פקודה יש זמן; בלעדיו - זמן השינוי של הקובץ"""
+
+    name = 'bash'
+
+    def activities(self, since):
+        lines = self._new_lines(since)
+        if not lines:
+            return
+        fallback = datetime.fromtimestamp(self.path.stat().st_mtime)
+        timestamp = None
+        for line in lines:
+            match = BASH_TIMESTAMP.match(line)
+            if match:
+                timestamp = datetime.fromtimestamp(int(match.group(1)))
+                continue
+            if not line.strip():
+                continue
+            when = timestamp or fallback
+            timestamp = None
+            if when > since:
+                yield self._command(line.strip(), when)
+
+
+class ZshHistory(ActivitySource):
+    """~/.zsh_history - EXTENDED_HISTORY; פקודה מרובת שורות ממשיכה אחרי "\\" בסוף שורה"""
+
+    name = 'zsh'
+
+    def activities(self, since):
+        lines = self._new_lines(since)
+        if not lines:
+            return
+        fallback = datetime.fromtimestamp(self.path.stat().st_mtime)
+        entry = None
+        for line in lines:
+            if entry is not None and entry[1].endswith('\\'):
+                entry = (entry[0], entry[1][:-1] + '\n' + line)
+                continue
+            if entry is not None and entry[0] > since:
+                yield self._command(entry[1].strip(), entry[0])
+
+            match = ZSH_ENTRY.match(line)
+            if match:
+                entry = (datetime.fromtimestamp(int(match.group(1))), match.group(2))
+            else:
+                entry = (fallback, line) if line.strip() else None
+        if entry is not None and entry[0] > since:
+            yield self._command(entry[1].strip(), entry[0])
+
+
+class FishHistory(ActivitySource):
+    """fish_history - "- cmd:" ואחריו "when:"; הפקודה מוחזרת כשה-when שלה נקרא"""
+
+    name = 'fish'
+
+    def activities(self, since):
+        command = None
+        for line in self._new_lines(since):
+            if line.startswith(FISH_COMMAND):
+                # fish שומר "\\n" ו-"\\\\" כ-escape בתוך הפקודה
+                command = line[len(FISH_COMMAND):].replace('\\n', '\n').replace('\\\\', '\\')
+                continue
+            match = FISH_WHEN.match(line)
+            if match and command is not None:
+                timestamp = datetime.fromtimestamp(int(match.group(1)))
+                if timestamp > since:
+                    yield self._command(command.strip(), timestamp)
+                command = None
+
+
+class ProjectLogs(ActivitySource):
+    """קבצי לוג בפרויקט שהשתנו מאז since ויש בסופם אזכור של claude או error
+
+    מעבר אחד על עץ התיקיות לכל התבניות יחד (בלי .git, __pycache__ ותיקיות נתונים),
+    וקריאה של הבלוק האחרון בלבד. ה-state שומר (mtime, גודל) לכל לוג שנקרא -
+    לוג שלא השתנה מאז מדולג לפי stat בלבד, ולוג שגדל נקרא רק מהמקום שבו נעצר.
+    """
+
+    name = 'logs'
+
+    LOG_PATTERNS = ['*.log', '*.txt', 'debug*', 'error*']
+
+    # תיקיות שלא נכנסים אליהן - קוד, מטמונים ונתונים גולמיים (לוגים של מאות MB)
+    PRUNE_DIRS = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', '.pytest_cache',
+                  'data', 'raw_data', 'fragment_cache', 'search', 'assets'}
+
+    # כמה תווים מסוף הלוג בודקים (ובלוק הבייטים שנקרא בשבילם)
+    TAIL_CHARS = 1000
+    TAIL_BYTES = 4 * TAIL_CHARS
+
+    # תבנית אחת לכל התבניות - התאמה אחת לכל שם קובץ
+    _pattern = re.compile('|'.join(fnmatch.translate(pattern) for pattern in LOG_PATTERNS))
+
+    def available(self):
+        return self.path.is_dir()
+
+    def _log_files(self):
+        """כל קבצי הלוג בעץ - (entry, נתיב יחסי) - במעבר אחד עם scandir"""
+        pending = [self.path]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as scan:
+                    entries = list(scan)
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in self.PRUNE_DIRS:
+                            pending.append(entry.path)
+                    elif self._pattern.match(os.path.normcase(entry.name)) and entry.is_file():
+                        yield entry, os.path.relpath(entry.path, self.path)
+                except OSError:
+                    continue
+
+    def _read_tail(self, path, start, size):
+        """הטקסט שבין start לסוף הקובץ, לכל היותר הבלוק האחרון - בלי לקרוא את כל הלוג"""
+        with open(path, 'rb') as f:
+            start = max(start, size - self.TAIL_BYTES)
+            f.seek(start)
+            data = f.read(size - start)
+        return data.decode('utf-8', errors='replace')[-self.TAIL_CHARS:]
+
+    def activities(self, since):
+        since_ns = since.timestamp() * 1e9
+        seen = (self.state or {}).get('files', {})
+        files = {}
+        for entry, name in self._log_files():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if stat.st_mtime_ns <= since_ns:
+                continue
+
+            signature = [stat.st_mtime_ns, stat.st_size]
+            files[name] = signature
+            previous = seen.get(name)
+            if previous == signature:
+                continue
+
+            # לוג שגדל - רק מה שנוסף; לוג שקוצר או חדש - הבלוק האחרון
+            start = previous[1] if previous and previous[1] <= stat.st_size else 0
+            try:
+                content = self._read_tail(entry.path, start, stat.st_size).lower()
+            except OSError:
+                continue
+
+            if 'claude' in content or 'error' in content:
+                yield {
+                    'type': 'log_entry',
+                    'source': self.name,
+                    'file': entry.name,
+                    'timestamp': datetime.fromtimestamp(stat.st_mtime),
+                    'description': f"פעילות בלוג: {entry.name}"
+                }
+
+        self.state = {'files': files}
+
+
+def _data_home():
+    return Path(os.environ.get('XDG_DATA_HOME') or Path.home() / '.local' / 'share')
+
+
+def default_sources(project_root, states=None):
+    """כל המקורות שקיימים במחשב הזה - עם ה-state השמור של כל אחד"""
+    states = states or {}
+    home = Path.home()
+    candidates = [
+        PowerShellHistory(home / "AppData/Roaming/Microsoft/Windows/PowerShell/PSReadLine/ConsoleHost_history.txt"),
+        PowerShellHistory(home / ".local/share/powershell/PSReadLine/ConsoleHost_history.txt"),
+    ]
+    histfile = os.environ.get('HISTFILE')
+    if histfile:
+        candidates.append((ZshHistory if 'zsh' in Path(histfile).name else BashHistory)(histfile))
+    candidates += [
+        BashHistory(home / '.bash_history'),
+        ZshHistory(home / '.zsh_history'),
+        FishHistory(_data_home() / 'fish' / 'fish_history'),
+    ]
+
+    sources = []
+    seen = set()
+    for source in candidates:
+        # HISTFILE מצביע בדרך כלל על אחד מקבצי ברירת המחדל - כל קובץ נקרא פעם אחת
+        if source.key in seen or not source.available():
+            continue
+        seen.add(source.key)
+        source.state = states.get(source.key)
+        sources.append(source)
+
+    logs = ProjectLogs(project_root)
+    logs.state = states.get(logs.key)
+    sources.append(logs)
+    return sources
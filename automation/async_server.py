@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Asyncio Server Backend for Trading Project 002
+שרת asyncio עם HTTP/1.1 keep-alive - אותם נתיבים ואותו JSON כמו AutomationHandler
+"""
+
+import asyncio
+import io
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from .automation_server import (AutomationHandler, SSE_HEADERS, SSE_KEEPALIVE,
+                                    SSE_KEEPALIVE_SECONDS, format_event, parse_last_event_id)
+except ImportError:
+    from automation_server import (AutomationHandler, SSE_HEADERS, SSE_KEEPALIVE,
+                                   SSE_KEEPALIVE_SECONDS, format_event, parse_last_event_id)
+
+# מגבלות חיבור
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 10 * 1024 * 1024
+KEEPALIVE_TIMEOUT_SECONDS = 75
+
+
+class _LoopWriter(io.RawIOBase):
+    def __init__(self, loop, writer):
+        """wfile עבור ה-handler - כתיבה מ-thread של executor אל ה-StreamWriter של הלולאה"""
+        self._loop = loop
+        self._writer = writer
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if self._writer.is_closing():
+            # הלקוח התנתק - אותו סימן שה-handler מקבל מ-socket רגיל
+            raise BrokenPipeError('client disconnected')
+        data = bytes(data)
+        self._loop.call_soon_threadsafe(self._writer.write, data)
+        return len(data)
+
+
+class _LoopSubscriber:
+    def __init__(self, loop, maxsize):
+        """מנוי של ProgressBus שמעביר אירועים מכל thread אל asyncio.Queue בלולאה"""
+        self._loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def put_nowait(self, record):
+        self._loop.call_soon_threadsafe(self._put, record)
+
+    def _put(self, record):
+        if self.queue.full():
+            # מנוי איטי - זרוק את האירוע הישן ביותר, כמו בתור של ה-threading
+            self.queue.get_nowait()
+        self.queue.put_nowait(record)
+
+
+def _parse_head(raw_request):
+    """שורת הבקשה וה-headers (שמות באותיות קטנות) - (method, path, headers)"""
+    lines = raw_request.split(b'\r\n\r\n', 1)[0].split(b'\r\n')
+    parts = lines[0].decode('latin-1').split()
+    method, target = (parts[0], parts[1]) if len(parts) >= 2 else ('', '')
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(b':')
+        headers[name.strip().lower().decode('latin-1')] = value.strip().decode('latin-1')
+    return method, urllib.parse.urlparse(target).path.rstrip('/'), headers
+
+
+async def _until_closed(reader):
+    """ממתין עד שהלקוח סוגר את החיבור (מה שהוא שולח בינתיים נזרק)"""
+    try:
+        while await reader.read(4096):
+            pass
+    except ConnectionError:
+        pass
+
+
+class _BufferedAutomationHandler(AutomationHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def __init__(self, automation_server, raw_request, wfile, client_address):
+        """הרצת AutomationHandler על בקשה אחת שכבר נקראה מהחיבור"""
+        self._raw_request = raw_request
+        self._wfile = wfile
+        super().__init__(automation_server, None, client_address, None)
+
+    def setup(self):
+        self.rfile = io.BytesIO(self._raw_request)
+        self.wfile = self._wfile
+
+    def handle(self):
+        # בקשה אחת בכל פעם - ה-keep-alive מנוהל ע"י לולאת החיבור
+        self.close_connection = True
+        self.handle_one_request()
+
+    def finish(self):
+        pass
+
+
+class AsyncAutomationServer:
+    def __init__(self, automation_server, host='localhost', port=8080, max_workers=32):
+        """שרת asyncio - חיבורים רדומים וזרמי /events לא תופסים thread, רק בקשות קצרות רצות ב-executor"""
+        self.automation_server = automation_server
+        self.host = host
+        self.port = port
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='automation-http')
+        self._loop = None
+        self._server = None
+
+    def serve_forever(self):
+        """הפעלת לולאת האירועים עד לעצירה"""
+        asyncio.run(self._serve())
+
+    def shutdown(self):
+        """עצירת השרת (בטוח לקריאה מ-thread אחר)"""
+        if self._loop and self._server and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._server.close)
+
+    def server_close(self):
+        """שחרור ה-executor"""
+        self._executor.shutdown(wait=False)
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  limit=MAX_HEADER_BYTES)
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    async def _handle_connection(self, reader, writer):
+        """לולאת בקשות על חיבור אחד (keep-alive)"""
+        client_address = writer.get_extra_info('peername')
+        try:
+            while True:
+                raw_request = await self._read_request(reader)
+                if raw_request is None:
+                    break
+
+                method, path, headers = _parse_head(raw_request)
+                if method == 'GET' and path == '/events':
+                    # זרם ארוך - נשאר בלולאה כדי לא להחזיק worker לכל לקוח מחובר
+                    await self._stream_events(reader, writer, headers)
+                    break
+
+                wfile = _LoopWriter(self._loop, writer)
+                handler = await self._loop.run_in_executor(
+                    self._executor, _BufferedAutomationHandler,
+                    self.automation_server, raw_request, wfile, client_address)
+
+                await writer.drain()
+                if handler.close_connection:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # עצירת השרת - חיבורים רדומים נסגרים בשקט
+            pass
+        finally:
+            writer.close()
+
+    async def _stream_events(self, reader, writer, headers):
+        """זרם Server-Sent Events ישירות מהלולאה - ProgressBus → asyncio.Queue → StreamWriter"""
+        automation_server = self.automation_server
+        bus = automation_server.progress_bus
+        subscriber = _LoopSubscriber(self._loop, bus.subscriber_queue_size)
+        bus.subscribe(parse_last_event_id(headers.get('last-event-id')), subscriber)
+        closed = self._loop.create_task(_until_closed(reader))
+        getter = None
+
+        try:
+            head = ['HTTP/1.1 200 OK'] + [f'{name}: {value}' for name, value in SSE_HEADERS]
+            head.append('Connection: close')
+            writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+            await writer.drain()
+            automation_server.metrics.observe_response('GET', 200)
+
+            while not automation_server.stopping.is_set():
+                getter = self._loop.create_task(subscriber.queue.get())
+                done, _ = await asyncio.wait({getter, closed}, timeout=SSE_KEEPALIVE_SECONDS,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    writer.write(format_event(getter.result()))
+                elif closed in done:
+                    # הלקוח סגר את החיבור
+                    break
+                else:
+                    # שמירה על החיבור פתוח דרך proxies ודפדפנים
+                    writer.write(SSE_KEEPALIVE)
+                getter.cancel()
+                getter = None
+                await writer.drain()
+        finally:
+            bus.unsubscribe(subscriber)
+            closed.cancel()
+            if getter is not None:
+                getter.cancel()
+
+    async def _read_request(self, reader):
+        """קריאת בקשה שלמה (שורת בקשה, headers וגוף) - None אם החיבור נסגר או התייבש"""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEPALIVE_TIMEOUT_SECONDS)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return None
+
+        content_length = 0
+        for line in head.split(b'\r\n')[1:]:
+            name, _, value = line.partition(b':')
+            if name.strip().lower() == b'content-length':
+                try:
+                    content_length = int(value.strip())
+                except ValueError:
+                    return None
+
+        if content_length < 0 or content_length > MAX_BODY_BYTES:
+            return None
+
+        body = await reader.readexactly(content_length) if content_length else b''
+        return head + body
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Atomic File Writes for Trading Project 002
+כתיבת קבצים אטומית (קובץ זמני + rename) ודילוג על כתיבה כשהתוכן לא השתנה
+"""
+
+import os
+import tempfile
+
+
+def atomic_write_text(path, text):
+    """כתיבה אטומית - קורא לעולם לא רואה קובץ חצי כתוב"""
+    path = os.fspath(path)
+    directory = os.path.dirname(path) or '.'
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        # mkstemp יוצר קובץ פרטי (0600) - שומרים על ההרשאות של הקובץ הקיים
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except OSError:
+            mode = 0o644
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_text_if_changed(path, text, normalize=None):
+    """כתיבה רק אם התוכן שונה מהקיים - מחזיר True אם נכתב
+
+    normalize - פונקציה אופציונלית שמסירה שדות משתנים (כמו זמן יצירה) לפני ההשוואה
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            existing = f.read()
+    except (OSError, UnicodeDecodeError):
+        existing = None
+
+    if existing is not None:
+        if normalize is None and existing == text:
+            return False
+        if normalize is not None and normalize(existing) == normalize(text):
+            return False
+
+    atomic_write_text(path, text)
+    return True
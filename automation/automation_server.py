@@ -4,29 +4,62 @@ Automation Server for Trading Project 002
 שרת HTTP פשוט להפעלת כפתורי העדכון מהדשבורד
 """
 
-import os
+import argparse
+import functools
+import importlib
+import importlib.util
 import json
+import queue
 import threading
-from datetime import datetime
 from pathlib import Path
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import urllib.parse
 
-# Import הסקריפטים שלנו
+# Import הסקריפטים שלנו - מודולי הפעולות (markdown, requests) נטענים רק בשימוש הראשון
 try:
-    from . import update_documentation, update_conversations, github_manager
+    from .job_queue import JobQueue
+    from .progress import ProgressBus
+    from .static_files import StaticFileCache, negotiate_encoding, is_not_modified
+    from .metrics import AutomationMetrics
+    from .pipeline import Pipeline, Stage
 except ImportError:
-    import update_documentation
-    import update_conversations
-    import github_manager
+    from job_queue import JobQueue
+    from progress import ProgressBus
+    from static_files import StaticFileCache, negotiate_encoding, is_not_modified
+    from metrics import AutomationMetrics
+    from pipeline import Pipeline, Stage
+
+# שניות בין הודעות keepalive בזרם האירועים
+SSE_KEEPALIVE_SECONDS = 15
+SSE_KEEPALIVE = b': keepalive\n\n'
+
+# headers של תגובת /events - משותפים לשני מנועי השרת
+SSE_HEADERS = (
+    ('Content-Type', 'text/event-stream; charset=utf-8'),
+    ('Cache-Control', 'no-cache'),
+    ('Access-Control-Allow-Origin', '*'),
+)
+
+# קבצים סטטיים שנטענים ב-fetch מהדשבורד (אינדקס החיפוש) - רק הם מקבלים CORS
+CORS_STATIC_PREFIX = '/search/'
+
+def format_event(record):
+    """אירוע התקדמות כהודעת SSE (בייטים)"""
+    payload = json.dumps(dict(record['data'], time=record['time']), ensure_ascii=False)
+    return f"id: {record['id']}\nevent: {record['event']}\ndata: {payload}\n\n".encode('utf-8')
+
+def parse_last_event_id(value):
+    """ערך Last-Event-ID מהלקוח - מספר, או None אם חסר או לא תקין"""
+    return int(value) if value and value.isdigit() else None
 
 class AutomationHandler(BaseHTTPRequestHandler):
-    def __init__(self, project_root, *args, **kwargs):
-        self.project_root = project_root
+    def __init__(self, automation_server, *args, **kwargs):
+        self.automation_server = automation_server
+        self.project_root = automation_server.project_root
         super().__init__(*args, **kwargs)
     
     def do_POST(self):
-        """טיפול בבקשות POST מהכפתורים"""
+        """טיפול בבקשות POST מהכפתורים - הפעולה נשלחת לתור ומוחזר מזהה משימה"""
         try:
             # קרא נתונים מהבקשה
             content_length = int(self.headers.get('Content-Length', 0))
@@ -35,37 +68,182 @@ class AutomationHandler(BaseHTTPRequestHandler):
             
             action = data.get('action')
             
-            # הגדר headers לתגובה
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
+            if action not in self.automation_server.actions:
+                self._send_json(400, {'success': False, 'error': 'פעולה לא מזוהה'})
+                return
             
-            # בצע פעולה בהתאם לכפתור
-            if action == 'update_conversations':
-                result = self._handle_update_conversations()
-            elif action == 'update_docs':
-                result = self._handle_update_documentation()
-            elif action == 'github_sync':
-                result = self._handle_github_sync()
-            else:
-                result = {'success': False, 'error': 'פעולה לא מזוהה'}
+            # הגש את הפעולה לתור - התשובה חוזרת מיד
+            job, attached = self.automation_server.submit_action(action)
             
-            # החזר תגובה
-            response = json.dumps(result, ensure_ascii=False)
-            self.wfile.write(response.encode('utf-8'))
+            if job is None:
+                self._send_json(503, {'success': False, 'error': 'תור המשימות מלא - נסה שוב בעוד רגע'})
+                return
+            
+            self._send_json(202, {
+                'success': True,
+                'job_id': job.id,
+                'status': job.status,
+                'attached': attached,
+                'status_url': f'/jobs/{job.id}'
+            })
             
         except Exception as e:
             # טיפול בשגיאות
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
+            self._send_json(500, {
+                'success': False,
+                'error': f'שגיאת שרת: {str(e)}'
+            })
+    
+    def do_GET(self):
+        """טיפול בבקשות GET - מצב משימות, אירועים וקבצי HTML של הפרויקט"""
+        self._handle_get(include_body=True)
+    
+    def do_HEAD(self):
+        """טיפול בבקשות HEAD - אותם נתיבים ואותם headers כמו GET, בלי גוף"""
+        self._handle_get(include_body=False)
+    
+    def _handle_get(self, include_body):
+        try:
+            path = urllib.parse.urlparse(self.path).path.rstrip('/')
             
-            error_response = json.dumps({
+            if path == '/metrics':
+                self._send_metrics()
+            elif path == '/events':
+                if include_body:
+                    self._stream_events()
+                else:
+                    self.send_response(200)
+                    for name, value in SSE_HEADERS:
+                        self.send_header(name, value)
+                    self.end_headers()
+            elif path == '/jobs':
+                self._send_json(200, {
+                    'success': True,
+                    'jobs': self.automation_server.job_queue.list_jobs()
+                })
+            elif path.startswith('/jobs/'):
+                job = self.automation_server.job_queue.get(path[len('/jobs/'):])
+                if job is None:
+                    self._send_json(404, {'success': False, 'error': 'משימה לא נמצאה'})
+                else:
+                    self._send_json(200, dict(job.to_dict(), success=True))
+            else:
+                self._serve_static(path, include_body=include_body)
+                
+        except Exception as e:
+            self._send_json(500, {
                 'success': False,
                 'error': f'שגיאת שרת: {str(e)}'
-            }, ensure_ascii=False)
-            self.wfile.write(error_response.encode('utf-8'))
+            })
+    
+    def _send_metrics(self):
+        """מדדים בפורמט הטקסט של Prometheus"""
+        body = self.automation_server.metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+    
+    def _serve_static(self, path, include_body=True):
+        """הגשת קובץ סטטי עם ETag, 304 ודחיסה"""
+        static_files = self.automation_server.static_files
+        
+        file_path = static_files.resolve(urllib.parse.unquote(path))
+        entry = static_files.get(file_path) if file_path else None
+        
+        if entry is None:
+            self._send_json(404, {'success': False, 'error': 'נתיב לא נמצא'})
+            return
+        
+        encoding = negotiate_encoding(self.headers.get('Accept-Encoding'), entry)
+        
+        cors_origin = self._static_cors_origin(path)
+        
+        if is_not_modified(self.headers, entry):
+            self.send_response(304)
+            self._send_static_cors(path, cors_origin)
+            self.send_header('ETag', entry.etag(encoding))
+            self.send_header('Cache-Control', entry.cache_control)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+        
+        body = entry.encoded_body(encoding)
+        
+        self.send_response(200)
+        self.send_header('Content-Type', entry.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self._send_static_cors(path, cors_origin)
+        self.send_header('ETag', entry.etag(encoding))
+        self.send_header('Last-Modified', entry.last_modified)
+        self.send_header('Cache-Control', entry.cache_control)
+        self.send_header('Vary', 'Accept-Encoding')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        
+        if include_body:
+            self.wfile.write(body)
+    
+    def _static_cors_origin(self, path):
+        """ה-Origin שמותר לו לקרוא את הקובץ ב-fetch, או None
+
+        רק קבצי אינדקס החיפוש, ורק לדשבורד עצמו: file:// (Origin: null) או השרת המקומי.
+        כל אתר אחר שהמשתמש גולש אליו לא יכול לקרוא את התיעוד או את file_map.json.
+        """
+        if not path.startswith(CORS_STATIC_PREFIX):
+            return None
+        
+        origin = self.headers.get('Origin')
+        port = self.automation_server.port
+        allowed = {'null', f'http://localhost:{port}', f'http://127.0.0.1:{port}'}
+        return origin if origin in allowed else None
+    
+    def _send_static_cors(self, path, cors_origin):
+        if cors_origin:
+            self.send_header('Access-Control-Allow-Origin', cors_origin)
+        if path.startswith(CORS_STATIC_PREFIX):
+            # התגובה תלויה ב-Origin - מטמון הדפדפן לא ישתף אותה בין מקורות
+            self.send_header('Vary', 'Origin')
+    
+    def _stream_events(self):
+        """זרם Server-Sent Events של אירועי התקדמות"""
+        bus = self.automation_server.progress_bus
+        
+        subscriber = bus.subscribe(parse_last_event_id(self.headers.get('Last-Event-ID')))
+        
+        try:
+            self.send_response(200)
+            for name, value in SSE_HEADERS:
+                self.send_header(name, value)
+            self.end_headers()
+            self.close_connection = True
+            
+            idle_seconds = 0
+            while not self.automation_server.stopping.is_set():
+                try:
+                    record = subscriber.get(timeout=1)
+                except queue.Empty:
+                    idle_seconds += 1
+                    if idle_seconds >= SSE_KEEPALIVE_SECONDS:
+                        # שמירה על החיבור פתוח דרך proxies ודפדפנים
+                        self.wfile.write(SSE_KEEPALIVE)
+                        self.wfile.flush()
+                        idle_seconds = 0
+                    continue
+                
+                idle_seconds = 0
+                
+                self.wfile.write(format_event(record))
+                self.wfile.flush()
+                
+        except (BrokenPipeError, ConnectionResetError):
+            # הלקוח סגר את החיבור
+            pass
+        finally:
+            bus.unsubscribe(subscriber)
     
     def do_OPTIONS(self):
         """טיפול בבקשות preflight של CORS"""
@@ -73,15 +251,126 @@ class AutomationHandler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'POST, GET, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
+    def _send_json(self, status, payload):
+        """שליחת תגובת JSON"""
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        # HEAD - אותם headers (כולל Content-Length) בלי גוף
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+    
+    def log_request(self, code='-', size='-'):
+        """ספירת תגובות HTTP במקום הדפסה לקונסול"""
+        self.automation_server.metrics.observe_response(self.command, code)
+    
+    def log_message(self, format, *args):
+        """השתק לוגים מיותרים"""
+        pass
+
+class AutomationServer:
+    def __init__(self, project_root=None, port=8080, max_workers=2, backend='threading'):
+        """backend - 'threading' (ThreadingHTTPServer) או 'asyncio' (keep-alive, חיבורים רבים)"""
+        if project_root is None:
+            self.project_root = Path(__file__).parent.parent
+        else:
+            self.project_root = Path(project_root)
+        
+        self.port = port
+        self.backend = backend
+        self.server = None
+        self.stopping = threading.Event()
+        self.scheduler = None
+        
+        # מטמון קבצי HTML להגשה ישירה מהשרת
+        self.static_files = StaticFileCache(self.project_root)
+        
+        # ערוץ אירועי התקדמות - נצרך דרך GET /events ומזין את /metrics
+        self.metrics = AutomationMetrics()
+        self.progress_bus = ProgressBus()
+        self.progress_bus.add_listener(self.metrics.observe_event)
+        
+        # שירותים ארוכי-חיים - נוצרים בשימוש הראשון ושומרים מצב חם בין לחיצות
+        self._services = {}
+        self._services_lock = threading.Lock()
+        
+        # תור משימות - הפעולות הארוכות רצות מחוץ ל-thread שמשרת בקשות
+        self.job_queue = JobQueue(max_workers=max_workers, on_change=self._publish_job_event)
+        self.actions = {
+            'update_conversations': self._handle_update_conversations,
+            'update_docs': self._handle_update_documentation,
+            'github_sync': self._handle_github_sync,
+            'pipeline': self._handle_pipeline
+        }
+        
+    def create_handler(self):
+        """יצירת handler עם גישה לשרת"""
+        def handler(*args, **kwargs):
+            return AutomationHandler(self, *args, **kwargs)
+        return handler
+    
+    def _service(self, module_name, class_name):
+        """יצירה עצלה של שירות (כולל import של המודול שלו) - פעם אחת לכל חיי השרת
+
+        השירות משותף לכל הפעולות - ה-action (וה-stage בצינור) של האירועים שלו מגיעים
+        מההקשר של הקריאה (ProgressBus.context) ולא נקבעים ביצירה.
+        """
+        with self._services_lock:
+            service = self._services.get(module_name)
+            if service is None:
+                module = _import_action_module(module_name)
+                service = getattr(module, class_name)(
+                    self.project_root, progress=self.progress_bus.reporter())
+                self._services[module_name] = service
+            return service
+    
+    @property
+    def conversation_updater(self):
+        return self._service('update_conversations', 'ConversationUpdater')
+    
+    @property
+    def documentation_updater(self):
+        return self._service('update_documentation', 'DocumentationUpdater')
+    
+    @property
+    def github_manager(self):
+        return self._service('github_manager', 'GitHubManager')
+    
+    def submit_action(self, action, follow_up=False, **params):
+        """הגשת פעולה לתור המשימות - בקשות כפולות (אותה פעולה ואותם פרמטרים) מצטרפות לריצה הקיימת
+
+        follow_up - אם הריצה הקיימת כבר התחילה, לתזמן ריצה נוספת אחריה במקום להצטרף
+        """
+        func = functools.partial(self._run_action, action, params)
+        key = f"{action}:{json.dumps(params, sort_keys=True)}" if params else action
+        job, attached = self.job_queue.submit(action, func, key=key, follow_up=follow_up)
+        if job is not None:
+            self.metrics.observe_request(action, attached)
+        return job, attached
+    
+    def _run_action(self, action, params):
+        """הרצת פעולה (ב-thread של התור) - כל האירועים שהיא מדווחת מסומנים ב-action שלה"""
+        with self.progress_bus.context(action=action):
+            return self.actions[action](**params)
+    
+    def _publish_job_event(self, job):
+        """פרסום שינוי סטטוס משימה לערוץ האירועים"""
+        info = job.to_dict()
+        self.progress_bus.publish(f"job_{job.status}", job_id=job.id, action=job.action,
+                                  elapsed_ms=info['duration_ms'], error=job.error)
+    
     def _handle_update_conversations(self):
         """טיפול בעדכון יומן שיחות"""
         try:
             print("[CONV] מתחיל עדכון יומן שיחות...")
             
-            updater = update_conversations.ConversationUpdater(self.project_root)
-            result = updater.run_conversation_update()
+            result = self.conversation_updater.run_conversation_update()
             
             if result['success']:
                 return {
@@ -95,13 +384,12 @@ class AutomationHandler(BaseHTTPRequestHandler):
         except Exception as e:
             return {'success': False, 'error': f'שגיאה בעדכון שיחות: {str(e)}'}
     
-    def _handle_update_documentation(self):
-        """טיפול בעדכון תיעוד"""
+    def _handle_update_documentation(self, md_files=None):
+        """טיפול בעדכון תיעוד (md_files - רק הקבצים האלה, למשל מהמתזמן)"""
         try:
             print("[DOCS] מתחיל עדכון תיעוד...")
             
-            updater = update_documentation.DocumentationUpdater(self.project_root)
-            result = updater.run_full_update()
+            result = self.documentation_updater.run_full_update(md_files)
             
             if result['success']:
                 return {
@@ -116,19 +404,19 @@ class AutomationHandler(BaseHTTPRequestHandler):
         except Exception as e:
             return {'success': False, 'error': f'שגיאה בעדכון תיעוד: {str(e)}'}
     
-    def _handle_github_sync(self):
-        """טיפול בסינכרון GitHub"""
+    def _handle_github_sync(self, paths=None):
+        """טיפול בסינכרון GitHub (paths - רק הקבצים האלה ייכנסו ל-commit)"""
         try:
             print("[GITHUB] מתחיל סינכרון GitHub...")
             
-            manager = github_manager.GitHubManager(self.project_root)
+            manager = self.github_manager
             
             # בדוק אם Repository כבר קיים
             git_ok, _ = manager.check_git_setup()
             
             if git_ok:
                 # Repository קיים - בצע sync רגיל
-                if manager.sync_with_github():
+                if manager.sync_with_github(paths):
                     return {
                         'success': True,
                         'message': 'סינכרון עם GitHub הושלם',
@@ -153,43 +441,94 @@ class AutomationHandler(BaseHTTPRequestHandler):
         except Exception as e:
             return {'success': False, 'error': f'שגיאה בסינכרון GitHub: {str(e)}'}
     
-    def log_message(self, format, *args):
-        """השתק לוגים מיותרים"""
-        pass
-
-class AutomationServer:
-    def __init__(self, project_root=None, port=8080):
-        if project_root is None:
-            self.project_root = Path(__file__).parent.parent
-        else:
-            self.project_root = Path(project_root)
-        
-        self.port = port
-        self.server = None
-        
-    def create_handler(self):
-        """יצירת handler עם project_root"""
-        def handler(*args, **kwargs):
-            return AutomationHandler(self.project_root, *args, **kwargs)
-        return handler
+    def _handle_pipeline(self):
+        """טיפול בצינור מלא: שיחות → תיעוד → GitHub בבקשה אחת"""
+        try:
+            print("[PIPELINE] מתחיל צינור עדכון מלא...")
+            
+            pipeline = Pipeline([
+                Stage('update_conversations', self._stage_conversations),
+                Stage('update_docs', self._stage_documentation,
+                      depends_on=['update_conversations']),
+                Stage('github_sync', self._stage_github_sync,
+                      depends_on=['update_docs'], skip_if_unchanged=True)
+            ], progress=self.progress_bus.reporter(), context=self.progress_bus.context)
+            
+            result = pipeline.run()
+            stages = result['stages']
+            result['message'] = ' | '.join(f"{name}: {stages[name]['status']}" for name in result['order'])
+            return result
+            
+        except Exception as e:
+            return {'success': False, 'error': f'שגיאה בצינור העדכון: {str(e)}'}
+    
+    def _stage_conversations(self, inputs):
+        """שלב עדכון השיחות - מוסיף סשן ליומן אם נמצאה פעילות"""
+        result = self.conversation_updater.run_conversation_update()
+        changed = bool(result.get('session_created'))
+        changed_files = [self.conversation_updater.conversation_log.name, 'automation/sessions.jsonl']
+        return dict(result, changed=changed, changed_files=changed_files if changed else [])
+    
+    def _stage_documentation(self, inputs):
+        """שלב התיעוד - קבצי HTML ו-MD שעודכנו עוברים הלאה לסינכרון"""
+        result = self.documentation_updater.run_full_update()
+        changed_files = list(result.get('updated_files', [])) + list(result.get('source_files', []))
+        if result.get('files_updated') and result.get('stylesheet'):
+            changed_files.append(result['stylesheet'])
+        changed_files.extend(result.get('search_files', []))
+        if result.get('file_map_updated'):
+            changed_files.append('file_map.json')
+        return dict(result, changed=bool(result.get('files_updated')), changed_files=changed_files)
+    
+    def _stage_github_sync(self, inputs):
+        """שלב הסינכרון - commit רק לקבצים שהשלבים הקודמים שינו"""
+        paths = sorted({path for output in inputs.values() for path in output.get('changed_files', [])})
+        result = self._handle_github_sync(paths)
+        return dict(result, changed=result.get('success', False), changed_files=paths)
+    
+    def enable_scheduler(self, watch=True, intervals=None, debounce_seconds=2.0):
+        """הגדרת מתזמן רקע - מופעל יחד עם השרת"""
+        try:
+            from .scheduler import UpdateScheduler
+        except ImportError:
+            from scheduler import UpdateScheduler
+        self.scheduler = UpdateScheduler(self, watch=watch, intervals=intervals,
+                                         debounce_seconds=debounce_seconds)
+        return self.scheduler
     
     def start_server(self):
         """הפעלת השרת"""
         try:
-            handler = self.create_handler()
-            self.server = HTTPServer(('localhost', self.port), handler)
+            if self.backend == 'asyncio':
+                try:
+                    from .async_server import AsyncAutomationServer
+                except ImportError:
+                    from async_server import AsyncAutomationServer
+                self.server = AsyncAutomationServer(self, 'localhost', self.port)
+            else:
+                handler = self.create_handler()
+                self.server = ThreadingHTTPServer(('localhost', self.port), handler)
             
-            print(f"Automation Server מופעל על http://localhost:{self.port}")
+            print(f"Automation Server מופעל על http://localhost:{self.port} (backend: {self.backend})")
             print(f"Project Root: {self.project_root}")
             print("=" * 50)
             print("נתיבים זמינים:")
-            print("  POST /update_conversations - עדכון יומן שיחות")
-            print("  POST /update_documentation - עדכון תיעוד") 
-            print("  POST /github_sync - סינכרון GitHub")
+            print("  POST {action: update_conversations} - עדכון יומן שיחות")
+            print("  POST {action: update_docs} - עדכון תיעוד") 
+            print("  POST {action: github_sync} - סינכרון GitHub")
+            print("  POST {action: pipeline} - שיחות → תיעוד → GitHub ברצף")
+            print("  GET  /jobs - רשימת משימות")
+            print("  GET  /jobs/<id> - מצב משימה")
+            print("  GET  /events - זרם אירועי התקדמות (SSE)")
+            print("  GET  /metrics - מדדים בפורמט Prometheus")
+            print(f"  GET  / - הדשבורד וקבצי ה-HTML (http://localhost:{self.port}/)")
             print("=" * 50)
             print("השרת מחובר לדשבורד - הכפתורים פעילים!")
             print("עצור עם Ctrl+C")
             
+            if self.scheduler:
+                self.scheduler.start()
+            
             self.server.serve_forever()
             
         except KeyboardInterrupt:
@@ -200,24 +539,25 @@ class AutomationServer:
     
     def stop_server(self):
         """עצירת השרת"""
+        self.stopping.set()
+        if self.scheduler:
+            self.scheduler.stop()
         if self.server:
             self.server.shutdown()
             self.server.server_close()
             print("השרת נעצר")
+        self.job_queue.shutdown()
+
+def _import_action_module(module_name):
+    """import של מודול פעולה - כחלק מה-package או כסקריפט עצמאי"""
+    if __package__:
+        return importlib.import_module(f'.{module_name}', __package__)
+    return importlib.import_module(module_name)
 
 def check_dependencies():
-    """בדיקת התלויות הנדרשות"""
-    missing = []
-    
-    try:
-        import requests
-    except ImportError:
-        missing.append('requests')
-    
-    try:
-        import markdown
-    except ImportError:
-        missing.append('markdown')
+    """בדיקת התלויות הנדרשות - בלי לטעון אותן בפועל"""
+    missing = [lib for lib in ('requests', 'markdown')
+               if importlib.util.find_spec(lib) is None]
     
     if missing:
         print("חסרות ספריות Python:")
@@ -230,6 +570,19 @@ def check_dependencies():
 
 def main():
     """הרצה עצמאית"""
+    parser = argparse.ArgumentParser(description='Trading Project 002 - Automation Server')
+    parser.add_argument('--port', type=int, default=8080, help='פורט השרת (ברירת מחדל: 8080)')
+    parser.add_argument('--project-root', default=None, help='תיקיית הפרויקט (ברירת מחדל: תיקיית האב)')
+    parser.add_argument('--backend', choices=['threading', 'asyncio'], default='threading',
+                        help='מנוע השרת: threading (ברירת מחדל) או asyncio עם keep-alive')
+    parser.add_argument('--watch', action='store_true',
+                        help='בניית HTML אוטומטית כשקובץ .md משתנה')
+    parser.add_argument('--conversations-every', metavar='INTERVAL',
+                        help='עדכון יומן שיחות כל מרווח זמן (למשל 30m, 2h)')
+    parser.add_argument('--sync-every', metavar='INTERVAL',
+                        help='סינכרון GitHub כל מרווח זמן (למשל 1h, 1d)')
+    args = parser.parse_args()
+    
     print("Trading Project 002 - Automation Server")
     print("=" * 50)
     
@@ -238,7 +591,15 @@ def main():
         return
     
     # הפעל שרת
-    server = AutomationServer()
+    server = AutomationServer(project_root=args.project_root, port=args.port, backend=args.backend)
+    
+    intervals = {}
+    if args.conversations_every:
+        intervals['update_conversations'] = args.conversations_every
+    if args.sync_every:
+        intervals['github_sync'] = args.sync_every
+    if args.watch or intervals:
+        server.enable_scheduler(watch=args.watch, intervals=intervals)
     
     try:
         server.start_server()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Classifier Benchmark for Trading Project 002
+מדידת קצב סיווג שורות היסטוריה: המסווג המקומפל מול לולאות מילות המפתח הקודמות
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+try:
+    from .activity_classifier import ActivityClassifier
+except ImportError:
+    from activity_classifier import ActivityClassifier
+
+DEFAULT_LINES = 1_000_000
+
+# שורות היסטוריה טיפוסיות - רובן לא קשורות לפרויקט, כמו בהיסטוריה אמיתית
+COMMAND_TEMPLATES = (
+    'cd {path}', 'ls -la {path}', 'git status', 'git commit -m "{word}"', 'git push origin main',
+    'git pull', 'python {path}/{word}.py', 'npx @anthropic-ai/claude-code', 'claude --resume',
+    'code {path}', 'mkdir {word}', 'new-item {word}.md', 'pip install {word}', 'docker ps',
+    'cat {path}/{word}.log', 'echo "trading project {word}"', 'curl https://{word}.com', 'vim {word}.txt',
+)
+
+WORDS = ('mstr', 'data', 'dashboard', 'automation', 'notes', 'report', 'build', 'test', 'fix', 'api')
+
+PATHS = ('~/src', 'c:/projects/trading-project-002', '/var/log', '~/downloads', './automation')
+
+
+def generate_lines(count, seed=0):
+    """count שורות היסטוריה סינתטיות (באותיות קטנות, כמו שהן מגיעות לסיווג)"""
+    rng = random.Random(seed)
+    return [rng.choice(COMMAND_TEMPLATES).format(path=rng.choice(PATHS), word=rng.choice(WORDS)).lower()
+            for _ in range(count)]
+
+
+def legacy_classify(line):
+    """הסיווג הקודם - לולאות מילות מפתח נפרדות לכל שאלה (בסיס להשוואה)"""
+    claude_keywords = ['claude', 'anthropic', 'claude-code', 'npx @anthropic-ai/claude-code',
+                       'trading project', 'project 002']
+    if not any(keyword in line for keyword in claude_keywords):
+        return None
+
+    command = line.lower()
+    if 'claude-code' in command or 'npx @anthropic-ai' in command:
+        description = "הפעלת Claude Code"
+    elif 'git' in command:
+        if 'commit' in command:
+            description = "ביצוע Git commit"
+        elif 'push' in command:
+            description = "ביצוע Git push"
+        elif 'pull' in command:
+            description = "ביצוע Git pull"
+        else:
+            description = "פעילות Git"
+    elif 'python' in command or '.py' in command:
+        description = "הרצת סקריפט Python"
+    elif 'mkdir' in command or 'md ' in command:
+        description = "יצירת תיקייה"
+    elif 'touch' in command or 'new-item' in command:
+        description = "יצירת קובץ חדש"
+    elif 'edit' in command or 'code' in command:
+        description = "עריכת קבצים"
+    else:
+        description = f"פקודת טרמינל: {command[:50]}"
+
+    project_keywords = ['trading', 'project', '002', 'claude', 'mstr', 'html', 'dashboard', 'automation']
+    text_to_check = f"{line} {description}".lower()
+    return description, any(keyword in text_to_check for keyword in project_keywords)
+
+
+def compiled_classify(classifier):
+    def classify(line):
+        classification = classifier.classify_command(line)
+        if classification is None:
+            return None
+        return classification.description, classification.relevant
+    return classify
+
+
+def measure(classify, lines):
+    """זמן ריצה על כל השורות - (שניות, תוצאות)"""
+    started = time.perf_counter()
+    results = [classify(line) for line in lines]
+    return time.perf_counter() - started, results
+
+
+def run_benchmark(count=DEFAULT_LINES, seed=0):
+    """מדידת שני המסווגים על אותן שורות ובדיקה שהתוצאות זהות"""
+    lines = generate_lines(count, seed)
+
+    started = time.perf_counter()
+    classifier = ActivityClassifier()
+    compile_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    legacy_seconds, legacy_results = measure(legacy_classify, lines)
+    compiled_seconds, compiled_results = measure(compiled_classify(classifier), lines)
+    mismatches = sum(1 for legacy, compiled in zip(legacy_results, compiled_results) if legacy != compiled)
+
+    return {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'lines': count,
+        'matched_lines': sum(1 for result in compiled_results if result is not None),
+        'compile_ms': compile_ms,
+        'legacy': {'seconds': round(legacy_seconds, 3), 'lines_per_second': round(count / legacy_seconds)},
+        'compiled': {'seconds': round(compiled_seconds, 3), 'lines_per_second': round(count / compiled_seconds)},
+        'speedup': round(legacy_seconds / compiled_seconds, 2),
+        'mismatches': mismatches
+    }
+
+
+def main():
+    """הרצה עצמאית"""
+    parser = argparse.ArgumentParser(description='מדידת קצב סיווג שורות היסטוריה')
+    parser.add_argument('--lines', type=int, default=DEFAULT_LINES, help='מספר שורות סינתטיות')
+    parser.add_argument('--seed', type=int, default=0, help='seed לתוכן השורות')
+    parser.add_argument('--json', dest='json_path', help='שמירת התוצאות לקובץ JSON')
+    args = parser.parse_args()
+
+    result = run_benchmark(args.lines, args.seed)
+
+    print(f"[BENCH] {result['lines']:,} שורות ({result['matched_lines']:,} קשורות ל-Claude/לפרויקט)")
+    print(f"  לולאות מילות מפתח: {result['legacy']['lines_per_second']:>12,} שורות/שנייה")
+    print(f"  מסווג מקומפל:      {result['compiled']['lines_per_second']:>12,} שורות/שנייה "
+          f"(פי {result['speedup']}, קומפילציה {result['compile_ms']} ms)")
+    if result['mismatches']:
+        print(f"[WARNING] {result['mismatches']} שורות סווגו אחרת מהסיווג הקודם")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"[SUCCESS] התוצאות נשמרו ב-{args.json_path}")
+
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Documentation Benchmark for Trading Project 002
+מדידת ביצועי בניית התיעוד על קורפוס MD סינתטי: בנייה קרה, בנייה חמה בלי שינויים,
+שינוי של קובץ אחד ועדכון file_map.json - זמנים וזיכרון שיא, פלט JSON להשוואה בין commits
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    # Windows - אין getrusage; שיא הזיכרון של ה-process לא נמדד
+    resource = None
+
+try:
+    from .update_documentation import DocumentationUpdater
+except ImportError:
+    from update_documentation import DocumentationUpdater
+
+AUTOMATION_DIR = Path(__file__).parent
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+# כמה עמודי HTML מופיעים בניווט (כמו בפרויקט - רק המסמכים הראשיים)
+NAV_PAGES = 8
+
+CATEGORIES = ('documentation', 'management', 'technical', 'analysis')
+
+WORDS = ('מסחר', 'נתונים', 'אסטרטגיה', 'סטטיסטיקה', 'מניה', 'מחיר', 'נפח', 'תנודתיות', 'בדיקה', 'מערכת',
+         'trading', 'data', 'strategy', 'MSTR', 'volume', 'price', 'signal', 'backtest', 'database', 'API')
+
+
+def _sentence(rng, length=12):
+    return ' '.join(rng.choice(WORDS) for _ in range(length)) + '.'
+
+
+def _document(rng, number, count):
+    """מסמך אחד בסגנון התיעוד שלנו - כותרות, פסקאות, טבלה, קוד וקישורים למסמכים אחרים"""
+    lines = [f"# 📄 מסמך {number:05d} - {rng.choice(WORDS)}", '', _sentence(rng, 25), '']
+    for section in range(1, rng.randint(3, 6) + 1):
+        lines += [f"## {section}. {_sentence(rng, 3)}", '', _sentence(rng, 30), '']
+        lines += ['| שדה | ערך | הערה |', '|-----|-----|------|']
+        lines += [f"| {rng.choice(WORDS)} | {rng.randint(1, 10000)} | {_sentence(rng, 4)} |" for _ in range(5)]
+        lines += ['', '```python', f"def step_{section}(data):",
+                  f"    return data['{rng.choice(WORDS)}'] * {rng.randint(2, 9)}", '```', '']
+        target = rng.randrange(count)
+        lines += [f"- ראה גם [מסמך {target:05d}](doc_{target:05d}.html)", f"- **{_sentence(rng, 5)}**", '']
+    return '\n'.join(lines)
+
+
+def generate_corpus(project_root, count, seed=0):
+    """יצירת count קבצי MD ו-file_map.json מתאים בתיקייה - מחזיר את רשימת הקבצים"""
+    rng = random.Random(seed)
+    project_root = Path(project_root)
+    (project_root / 'automation').mkdir(parents=True, exist_ok=True)
+
+    structure = {category: {} for category in CATEGORIES}
+    md_files = []
+    for number in range(count):
+        name = f"doc_{number:05d}"
+        category = CATEGORIES[number % len(CATEGORIES)]
+        md_file = project_root / f"{name}.md"
+        md_file.write_text(_document(rng, number, count), encoding='utf-8')
+        md_files.append(md_file)
+
+        structure[category][f"{name}.md"] = {
+            'type': 'markdown', 'category': category, 'status': 'active',
+            'last_modified': '2025-09-01', 'paired_file': f"{name}.html"
+        }
+        if number < NAV_PAGES:
+            structure[category][f"{name}.html"] = {
+                'type': 'html', 'category': category, 'status': 'active',
+                'last_modified': '2025-09-01', 'paired_file': f"{name}.md"
+            }
+
+    file_map = {
+        'project_info': {'name': 'Benchmark corpus', 'last_updated': '2025-09-01'},
+        'file_structure': structure,
+        'statistics': {'total_files': 0, 'by_type': {'html': 0, 'markdown': 0, 'json': 1}}
+    }
+    with open(project_root / 'file_map.json', 'w', encoding='utf-8') as f:
+        json.dump(file_map, f, ensure_ascii=False, indent=4)
+
+    return md_files
+
+
+def measure(action, memory=True):
+    """הרצת action והחזרת (זמן ms, זיכרון שיא MB, תוצאה) - פלט ההדפסות מושתק
+
+    זיכרון השיא נמדד ב-tracemalloc (הקצאות Python), שמאט את הריצה - לזמנים
+    נקיים מריצים עם --no-memory.
+    """
+    if memory:
+        tracemalloc.start()
+    try:
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            result = action()
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        peak_mb = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2) if memory else None
+    finally:
+        if memory:
+            tracemalloc.stop()
+    return elapsed_ms, peak_mb, result
+
+
+def bench_corpus(count, workers=1, memory=True, seed=0):
+    """כל התרחישים על קורפוס אחד בגודל count"""
+    with tempfile.TemporaryDirectory(prefix='bench_docs_') as project_root:
+        md_files = generate_corpus(project_root, count, seed)
+        corpus_bytes = sum(md_file.stat().st_size for md_file in md_files)
+
+        # כל תרחיש במופע חדש - כמו הרצה של update_documentation.py משורת הפקודה
+        def full_update():
+            return DocumentationUpdater(project_root, workers=workers).run_full_update()
+
+        def file_map_update():
+            return DocumentationUpdater(project_root).update_file_map()
+
+        phases = {}
+
+        def record(phase, action):
+            elapsed_ms, peak_mb, result = measure(action, memory)
+            phases[phase] = {'ms': elapsed_ms, 'peak_mb': peak_mb}
+            if isinstance(result, dict):
+                phases[phase]['files_updated'] = result.get('files_updated', 0)
+                if not result.get('success'):
+                    phases[phase]['error'] = result.get('error', 'failed')
+
+        record('cold_build', full_update)
+        record('warm_noop', full_update)
+
+        # שינוי בגוף קובץ אחד (בלי שינוי כותרת - בלי עטיפה מחדש של תלויים)
+        changed = md_files[len(md_files) // 2]
+        with open(changed, 'a', encoding='utf-8') as f:
+            f.write('\n\nשורה שנוספה למדידה.\n')
+        record('single_change', full_update)
+
+        record('file_map_update', file_map_update)
+
+        return {
+            'files': count,
+            'corpus_kb': round(corpus_bytes / 1024, 1),
+            'phases': phases
+        }
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, workers=1, memory=True, seed=0):
+    """הרצת המדידות לכל גודל קורפוס והחזרת תוצאה אחת"""
+    results = []
+    for count in sizes:
+        print(f"[BENCH] קורפוס של {count} קבצים...")
+        results.append(bench_corpus(count, workers, memory, seed))
+
+    return {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'commit': _git_commit(),
+        'workers': workers,
+        'memory_tracing': memory,
+        'max_rss_mb': _max_rss_mb(),
+        'corpora': results
+    }
+
+
+def _max_rss_mb():
+    """שיא הזיכרון של ה-process ב-MB, או None כשאין מודול resource"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS מחזיר בייטים, Linux - KB
+    return round(max_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _git_commit():
+    """ה-commit הנוכחי, כדי שאפשר יהיה להשוות קבצי תוצאות"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=AUTOMATION_DIR, timeout=5)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main():
+    """הרצה עצמאית"""
+    parser = argparse.ArgumentParser(description='מדידת ביצועי בניית התיעוד')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help='גדלי קורפוס מופרדים בפסיק')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='מספר processes להמרה במקביל (0 = לפי מספר המעבדים)')
+    parser.add_argument('--no-memory', action='store_true', help='בלי מדידת זיכרון (זמנים מדויקים יותר)')
+    parser.add_argument('--seed', type=int, default=0, help='seed לתוכן הקורפוס')
+    parser.add_argument('--json', dest='json_path', help='שמירת התוצאות לקובץ JSON')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    result = run_benchmark(sizes, args.jobs, not args.no_memory, args.seed)
+
+    for corpus in result['corpora']:
+        print(f"[BENCH] {corpus['files']} קבצים ({corpus['corpus_kb']} KB):")
+        for phase, data in corpus['phases'].items():
+            memory = f", שיא {data['peak_mb']} MB" if data['peak_mb'] is not None else ''
+            error = f" [ERROR] {data['error']}" if 'error' in data else ''
+            print(f"  {phase:<16} {data['ms']:>10} ms{memory}{error}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"[SUCCESS] התוצאות נשמרו ב-{args.json_path}")
+
+    return result
+
+
+if __name__ == "__main__":
+    main()
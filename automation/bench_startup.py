@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark for Trading Project 002
+מדידת זמן עליית שרת האוטומציה: זמן עד socket מאזין ופירוט זמני import
+"""
+
+import argparse
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+AUTOMATION_DIR = Path(__file__).parent
+SERVER_SCRIPT = AUTOMATION_DIR / "automation_server.py"
+
+
+def _free_port():
+    """מציאת פורט פנוי מקומי"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+
+def measure_time_to_listen(project_root, timeout=30.0):
+    """זמן (ms) מהפעלת התהליך ועד שהשרת מקבל חיבור TCP"""
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(SERVER_SCRIPT), '--port', str(port), '--project-root', str(project_root)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=AUTOMATION_DIR)
+
+    try:
+        deadline = started + timeout
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"השרת יצא מוקדם (קוד {process.returncode})")
+            try:
+                with socket.create_connection(('localhost', port), timeout=0.05):
+                    return round((time.perf_counter() - started) * 1000, 1)
+            except OSError:
+                time.sleep(0.002)
+        raise RuntimeError(f"השרת לא האזין תוך {timeout} שניות")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def measure_import_breakdown(module='automation_server', top=15):
+    """פירוט זמני import (python -X importtime) - המודולים הכבדים ביותר"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=AUTOMATION_DIR)
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        entries.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+            'self_ms': round(int(self_us) / 1000, 2),
+            'cumulative_ms': round(int(cumulative_us) / 1000, 2)
+        })
+
+    total = next((entry['cumulative_ms'] for entry in entries if entry['module'] == module), None)
+    heaviest = sorted(entries, key=lambda entry: entry['cumulative_ms'], reverse=True)[:top]
+    return {
+        'module': module,
+        'total_ms': total,
+        'heaviest': heaviest,
+        'loaded_eagerly': sorted({entry['module'] for entry in entries
+                                  if entry['module'] in ('markdown', 'requests')})
+    }
+
+
+def run_benchmark(runs=5):
+    """הרצת כל המדידות והחזרת תוצאה אחת"""
+    with tempfile.TemporaryDirectory() as project_root:
+        listen_times = [measure_time_to_listen(project_root) for _ in range(runs)]
+
+    return {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'runs': runs,
+        'time_to_listen_ms': {
+            'min': min(listen_times),
+            'median': round(statistics.median(listen_times), 1),
+            'max': max(listen_times),
+            'samples': listen_times
+        },
+        'imports': measure_import_breakdown()
+    }
+
+
+def main():
+    """הרצה עצמאית"""
+    parser = argparse.ArgumentParser(description='מדידת זמן עליית שרת האוטומציה')
+    parser.add_argument('--runs', type=int, default=5, help='מספר הפעלות למדידה')
+    parser.add_argument('--json', dest='json_path', help='שמירת התוצאות לקובץ JSON')
+    args = parser.parse_args()
+
+    result = run_benchmark(args.runs)
+
+    listen = result['time_to_listen_ms']
+    print(f"[BENCH] זמן עד socket מאזין: median {listen['median']} ms "
+          f"(min {listen['min']}, max {listen['max']}, {args.runs} הפעלות)")
+    print(f"[BENCH] import automation_server: {result['imports']['total_ms']} ms")
+    for entry in result['imports']['heaviest']:
+        print(f"  {entry['cumulative_ms']:>8} ms  {'  ' * entry['depth']}{entry['module']}")
+    if result['imports']['loaded_eagerly']:
+        print(f"[WARNING] נטענו בעלייה: {', '.join(result['imports']['loaded_eagerly'])}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"[SUCCESS] התוצאות נשמרו ב-{args.json_path}")
+
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Build Manifest for Trading Project 002
+מניפסט בנייה - מה נבנה מאיזה קלט, לפי hash של תוכן ולא לפי זמני קבצים
+"""
+
+import hashlib
+import json
+import os
+
+try:
+    from .atomic_files import atomic_write_text
+except ImportError:
+    from atomic_files import atomic_write_text
+
+MANIFEST_VERSION = 1
+
+
+def hash_bytes(data):
+    """hash קצר ויציב לתוכן"""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def hash_text(text):
+    return hash_bytes(text.encode('utf-8'))
+
+
+class BuildManifest:
+    def __init__(self, path):
+        """טעינת מניפסט קיים (או מניפסט ריק אם אין / לא תקין)"""
+        self.path = path
+        self.entries = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def rebuild_reason(self, name, inputs, outputs):
+        """הסיבה לבנייה מחדש, או None אם הפלט עדכני
+
+        inputs - dict של hashes (source, template, options)
+        outputs - נתיבי קבצי הפלט שחייבים להתקיים
+        """
+        entry = self.entries.get(name)
+        if entry is None:
+            return 'new'
+
+        for key, value in inputs.items():
+            if entry.get('inputs', {}).get(key) != value:
+                return f'{key}_changed'
+
+        if not all(os.path.exists(output) for output in outputs):
+            return 'output_missing'
+
+        return None
+
+    def record(self, name, inputs, outputs, **extra):
+        """רישום בנייה מוצלחת"""
+        entry = {'inputs': dict(inputs), 'outputs': [os.path.basename(output) for output in outputs]}
+        entry.update(extra)
+        if self.entries.get(name) != entry:
+            self.entries[name] = entry
+            self._dirty = True
+
+    def get(self, name, key, default=None):
+        return self.entries.get(name, {}).get(key, default)
+
+    def discard(self, name):
+        """מחיקת רשומה אחת (אם קיימת)"""
+        if self.entries.pop(name, None) is not None:
+            self._dirty = True
+
+    def prune(self, existing_names):
+        """מחיקת רשומות של מקורות שכבר לא קיימים
+
+        רשומות "name#part" (עמודים של מסמך מחולק) שייכות למקור name.
+        """
+        for name in list(self.entries):
+            if name.split('#', 1)[0] not in existing_names:
+                del self.entries[name]
+                self._dirty = True
+
+    def save(self):
+        """שמירה (אטומית) - רק אם משהו השתנה"""
+        if not self._dirty:
+            return False
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        atomic_write_text(self.path, json.dumps({'version': MANIFEST_VERSION, 'entries': self.entries},
+                                                ensure_ascii=False, indent=2, sort_keys=True))
+
+        self._dirty = False
+        return True
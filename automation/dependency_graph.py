@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Dependency Graph for Trading Project 002
+גרף תלויות בין קבצי התיעוד - מתוך file_map.json ומהקישורים בעמודים שנוצרו
+"""
+
+from collections import defaultdict, deque
+
+try:
+    from .page_template import LINK_PATTERN
+except ImportError:
+    from page_template import LINK_PATTERN
+
+
+def extract_links(html_content):
+    """שמות עמודי ה-HTML המקומיים שהעמוד מקשר אליהם"""
+    return sorted({link.rsplit('/', 1)[-1] for link in LINK_PATTERN.findall(html_content)})
+
+
+def _node(name):
+    # שמות קבצים בלי תלות באותיות גדולות/קטנות (AUTOMATION_GUIDE.html ו-automation_guide.html)
+    return name.lower()
+
+
+class DependencyGraph:
+    def __init__(self):
+        """גרף מכוון: dependency → dependents"""
+        self._dependents = defaultdict(set)
+
+    @classmethod
+    def from_file_map(cls, file_map):
+        """בניית הגרף מ-paired_file ו-dependencies של כל קובץ ב-file_map.json"""
+        graph = cls()
+        for section in (file_map or {}).get('file_structure', {}).values():
+            if not isinstance(section, dict):
+                continue
+            for name, info in section.items():
+                if not isinstance(info, dict):
+                    continue
+                # עמוד HTML נבנה מקובץ ה-MD שלו
+                if info.get('type') == 'markdown' and info.get('paired_file'):
+                    graph.add_edge(name, info['paired_file'])
+                for dependency in info.get('dependencies') or []:
+                    graph.add_edge(dependency, name)
+        return graph
+
+    def add_edge(self, dependency, dependent):
+        self._dependents[_node(dependency)].add(_node(dependent))
+
+    def add_links(self, page, links):
+        """עמוד שמקשר לעמודים אחרים תלוי בהם (למשל בכותרת שלהם)"""
+        for link in links:
+            if _node(link) != _node(page):
+                self.add_edge(link, page)
+
+    def dependents(self, nodes, expand=None):
+        """כל מי שתלוי בצמתים, ישירות או בעקיפין - {dependent: הצומת שהוא תלוי בו}
+
+        expand - פונקציה אופציונלית: האם להמשיך הלאה מצומת שנמצא (למשל רק אם
+        גם הוא משתנה). בלי expand - סגור טרנזיטיבי מלא.
+        """
+        seeds = {_node(node) for node in nodes}
+        found = {}
+        pending = deque(sorted(seeds))
+
+        while pending:
+            node = pending.popleft()
+            for dependent in sorted(self._dependents.get(node, ())):
+                if dependent in found or dependent in seeds:
+                    continue
+                found[dependent] = node
+                if expand is None or expand(dependent):
+                    pending.append(dependent)
+
+        return found
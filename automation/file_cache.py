@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+File-backed State Cache for Trading Project 002
+מטמון ערכים שנגזרים מקבצים - מחושב מחדש רק כשאחד הקבצים השתנה
+"""
+
+import threading
+
+
+def file_signature(path):
+    """חתימת קובץ לזיהוי שינוי - (mtime_ns, size) או None אם לא קיים"""
+    try:
+        stat = path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+class FileBackedCache:
+    def __init__(self):
+        """מטמון thread-safe של ערכים התלויים בקבצים"""
+        self._values = {}
+        self._lock = threading.RLock()
+
+    def get(self, key, paths, loader):
+        """החזרת ערך שמור, או טעינה מחדש אם חתימת אחד הקבצים השתנתה"""
+        signature = tuple(file_signature(path) for path in paths)
+
+        with self._lock:
+            cached = self._values.get(key)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+            value = loader()
+            self._values[key] = (signature, value)
+            return value
+
+    def prime(self, key, paths, value):
+        """שמירת ערך ידוע מראש (למשל אחרי שאנחנו עצמנו כתבנו את הקובץ)"""
+        signature = tuple(file_signature(path) for path in paths)
+        with self._lock:
+            self._values[key] = (signature, value)
+
+    def invalidate(self, key=None):
+        """מחיקת ערך אחד או את כל המטמון"""
+        with self._lock:
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Fragment Cache for Trading Project 002
+מטמון על הדיסק של גוף ה-HTML שהופק מ-Markdown - בלי תלות בעטיפת העמוד
+"""
+
+import os
+
+try:
+    from .atomic_files import atomic_write_text
+except ImportError:
+    from atomic_files import atomic_write_text
+
+# גודל מקסימלי למטמון - מעבר לזה נמחקים הפריטים שלא נקראו הכי הרבה זמן
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# סיומת שאינה .html - קבצי המטמון לא נספרים כקבצי HTML של הפרויקט בסריקות פעילות
+FRAGMENT_SUFFIX = '.frag'
+# סיומות של גרסאות קודמות של המטמון - נמחקות ב-trim
+LEGACY_SUFFIXES = ('.html',)
+
+
+class FragmentCache:
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        """מטמון פרגמנטים בתיקייה - מפתח לכל פריט הוא hash של המקור והגדרות ההמרה"""
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + FRAGMENT_SUFFIX)
+
+    def get(self, key):
+        """תוכן שמור או None - קריאה מרעננת את זמן הגישה (LRU)"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                fragment = f.read()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return fragment
+
+    def put(self, key, fragment):
+        """שמירת פרגמנט (אטומית)"""
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory, exist_ok=True)
+            # המטמון לא נכנס ל-git
+            with open(os.path.join(self.directory, '.gitignore'), 'w', encoding='utf-8') as f:
+                f.write('*\n')
+
+        atomic_write_text(self._path(key), fragment)
+
+    def trim(self):
+        """מחיקת הפריטים הישנים ביותר עד שהמטמון חוזר למגבלת הגודל - מחזיר כמה נמחקו"""
+        entries = []
+        try:
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    if entry.name.endswith(LEGACY_SUFFIXES) and entry.is_file():
+                        # פריט מגרסה קודמת - לעולם לא ייקרא שוב
+                        try:
+                            os.unlink(entry.path)
+                        except OSError:
+                            pass
+                    elif entry.name.endswith(FRAGMENT_SUFFIX) and entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        except OSError:
+            return 0
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+        return removed
@@ -7,14 +7,23 @@ GitHub Manager for Trading Project 002
 import os
 import json
 import subprocess
-import requests
 from datetime import datetime
 from pathlib import Path
 import shutil
+import threading
+import time
+
+try:
+    from .file_cache import FileBackedCache
+except ImportError:
+    from file_cache import FileBackedCache
 
 class GitHubManager:
-    def __init__(self, project_root=None):
-        """אתחול מנהל GitHub"""
+    def __init__(self, project_root=None, progress=None):
+        """אתחול מנהל GitHub
+
+        progress - callback אופציונלי progress(event, **data) לדיווח התקדמות
+        """
         if project_root is None:
             self.project_root = Path(__file__).parent.parent
         else:
@@ -22,8 +31,32 @@ class GitHubManager:
         
         self.repo_name = "trading-project-002"
         self.config_file = self.project_root / "automation" / "github_config.json"
-        self.github_token = self._load_github_token()
+        self.progress = progress
+        
+        # מצב שנגזר מקבצים/מהסביבה נשמר בין ריצות
+        self._state_cache = FileBackedCache()
+        self._git_version = None
+        self._lock = threading.RLock()
         
+    @property
+    def github_token(self):
+        """GitHub token - נטען מחדש רק כשקובץ ההגדרות משתנה"""
+        return self._state_cache.get('github_token', [self.config_file], self._load_github_token)
+        
+    def _report(self, event, **data):
+        """דיווח אירוע התקדמות (אם הוגדר callback)"""
+        if self.progress:
+            self.progress(event, **data)
+        
+    def _run_git(self, args, capture_output=True):
+        """הרצת פקודת git בתיקיית הפרויקט ודיווח זמן הריצה"""
+        started = time.monotonic()
+        result = subprocess.run(['git'] + args, capture_output=capture_output,
+                                text=True, cwd=self.project_root)
+        self._report('git_command', command=args[0], returncode=result.returncode,
+                     elapsed_ms=round((time.monotonic() - started) * 1000, 1))
+        return result
+    
     def _load_github_token(self):
         """טעינת GitHub token מהגדרות"""
         try:
@@ -49,11 +82,12 @@ class GitHubManager:
     def check_git_setup(self):
         """בדיקת תקינות Git"""
         try:
-            # בדוק אם Git מותקן
-            result = subprocess.run(['git', '--version'], 
-                                 capture_output=True, text=True, cwd=self.project_root)
-            if result.returncode != 0:
-                return False, "Git לא מותקן במערכת"
+            # בדוק אם Git מותקן (פעם אחת לכל חיי השירות)
+            if self._git_version is None:
+                result = self._run_git(['--version'])
+                if result.returncode != 0:
+                    return False, "Git לא מותקן במערכת"
+                self._git_version = result.stdout.strip()
             
             # בדוק אם התיקייה היא git repository
             git_dir = self.project_root / ".git"
@@ -76,8 +110,7 @@ class GitHubManager:
             print("[INIT] מאתחל Git repository מקומי...")
             
             # git init
-            result = subprocess.run(['git', 'init'], 
-                                 capture_output=True, text=True, cwd=self.project_root)
+            result = self._run_git(['init'])
             if result.returncode != 0:
                 print(f"[ERROR] כשל ב-git init: {result.stderr}")
                 return False
@@ -131,6 +164,7 @@ Thumbs.db
 # Project specific
 automation/github_config.json
 automation/last_*.json
+automation/build_manifest.json
 *.tmp
 temp/
 
@@ -152,15 +186,12 @@ config/secrets.json
         """הגדרת משתמש Git ברירת מחדל"""
         try:
             # בדוק אם משתמש כבר מוגדר
-            result = subprocess.run(['git', 'config', 'user.email'], 
-                                 capture_output=True, text=True, cwd=self.project_root)
+            result = self._run_git(['config', 'user.email'])
             
             if result.returncode != 0 or not result.stdout.strip():
                 # הגדר משתמש ברירת מחדל
-                subprocess.run(['git', 'config', 'user.email', 'trading.project.002@example.com'], 
-                             cwd=self.project_root)
-                subprocess.run(['git', 'config', 'user.name', 'Trading Project 002'], 
-                             cwd=self.project_root)
+                self._run_git(['config', 'user.email', 'trading.project.002@example.com'], capture_output=False)
+                self._run_git(['config', 'user.name', 'Trading Project 002'], capture_output=False)
                 print("👤 הוגדר משתמש Git ברירת מחדל")
         except:
             pass
@@ -189,7 +220,8 @@ config/secrets.json
                 "Accept": "application/vnd.github.v3+json"
             }
             
-            # שלח בקשה ליצירת repository
+            # שלח בקשה ליצירת repository (requests נטען רק כאן - פעולה נדירה)
+            import requests
             response = requests.post("https://api.github.com/user/repos", 
                                    json=repo_data, headers=headers)
             
@@ -221,8 +253,7 @@ config/secrets.json
         """הוספת remote origin ל-repository המקומי"""
         try:
             # בדוק אם remote origin כבר קיים
-            result = subprocess.run(['git', 'remote', 'get-url', 'origin'], 
-                                 capture_output=True, text=True, cwd=self.project_root)
+            result = self._run_git(['remote', 'get-url', 'origin'])
             
             if result.returncode == 0:
                 current_origin = result.stdout.strip()
@@ -231,13 +262,11 @@ config/secrets.json
                     return True
                 else:
                     # עדכן origin קיים
-                    subprocess.run(['git', 'remote', 'set-url', 'origin', repo_url], 
-                                 cwd=self.project_root)
+                    self._run_git(['remote', 'set-url', 'origin', repo_url], capture_output=False)
                     print("[INIT] עודכן remote origin")
             else:
                 # הוסף origin חדש
-                result = subprocess.run(['git', 'remote', 'add', 'origin', repo_url], 
-                                     capture_output=True, text=True, cwd=self.project_root)
+                result = self._run_git(['remote', 'add', 'origin', repo_url])
                 if result.returncode != 0:
                     print(f"[ERROR] כשל בהוספת remote: {result.stderr}")
                     return False
@@ -255,15 +284,13 @@ config/secrets.json
             print("[COMMIT] יוצר commit ראשוני...")
             
             # git add .
-            result = subprocess.run(['git', 'add', '.'], 
-                                 capture_output=True, text=True, cwd=self.project_root)
+            result = self._run_git(['add', '.'])
             if result.returncode != 0:
                 print(f"[ERROR] כשל ב-git add: {result.stderr}")
                 return False
             
             # בדוק אם יש משהו לcommit
-            result = subprocess.run(['git', 'status', '--porcelain'], 
-                                 capture_output=True, text=True, cwd=self.project_root)
+            result = self._run_git(['status', '--porcelain'])
             if not result.stdout.strip():
                 print(" אין שינויים לcommit")
                 return True
@@ -279,13 +306,13 @@ config/secrets.json
 Co-Authored-By: Claude <noreply@anthropic.com>"""
             
             # git commit
-            result = subprocess.run(['git', 'commit', '-m', commit_msg], 
-                                 capture_output=True, text=True, cwd=self.project_root)
+            result = self._run_git(['commit', '-m', commit_msg])
             if result.returncode != 0:
                 print(f"[ERROR] כשל ב-git commit: {result.stderr}")
                 return False
             
             print("[SUCCESS] נוצר commit ראשוני")
+            self._report('commit_created', initial=True)
             return True
             
         except Exception as e:
@@ -296,43 +323,74 @@ Co-Authored-By: Claude <noreply@anthropic.com>"""
         """push לrepository ב-GitHub"""
         try:
             print("[PUSH] מבצע push ל-GitHub...")
+            started = time.monotonic()
             
             # git push -u origin main
-            result = subprocess.run(['git', 'push', '-u', 'origin', 'main'], 
-                                 capture_output=True, text=True, cwd=self.project_root)
+            result = self._run_git(['push', '-u', 'origin', 'main'])
             
             if result.returncode != 0:
                 # נסה עם master אם main לא עבד
-                result = subprocess.run(['git', 'push', '-u', 'origin', 'master'], 
-                                     capture_output=True, text=True, cwd=self.project_root)
+                result = self._run_git(['push', '-u', 'origin', 'master'])
                 
                 if result.returncode != 0:
                     print(f"[ERROR] כשל ב-git push: {result.stderr}")
                     return False
             
             print("[SUCCESS] הפרויקט הועלה ל-GitHub בהצלחה!")
+            self._report('push_done', elapsed_ms=round((time.monotonic() - started) * 1000, 1))
             return True
             
         except Exception as e:
             print(f"[ERROR] שגיאה ב-push: {str(e)}")
             return False
     
-    def sync_with_github(self):
-        """סינכרון מלא עם GitHub"""
+    def sync_with_github(self, paths=None):
+        """סינכרון מלא עם GitHub
+
+        paths - רשימת קבצים אופציונלית; אם ניתנה, רק הם נכנסים ל-commit
+        """
+        with self._lock:
+            return self._sync_with_github(paths)
+    
+    def _sync_with_github(self, paths):
         try:
             print("[COMMIT] יוצר commit חדש...")
+            started = time.monotonic()
+            
+            if paths:
+                # רק הקבצים שהשתנו בשלבים הקודמים - קיימים, או במעקב (נמחקו ונכנסים עם --all)
+                paths = self._committable_paths(paths)
+                if not paths:
+                    print(" אין שינויים חדשים לsync")
+                    self._report('sync_finished', changes=0,
+                                 elapsed_ms=round((time.monotonic() - started) * 1000, 1))
+                    return True
+                result = self._run_git(['add', '--all', '--'] + paths)
+            else:
+                # git add .
+                result = self._run_git(['add', '.'])
             
-            # git add .
-            subprocess.run(['git', 'add', '.'], cwd=self.project_root)
+            if result.returncode != 0:
+                print(f"[ERROR] כשל ב-git add: {result.stderr.strip()}")
+                self._report('git_add_failed', error=result.stderr.strip(),
+                             elapsed_ms=round((time.monotonic() - started) * 1000, 1))
+                return False
+            self._report('git_add_done', elapsed_ms=round((time.monotonic() - started) * 1000, 1))
             
             # בדוק אם יש שינויים
-            result = subprocess.run(['git', 'status', '--porcelain'], 
-                                 capture_output=True, text=True, cwd=self.project_root)
+            if paths:
+                result = self._run_git(['diff', '--cached', '--name-only', '--'] + paths)
+            else:
+                result = self._run_git(['status', '--porcelain'])
             
             if not result.stdout.strip():
                 print(" אין שינויים חדשים לsync")
+                self._report('sync_finished', changes=0,
+                             elapsed_ms=round((time.monotonic() - started) * 1000, 1))
                 return True
             
+            changed_count = len(result.stdout.strip().splitlines())
+            
             # יצור commit message מותאם
             timestamp = datetime.now().strftime("%d/%m/%Y %H:%M")
             commit_msg = f"""📝 Automatic sync - {timestamp}
@@ -344,20 +402,28 @@ Co-Authored-By: Claude <noreply@anthropic.com>"""
 🤖 Generated with Claude Code Automation
 Co-Authored-By: Claude <noreply@anthropic.com>"""
             
-            # commit
-            result = subprocess.run(['git', 'commit', '-m', commit_msg], 
-                                 capture_output=True, text=True, cwd=self.project_root)
+            # commit - עם paths רק הם נכנסים, גם אם המשתמש הכין ב-index שינויים אחרים
+            result = self._run_git(['commit', '-m', commit_msg] + (['--'] + paths if paths else []))
             
             if result.returncode == 0:
+                self._report('commit_created', changes=changed_count,
+                             elapsed_ms=round((time.monotonic() - started) * 1000, 1))
+                
                 # push
-                result = subprocess.run(['git', 'push'], 
-                                     capture_output=True, text=True, cwd=self.project_root)
+                push_started = time.monotonic()
+                result = self._run_git(['push'])
                 
                 if result.returncode == 0:
                     print("[SUCCESS] סינכרון עם GitHub הושלם בהצלחה!")
+                    self._report('push_done',
+                                 elapsed_ms=round((time.monotonic() - push_started) * 1000, 1))
+                    self._report('sync_finished', changes=changed_count,
+                                 elapsed_ms=round((time.monotonic() - started) * 1000, 1))
                     return True
                 else:
                     print(f"[WARNING] commit נוצר אך push נכשל: {result.stderr}")
+                    self._report('push_failed', error=result.stderr.strip(),
+                                 elapsed_ms=round((time.monotonic() - push_started) * 1000, 1))
                     return False
             else:
                 print(f"[ERROR] כשל ביצירת commit: {result.stderr}")
@@ -367,8 +433,35 @@ Co-Authored-By: Claude <noreply@anthropic.com>"""
             print(f"[ERROR] שגיאה בסינכרון: {str(e)}")
             return False
     
+    def _committable_paths(self, paths):
+        """הנתיבים שאפשר להכניס ל-commit - קיימים בדיסק או במעקב של git
+
+        עמוד שנמחק ולא נכנס אף פעם ל-git היה מפיל את כל ה-git add - הוא מדולג.
+        """
+        relative = []
+        for path in paths:
+            path = Path(path)
+            if path.is_absolute():
+                path = path.relative_to(self.project_root)
+            relative.append(path.as_posix())
+        
+        missing = [path for path in relative if not (self.project_root / path).exists()]
+        tracked = set()
+        if missing:
+            result = self._run_git(['ls-files', '-z', '--'] + missing)
+            tracked = set(result.stdout.split('\0')) if result.returncode == 0 else set()
+        
+        skipped = [path for path in missing if path not in tracked]
+        for path in skipped:
+            print(f"[SKIP] {path} - לא קיים ולא במעקב של git")
+        return [path for path in relative if path not in skipped]
+    
     def run_full_github_setup(self):
         """הרצת תהליך מלא של הגדרת GitHub"""
+        with self._lock:
+            return self._run_full_github_setup()
+    
+    def _run_full_github_setup(self):
         print(f"מתחיל הגדרת GitHub - Trading Project 002")
         print(f"[DATE] {datetime.now().strftime('%d בספטמבר %Y, %H:%M')}")
         print("=" * 50)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+History Tail for Trading Project 002
+קריאה אינקרמנטלית של קבצי היסטוריה ולוגים - רק השורות שנוספו מאז הקריאה הקודמת
+"""
+
+import hashlib
+import os
+
+# בקריאה ראשונה של קובץ (אין offset שמור) - רק הסוף שלו, לא כל ההיסטוריה
+INITIAL_TAIL_BYTES = 64 * 1024
+
+# טביעת אצבע של תחילת הקובץ - מזהה קובץ שהוחלף גם אם מערכת הקבצים מחזרה את ה-inode
+HEAD_BYTES = 256
+
+# השורה האחרונה שנקראה נשמרת (עד האורך הזה) כדי למצוא את נקודת ההמשך בקובץ שנכתב מחדש
+MAX_LAST_LINE = 512
+
+
+def _head_hash(f, size):
+    """hash של תחילת הקובץ, או None לקובץ קצר מדי (התחילית שלו עוד משתנה)"""
+    if size < HEAD_BYTES:
+        return None
+    f.seek(0)
+    return hashlib.sha256(f.read(HEAD_BYTES)).hexdigest()[:16]
+
+
+def _resume_point(data, last_line):
+    """המיקום שאחרי ההופעה האחרונה של השורה האחרונה שנקראה, או 0 אם לא נמצאה"""
+    if not last_line:
+        return 0
+    # ב-Windows השורות מסתיימות ב-CRLF
+    for ending in (b'\r\n', b'\n'):
+        marker = last_line.encode('utf-8') + ending
+        position = data.rfind(b'\n' + marker)
+        if position >= 0:
+            return position + 1 + len(marker)
+        if data.startswith(marker):
+            return len(marker)
+    return 0
+
+
+def read_new_lines(path, state=None, initial_tail_bytes=INITIAL_TAIL_BYTES):
+    """השורות השלמות שנוספו לקובץ מאז state - מחזיר (שורות, state חדש, סיבה)
+
+    state - {'offset', 'inode', 'head', 'last_line'} מהקריאה הקודמת (או None)
+    סיבה:
+      'appended'  - המשך רגיל מה-offset השמור
+      'initial'   - קובץ שעוד לא נקרא - רק initial_tail_bytes האחרונים
+      'truncated' - הקובץ קצר מה-offset (נמחק ונכתב מחדש)
+      'rotated'   - קובץ אחר באותו נתיב (inode או תחילית שונים)
+      'missing'   - הקובץ לא קיים; ה-state הקודם נשמר
+    אחרי truncated/rotated ממשיכים אחרי השורה האחרונה שנקראה אם היא נמצאת בקובץ
+    (PSReadLine כותב את ההיסטוריה מחדש כשהיא מגיעה למגבלה), אחרת מההתחלה.
+    שורה חלקית בסוף הקובץ (עדיין נכתבת) נשארת לקריאה הבאה.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return [], state, 'missing'
+
+    size = stat.st_size
+    with open(path, 'rb') as f:
+        head = _head_hash(f, size)
+
+        if not state:
+            reason = 'initial'
+            start = max(0, size - initial_tail_bytes)
+        elif state.get('inode') != stat.st_ino or (head and state.get('head') and head != state['head']):
+            reason = 'rotated'
+            start = 0
+        elif size < state.get('offset', 0):
+            reason = 'truncated'
+            start = 0
+        else:
+            reason = 'appended'
+            start = state.get('offset', 0)
+
+        f.seek(start)
+        data = f.read(size - start)
+
+    # רק שורות שלמות - עד ה-newline האחרון
+    end = data.rfind(b'\n') + 1
+    skip = 0
+    if reason == 'initial' and start > 0:
+        # קפיצה לאמצע הקובץ - השורה הראשונה חתוכה
+        skip = data.find(b'\n', 0, end) + 1
+    elif reason in ('rotated', 'truncated'):
+        skip = _resume_point(data[:end], state.get('last_line'))
+
+    lines = data[skip:end].decode('utf-8', errors='replace').splitlines()
+    last_line = lines[-1] if lines else (state or {}).get('last_line')
+    new_state = {
+        'offset': start + end,
+        'inode': stat.st_ino,
+        'head': head,
+        'last_line': last_line[:MAX_LAST_LINE] if last_line else None
+    }
+    return lines, new_state, reason
+
+
+def end_state(path, tail_bytes=4096):
+    """state שמצביע על סוף הקובץ - לדילוג על תוכן ישן בלי לקרוא אותו (None אם לא קיים)"""
+    try:
+        stat = os.stat(path)
+        with open(path, 'rb') as f:
+            head = _head_hash(f, stat.st_size)
+            start = max(0, stat.st_size - tail_bytes)
+            f.seek(start)
+            data = f.read(stat.st_size - start)
+    except OSError:
+        return None
+
+    end = data.rfind(b'\n') + 1
+    lines = data[:end].decode('utf-8', errors='replace').splitlines()
+    last_line = lines[-1] if lines and (start == 0 or len(lines) > 1) else None
+    return {
+        'offset': start + end,
+        'inode': stat.st_ino,
+        'head': head,
+        'last_line': last_line[:MAX_LAST_LINE] if last_line else None
+    }
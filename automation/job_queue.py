@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Job Queue for Trading Project 002
+תור משימות אסינכרוני לפעולות שרת האוטומציה
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import time
+
+# סטטוסים אפשריים של משימה
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+
+class Job:
+    def __init__(self, action, func, key=None):
+        """משימה בודדת בתור"""
+        self.id = uuid.uuid4().hex[:12]
+        self.action = action
+        self.key = key or action
+        self.func = func
+        self.status = STATUS_QUEUED
+        self.result = None
+        self.error = None
+        self.submitted_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.attached_requests = 0
+        self._started_clock = None
+        self._finished_clock = None
+        self._done = threading.Event()
+
+    @property
+    def finished(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """המתנה לסיום המשימה"""
+        return self._done.wait(timeout)
+
+    def to_dict(self):
+        """ייצוג JSON של המשימה"""
+        duration_ms = None
+        if self._started_clock is not None:
+            end = self._finished_clock if self._finished_clock is not None else time.monotonic()
+            duration_ms = round((end - self._started_clock) * 1000, 1)
+
+        return {
+            'job_id': self.id,
+            'action': self.action,
+            'status': self.status,
+            'submitted_at': self.submitted_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_ms': duration_ms,
+            'attached_requests': self.attached_requests,
+            'result': self.result,
+            'error': self.error
+        }
+
+
+class JobQueue:
+    def __init__(self, max_workers=2, max_pending=16, history_size=100, on_change=None):
+        """אתחול תור משימות עם מאגר workers מוגבל
+
+        on_change - callback אופציונלי on_change(job) בכל שינוי סטטוס של משימה
+        """
+        self.max_workers = max_workers
+        self.on_change = on_change
+        self.max_pending = max_pending
+        self.history_size = history_size
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='automation-job')
+        self._jobs = OrderedDict()
+        self._in_flight = {}
+        self._follow_ups = {}
+        self._lock = threading.Lock()
+
+    def submit(self, action, func, key=None, follow_up=False):
+        """הגשת פעולה לתור - מחזיר (Job, attached) או (None, False) אם התור מלא
+
+        single-flight: בקשה לפעולה שכבר ממתינה/רצה מצטרפת למשימה הקיימת
+        ומקבלת את התוצאה שלה, במקום להריץ עוד עותק במקביל.
+        key - מפתח ה-single-flight (ברירת מחדל: שם הפעולה)
+        follow_up - אם המשימה הקיימת כבר רצה, לא להצטרף אליה אלא לתזמן ריצה אחת נוספת
+        אחריה (למשל קובץ שנשמר באמצע בנייה - הריצה הנוכחית כבר קראה את הגרסה הקודמת)
+        """
+        key = key or action
+        with self._lock:
+            in_flight = self._in_flight.get(key)
+            after_running = False
+            if in_flight is not None and not in_flight.finished:
+                if not (follow_up and in_flight.status == STATUS_RUNNING):
+                    in_flight.attached_requests += 1
+                    return in_flight, True
+
+                # לכל היותר ריצת המשך אחת לכל מפתח - בקשות נוספות מצטרפות אליה
+                waiting = self._follow_ups.get(key)
+                if waiting is not None:
+                    waiting.attached_requests += 1
+                    return waiting, True
+                after_running = True
+
+            if self._pending_count() >= self.max_pending:
+                return None, False
+
+            job = Job(action, func, key)
+            self._jobs[job.id] = job
+            self._trim_history()
+            if after_running:
+                # תוגש ל-workers כשהריצה הנוכחית תסתיים
+                self._follow_ups[key] = job
+                return job, False
+            self._in_flight[key] = job
+
+        self._executor.submit(self._run, job)
+        return job, False
+
+    def get(self, job_id):
+        """קבלת משימה לפי מזהה"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self):
+        """רשימת כל המשימות (החדשות קודם)"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job.to_dict() for job in reversed(jobs)]
+
+    def shutdown(self, wait=False):
+        """עצירת ה-workers"""
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job):
+        """הרצת משימה בתוך worker"""
+        with self._lock:
+            job.status = STATUS_RUNNING
+        job.started_at = datetime.now()
+        job._started_clock = time.monotonic()
+        self._notify(job)
+
+        try:
+            job.result = job.func()
+            if isinstance(job.result, dict) and job.result.get('success') is False:
+                job.status = STATUS_FAILED
+                job.error = job.result.get('error')
+            else:
+                job.status = STATUS_DONE
+        except Exception as e:
+            job.status = STATUS_FAILED
+            job.error = str(e)
+        finally:
+            with self._lock:
+                job.finished_at = datetime.now()
+                job._finished_clock = time.monotonic()
+                job._done.set()
+                # בקשה שתגיע מעכשיו תפעיל ריצה חדשה (לכל היותר אחת)
+                if self._in_flight.get(job.key) is job:
+                    del self._in_flight[job.key]
+                follow_up = self._follow_ups.pop(job.key, None)
+                if follow_up is not None:
+                    self._in_flight[job.key] = follow_up
+            self._notify(job)
+
+            if follow_up is not None:
+                self._start_follow_up(follow_up)
+
+    def _start_follow_up(self, job):
+        """הגשת ריצת המשך שחיכתה לסיום הריצה הקודמת"""
+        try:
+            self._executor.submit(self._run, job)
+        except RuntimeError as e:
+            # התור נעצר בינתיים - המשימה לא תרוץ
+            with self._lock:
+                job.status = STATUS_FAILED
+                job.error = str(e)
+                job.finished_at = datetime.now()
+                job._done.set()
+                if self._in_flight.get(job.key) is job:
+                    del self._in_flight[job.key]
+            self._notify(job)
+
+    def _notify(self, job):
+        if self.on_change:
+            try:
+                self.on_change(job)
+            except Exception:
+                pass
+
+    def _pending_count(self):
+        return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def _trim_history(self):
+        """מחיקת משימות ישנות שהסתיימו מעבר לגודל ההיסטוריה"""
+        excess = len(self._jobs) - self.history_size
+        if excess <= 0:
+            return
+
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[job_id].finished:
+                del self._jobs[job_id]
+                excess -= 1
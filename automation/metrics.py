@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Metrics for Trading Project 002
+מדדים בפורמט Prometheus - מונים, מדדים רגעיים והיסטוגרמות זמני ריצה
+"""
+
+import threading
+
+# גבולות ברירת מחדל להיסטוגרמת זמנים (בשניות)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    metric_type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}',
+                 f'# TYPE {self.name} {self.metric_type}']
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}']
+
+
+class Counter(_Metric):
+    metric_type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    metric_type = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['counts'][index] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    def _render_sample(self, key, state):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, state['counts']):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+            lines.append(f'{self.name}_bucket{labels} {cumulative}')
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f'{self.name}_sum{labels} {_format_value(state["sum"])}')
+        lines.append(f'{self.name}_count{labels} {state["count"]}')
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """רישום מדדים ורינדור לפורמט הטקסט של Prometheus"""
+        self._metrics = []
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class AutomationMetrics:
+    def __init__(self):
+        """המדדים של שרת האוטומציה - מוזנים מאירועי ההתקדמות ומה-handler"""
+        self.registry = MetricsRegistry()
+        r = self.registry
+
+        self.action_requests = r.counter(
+            'automation_action_requests_total', 'Action requests received', ('action', 'attached'))
+        self.action_in_flight = r.gauge(
+            'automation_action_in_flight', 'Actions currently running', ('action',))
+        self.action_errors = r.counter(
+            'automation_action_errors_total', 'Actions that finished with an error', ('action',))
+        self.action_duration = r.histogram(
+            'automation_action_duration_seconds', 'Action wall time', ('action', 'status'))
+        self.http_responses = r.counter(
+            'automation_http_responses_total', 'HTTP responses sent', ('method', 'code'))
+
+        self.files_converted = r.counter(
+            'automation_docs_files_converted_total', 'Markdown files converted to HTML')
+        self.files_skipped = r.counter(
+            'automation_docs_files_skipped_total', 'Markdown files skipped as up to date')
+        self.files_failed = r.counter(
+            'automation_docs_files_failed_total', 'Markdown files that failed to convert')
+        self.file_convert_duration = r.histogram(
+            'automation_docs_file_convert_seconds', 'Per-file Markdown to HTML conversion time')
+        self.bytes_written = r.counter(
+            'automation_bytes_written_total', 'Bytes written to generated files', ('action',))
+        self.git_duration = r.histogram(
+            'automation_git_subprocess_seconds', 'Wall time of git subprocesses', ('command',))
+        self.step_duration = r.histogram(
+            'automation_step_duration_seconds', 'Wall time of reported sub-steps', ('action', 'step'))
+
+    def observe_request(self, action, attached):
+        self.action_requests.inc(action=action, attached=str(bool(attached)).lower())
+
+    def observe_response(self, method, code):
+        self.http_responses.inc(method=method, code=code)
+
+    def observe_event(self, record):
+        """עדכון מדדים מאירוע התקדמות (callback של ProgressBus)"""
+        event = record['event']
+        data = record['data']
+        action = data.get('action', '')
+        seconds = (data.get('elapsed_ms') or 0) / 1000
+
+        if event == 'job_running':
+            self.action_in_flight.inc(action=action)
+        elif event in ('job_done', 'job_failed'):
+            self.action_in_flight.dec(action=action)
+            status = 'done' if event == 'job_done' else 'failed'
+            self.action_duration.observe(seconds, action=action, status=status)
+            if event == 'job_failed':
+                self.action_errors.inc(action=action)
+        elif event == 'file_converted':
+            self.files_converted.inc()
+            self.file_convert_duration.observe(seconds)
+        elif event == 'file_skipped':
+            self.files_skipped.inc()
+        elif event == 'file_failed':
+            self.files_failed.inc()
+        elif event == 'git_command':
+            self.git_duration.observe(seconds, command=data.get('command', ''))
+        elif 'elapsed_ms' in data:
+            self.step_duration.observe(seconds, action=action, step=event)
+
+        if data.get('bytes'):
+            self.bytes_written.inc(data['bytes'], action=action)
+
+    def render(self):
+        return self.registry.render()
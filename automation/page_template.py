@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Page Template for Trading Project 002
+תבנית עמודי התיעוד - נבנית פעם אחת לכל ריצה, עם גיליון סגנונות חיצוני משותף
+"""
+
+import html
+import os
+import re
+from string import Template
+
+try:
+    from .atomic_files import atomic_write_text
+    from .build_manifest import hash_text
+except ImportError:
+    from atomic_files import atomic_write_text
+    from build_manifest import hash_text
+
+# תיקיית הנכסים הסטטיים (יחסית לשורש הפרויקט)
+ASSETS_DIR = 'assets'
+
+# אייקון לכל קטגוריה ב-file_map.json (לתוויות ניווט בלי nav_label)
+CATEGORY_ICONS = {
+    'dashboard': '🏠',
+    'documentation': '📖',
+    'management': '📊',
+    'technical': '🗃️',
+    'analysis': '📈',
+    'utility': '📝'
+}
+
+# גיליון הסגנונות המשותף לכל העמודים - נכתב פעם אחת בשם עם hash
+PAGE_CSS = """\
+* {
+    box-sizing: border-box;
+    margin: 0;
+    padding: 0;
+}
+
+body {
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+    color: #333;
+    line-height: 1.6;
+    margin: 0;
+    padding: 20px;
+    min-height: 100vh;
+}
+
+.container {
+    max-width: 1200px;
+    margin: 0 auto;
+    background: rgba(255, 255, 255, 0.95);
+    border-radius: 15px;
+    padding: 30px;
+    box-shadow: 0 10px 30px rgba(0,0,0,0.3);
+    position: relative;
+}
+
+.back-btn {
+    position: absolute;
+    top: 20px;
+    right: 20px;
+    background: linear-gradient(45deg, #4caf50, #66bb6a);
+    color: white;
+    padding: 10px 15px;
+    border: none;
+    border-radius: 25px;
+    text-decoration: none;
+    font-weight: bold;
+    font-size: 14px;
+    transition: all 0.3s ease;
+}
+
+.back-btn:hover {
+    background: linear-gradient(45deg, #66bb6a, #4caf50);
+    transform: translateY(-2px);
+    box-shadow: 0 5px 15px rgba(76, 175, 80, 0.4);
+}
+
+.header {
+    text-align: center;
+    border-bottom: 3px solid #6f42c1;
+    padding-bottom: 20px;
+    margin-bottom: 30px;
+}
+
+.header h1 {
+    color: #1e3c72;
+    font-size: 2.5em;
+    margin-bottom: 10px;
+    font-weight: 300;
+}
+
+.file-info {
+    background: linear-gradient(120deg, #e3f2fd 0%, #bbdefb 100%);
+    padding: 15px;
+    border-radius: 10px;
+    margin: 20px 0;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    border-right: 4px solid #6f42c1;
+}
+
+h1, h2, h3 {
+    color: #1e3c72;
+}
+
+h2 {
+    border-right: 4px solid #6f42c1;
+    padding-right: 15px;
+    margin-top: 30px;
+}
+
+table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 20px 0;
+    background: white;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+    border-radius: 8px;
+    overflow: hidden;
+}
+
+th, td {
+    padding: 12px;
+    text-align: right;
+    border-bottom: 1px solid #ddd;
+}
+
+th {
+    background: #f5f5f5;
+    font-weight: bold;
+    color: #333;
+}
+
+tr:hover {
+    background: #f9f9f9;
+}
+
+code {
+    background: #f5f5f5;
+    padding: 2px 6px;
+    border-radius: 4px;
+    font-family: 'Courier New', monospace;
+}
+
+pre {
+    background: #f5f5f5;
+    padding: 15px;
+    border-radius: 8px;
+    overflow-x: auto;
+    border-right: 4px solid #6f42c1;
+}
+
+blockquote {
+    border-right: 4px solid #6f42c1;
+    padding: 10px 20px;
+    margin: 20px 0;
+    background: #f9f9f9;
+    border-radius: 0 8px 8px 0;
+}
+
+ul, ol {
+    padding-right: 30px;
+}
+
+li {
+    margin-bottom: 8px;
+}
+
+.highlight {
+    background: linear-gradient(120deg, #fff3cd 0%, #ffeaa7 100%);
+    padding: 15px;
+    border-radius: 8px;
+    border-right: 4px solid #ffc107;
+    margin: 15px 0;
+}
+
+.timestamp {
+    text-align: center;
+    color: #666;
+    font-size: 0.9em;
+    margin-top: 30px;
+    padding-top: 20px;
+    border-top: 2px solid #eee;
+}
+
+.quick-access-section {
+    background: rgba(255, 255, 255, 0.95);
+    border-radius: 15px;
+    padding: 25px;
+    box-shadow: 0 10px 30px rgba(0,0,0,0.3);
+    margin-top: 30px;
+}
+
+.quick-access-section h2 {
+    color: #1e3c72;
+    margin-bottom: 20px;
+    text-align: center;
+}
+
+.quick-access {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
+    gap: 10px;
+}
+
+.quick-btn {
+    background: linear-gradient(45deg, #6f42c1, #8e44ad);
+    color: white;
+    padding: 6px 10px;
+    border: none;
+    border-radius: 15px;
+    cursor: pointer;
+    transition: all 0.3s ease;
+    font-weight: bold;
+    text-decoration: none;
+    text-align: center;
+    display: block;
+    font-size: 0.75em;
+}
+
+.quick-btn:hover {
+    background: linear-gradient(45deg, #8e44ad, #6f42c1);
+    transform: translateY(-2px);
+    box-shadow: 0 5px 15px rgba(111, 66, 193, 0.4);
+}
+
+@media (max-width: 768px) {
+    .container {
+        padding: 20px;
+        margin: 10px;
+    }
+
+    .file-info {
+        flex-direction: column;
+        gap: 10px;
+    }
+}
+"""
+
+# שלד העמוד - $stylesheet, $nav ו-$timestamp ממולאים פעם אחת לכל ריצה, השאר לכל עמוד
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="he" dir="rtl">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>$title - Trading Project 002</title>
+    <link rel="stylesheet" href="$stylesheet">
+</head>
+<body>
+    <div class="container">
+        <a href="project_dashboard.html" class="back-btn">🏠 חזרה לדשבורד</a>
+        
+        <div class="header">
+            <h1>$title</h1>
+        </div>
+        
+        <div class="file-info">
+            <div><strong>📄 גודל קובץ:</strong> $size_kb KB</div>
+            <div><strong>🕒 עודכן:</strong> $modified</div>
+            <div><strong>🔄 נוצר אוטומטית מ:</strong> $source_name</div>
+        </div>
+        
+        <div class="content">
+            $content
+        </div>
+        
+        <!-- Quick Access Section -->
+        <div class="quick-access-section">
+            <h2>⚡ גישה מהירה</h2>
+            <div class="quick-access">
+$nav
+            </div>
+        </div>
+        
+        <div class="timestamp">
+            [DATE] HTML נוצר: $timestamp<br>
+            🔄 עדכון אוטומטי מקובץ המקור<br>
+            🤖 נוצר על ידי מערכת העדכון האוטומטית
+        </div>
+    </div>
+</body>
+</html>"""
+
+
+# שדות שמשתנים בכל ריצה בלי שהתוכן השתנה - לא נחשבים שינוי בעמוד
+VOLATILE_PATTERNS = [
+    re.compile(r'(HTML נוצר: )[^<]*'),
+    re.compile(r'(🕒 עודכן:</strong> )[^<]*')
+]
+
+# קישור מקומי לעמוד HTML בגוף העמוד (בלי http:, mailto: וכו')
+LINK_PATTERN = re.compile(r'<a href="([^":#?]+\.html)(?:#[^"]*)?"')
+
+
+def strip_volatile(page):
+    """העמוד בלי זמן היצירה וזמן עדכון המקור - להשוואה בין גרסאות"""
+    for pattern in VOLATILE_PATTERNS:
+        page = pattern.sub(r'\1', page)
+    return page
+
+
+def nav_links_from_file_map(file_map):
+    """קישורי הגישה המהירה מתוך file_map.json - כל קבצי ה-HTML, הדשבורד ראשון
+
+    התווית נלקחת מ-nav_label של הקובץ, או נבנית מאייקון הקטגוריה ושם הקובץ.
+    """
+    links = []
+    for section in file_map.get('file_structure', {}).values():
+        if not isinstance(section, dict):
+            continue
+        for name, info in section.items():
+            if not isinstance(info, dict) or info.get('type') != 'html':
+                continue
+            label = info.get('nav_label')
+            if not label:
+                icon = CATEGORY_ICONS.get(info.get('category'), '📄')
+                label = f"{icon} {name[:-len('.html')].replace('_', ' ').title()}"
+            links.append((name, label))
+
+    links.sort(key=lambda link: link[0] != 'project_dashboard.html')
+    return links
+
+
+def stylesheet_href(css=PAGE_CSS):
+    """href יחסי לגיליון הסגנונות - שם הקובץ משתנה עם התוכן, ולכן אפשר לשמור אותו ב-cache לתמיד"""
+    return f"{ASSETS_DIR}/docs.{hash_text(css)[:12]}.css"
+
+
+def write_stylesheet(project_root, css=PAGE_CSS):
+    """כתיבת גיליון הסגנונות (אם עוד לא קיים) - מחזיר href יחסי"""
+    href = stylesheet_href(css)
+    path = os.path.join(project_root, *href.split('/'))
+
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write_text(path, css)
+
+    return href
+
+
+def add_link_titles(html_content, titles):
+    """הוספת כותרת העמוד המקושר (tooltip) לקישורים מקומיים בגוף העמוד
+
+    titles - {שם עמוד HTML באותיות קטנות: כותרת}
+    """
+    def replace(match):
+        title = titles.get(match.group(1).rsplit('/', 1)[-1].lower())
+        # קישור שכבר יש לו title (או מאפיינים אחרים) נשאר כמו שהוא
+        if not title or not match.string.startswith('>', match.end()):
+            return match.group(0)
+        return f'{match.group(0)} title="{html.escape(title, quote=True)}"'
+
+    return LINK_PATTERN.sub(replace, html_content)
+
+
+def _escape(value):
+    # ערכים שנאפים לתוך תבנית שתעבור substitute נוסף
+    return str(value).replace('$', '$$')
+
+
+class PageLayout:
+    def __init__(self, stylesheet_href, nav_links, timestamp):
+        """תבנית עמוד מהודרת לריצה אחת
+
+        החלקים המשותפים (גיליון סגנונות, ניווט, זמן יצירה) ממולאים כאן פעם אחת;
+        render ממלא רק את השדות של העמוד עצמו.
+        """
+        self.stylesheet_href = stylesheet_href
+        nav_html = '\n'.join(f'                <a href="{href}" class="quick-btn">{label}</a>'
+                              for href, label in nav_links)
+        self._page = Template(Template(PAGE_TEMPLATE).safe_substitute(
+            stylesheet=_escape(stylesheet_href),
+            nav=_escape(nav_html),
+            timestamp=_escape(timestamp)
+        ))
+
+        # כל מה שמשפיע על העמוד חוץ מזמן היצירה - שינוי כאן מחייב בנייה מחדש
+        self.signature = hash_text('\0'.join([PAGE_TEMPLATE, stylesheet_href, nav_html]))
+
+    def render(self, title, content, source_name, size_kb, modified):
+        """HTML מלא לעמוד אחד"""
+        return self._page.substitute(title=title, content=content, source_name=source_name,
+                                     size_kb=size_kb, modified=modified)
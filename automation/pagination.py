@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Pagination for Trading Project 002
+חלוקת מסמכי MD ארוכים (יומן השיחות ומסמכים גדולים) לעמודים של N חלקים ועמוד אינדקס
+"""
+
+import re
+from pathlib import Path
+
+# מסמכים שתמיד מחולקים לעמודים, וסף גודל לכל השאר
+ALWAYS_PAGINATE = {'conversation_log.md'}
+PAGINATE_MIN_BYTES = 256 * 1024
+
+# כמה חלקים (סשנים / פרקים) בכל עמוד
+SECTIONS_PER_PAGE = 10
+
+# ביומן השיחות חלק מתחיל בכותרת סשן ("## 🎯 **Session #012** ..."), במסמכים אחרים בכל כותרת ##
+SESSION_HEADING = re.compile(r'^## \W*\*\*Session #\d+', re.MULTILINE)
+SECTION_HEADING = re.compile(r'^## ', re.MULTILINE)
+SECTION_PATTERNS = {'conversation_log.md': SESSION_HEADING}
+
+
+class Page:
+    def __init__(self, filename, number, markdown, headings):
+        """עמוד אחד של מסמך מחולק"""
+        self.filename = filename
+        self.number = number
+        self.markdown = markdown
+        self.headings = headings
+
+
+def should_paginate(md_file):
+    """האם לבנות את המסמך כעמודים נפרדים"""
+    if md_file.name in ALWAYS_PAGINATE:
+        return True
+    try:
+        return md_file.stat().st_size >= PAGINATE_MIN_BYTES
+    except OSError:
+        return False
+
+
+def split_sections(md_content, pattern=SECTION_HEADING):
+    """(הקדמה, [חלקים]) - כל חלק מתחיל בכותרת שמתאימה לתבנית ונמשך עד הבאה"""
+    starts = [match.start() for match in pattern.finditer(md_content)]
+    if not starts:
+        return md_content, []
+
+    bounds = starts + [len(md_content)]
+    return md_content[:starts[0]], [md_content[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def heading_text(section):
+    """טקסט הכותרת של חלק, בלי סימני markdown"""
+    return section.split('\n', 1)[0].lstrip('#').replace('**', '').strip()
+
+
+def page_filename(name, number):
+    return f"{Path(name).stem}_p{number:03d}.html"
+
+
+def paginate(name, md_content, sections_per_page=SECTIONS_PER_PAGE):
+    """חלוקת מסמך לעמודים - (הקדמה, [Page]); רשימה ריקה אם אין במה לחלק
+
+    העמודים נקבעים לפי מיקום החלקים, כך שסשן חדש בסוף היומן משנה רק את העמוד
+    האחרון (ואת קישור "הבא" של העמוד שלפניו כשנפתח עמוד חדש).
+    """
+    preamble, sections = split_sections(md_content, SECTION_PATTERNS.get(name, SECTION_HEADING))
+    if not sections:
+        return preamble, []
+
+    index_name = Path(name).with_suffix('.html').name
+    groups = [sections[i:i + sections_per_page] for i in range(0, len(sections), sections_per_page)]
+    pages = []
+    for number, group in enumerate(groups, 1):
+        nav = [f"[📑 אינדקס]({index_name})"]
+        if number > 1:
+            nav.append(f"[→ עמוד קודם]({page_filename(name, number - 1)})")
+        if number < len(groups):
+            nav.append(f"[עמוד הבא ←]({page_filename(name, number + 1)})")
+        nav_line = ' | '.join(nav)
+
+        markdown = f"{nav_line}\n\n{''.join(group).rstrip()}\n\n---\n\n{nav_line}\n"
+        pages.append(Page(page_filename(name, number), number, markdown,
+                          [heading_text(section) for section in group]))
+
+    return preamble, pages
+
+
+def index_markdown(preamble, pages):
+    """עמוד האינדקס - ההקדמה של המסמך ורשימת העמודים עם הכותרות שבכל אחד"""
+    lines = [preamble.rstrip(), '', '## 📑 עמודים', '']
+    for page in pages:
+        lines.append(f"### [עמוד {page.number}]({page.filename})")
+        lines.extend(f"- {heading}" for heading in page.headings)
+        lines.append('')
+    return '\n'.join(lines)
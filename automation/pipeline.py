@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Pipeline for Trading Project 002
+הרצת כמה פעולות אוטומציה כ-DAG - כל שלב מקבל את התוצרים של השלבים שלפניו
+"""
+
+import contextlib
+import time
+
+# סטטוסים של שלב
+STAGE_DONE = 'done'
+STAGE_SKIPPED = 'skipped'
+STAGE_FAILED = 'failed'
+
+
+class Stage:
+    def __init__(self, name, func, depends_on=(), skip_if_unchanged=False):
+        """שלב בצינור
+
+        func - מקבל dict של תוצרי השלבים הקודמים ומחזיר dict עם success, changed ו-changed_files
+        skip_if_unchanged - דלג על השלב אם אף שלב קודם לא שינה דבר
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.skip_if_unchanged = skip_if_unchanged
+
+
+class Pipeline:
+    def __init__(self, stages, progress=None, context=None):
+        """אתחול צינור משלבים - הסדר נקבע לפי התלויות ולא לפי סדר הרשימה
+
+        context - אופציונלי, מקבל stage=<שם> ומחזיר context manager שעוטף את ריצת השלב
+        (למשל ProgressBus.context - האירועים שהשלב מדווח מסומנים בשם שלו)
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.progress = progress
+        self.context = context
+        self.order = self._topological_order()
+
+    def _report(self, event, **data):
+        """דיווח אירוע התקדמות (אם הוגדר callback)"""
+        if self.progress:
+            self.progress(event, **data)
+
+    def _topological_order(self):
+        """מיון טופולוגי (Kahn) - שגיאה אם יש מעגל או תלות לא מוכרת"""
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"שלב {stage.name} תלוי בשלב לא קיים: {dependency}")
+
+        remaining = {name: set(stage.depends_on) for name, stage in self.stages.items()}
+        order = []
+
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"מעגל תלויות בין השלבים: {', '.join(sorted(remaining))}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+        return order
+
+    def _upstream(self, name):
+        """כל השלבים שהשלב תלוי בהם, ישירות או בעקיפין"""
+        seen = set()
+        pending = list(self.stages[name].depends_on)
+        while pending:
+            dependency = pending.pop()
+            if dependency not in seen:
+                seen.add(dependency)
+                pending.extend(self.stages[dependency].depends_on)
+        return seen
+
+    def run(self):
+        """הרצת כל השלבים לפי הסדר"""
+        started = time.monotonic()
+        outputs = {}
+        stages = {}
+
+        for name in self.order:
+            stage = self.stages[name]
+            upstream = self._upstream(name)
+
+            failed = [dep for dep in upstream if stages[dep]['status'] == STAGE_FAILED]
+            if failed:
+                stages[name] = {'status': STAGE_SKIPPED, 'reason': f"שלב קודם נכשל: {', '.join(sorted(failed))}"}
+                self._report('stage_skipped', stage=name, reason='upstream_failed')
+                continue
+
+            if stage.skip_if_unchanged and upstream and not any(
+                    outputs.get(dep, {}).get('changed') for dep in upstream):
+                stages[name] = {'status': STAGE_SKIPPED, 'reason': 'אין שינויים מהשלבים הקודמים'}
+                self._report('stage_skipped', stage=name, reason='no_upstream_changes')
+                continue
+
+            stage_started = time.monotonic()
+            self._report('stage_started', stage=name)
+            try:
+                with self.context(stage=name) if self.context else contextlib.nullcontext():
+                    result = stage.func({dep: outputs[dep] for dep in upstream if dep in outputs})
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+
+            elapsed_ms = round((time.monotonic() - stage_started) * 1000, 1)
+            status = STAGE_DONE if result.get('success') else STAGE_FAILED
+            outputs[name] = result
+            stages[name] = {'status': status, 'elapsed_ms': elapsed_ms, 'result': result}
+            self._report(f'stage_{status}', stage=name, changed=bool(result.get('changed')),
+                         elapsed_ms=elapsed_ms)
+
+        result = {
+            'success': all(info['status'] != STAGE_FAILED for info in stages.values()),
+            'stages': stages,
+            'order': self.order,
+            'elapsed_ms': round((time.monotonic() - started) * 1000, 1)
+        }
+        if not result['success']:
+            result['error'] = 'חלק מהשלבים נכשלו'
+        return result
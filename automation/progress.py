@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Progress Events for Trading Project 002
+ערוץ אירועי התקדמות מובנים - מהמעדכנים אל מנויי SSE בשרת
+"""
+
+import contextlib
+import contextvars
+import itertools
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+
+
+class ProgressBus:
+    def __init__(self, history_size=200, subscriber_queue_size=1000):
+        """אתחול ערוץ אירועים עם היסטוריה קצרה להשלמת חיבורים שנותקו"""
+        self.subscriber_queue_size = subscriber_queue_size
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+        self._listeners = []
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        # הקשר של הקריאה הנוכחית (פעולה, שלב) - נפרד לכל thread
+        self._context = contextvars.ContextVar('progress_context', default={})
+
+    def publish(self, event, **data):
+        """פרסום אירוע לכל המנויים"""
+        record = {
+            'id': next(self._seq),
+            'event': event,
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'data': data
+        }
+
+        with self._lock:
+            self._history.append(record)
+            subscribers = list(self._subscribers)
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(record)
+            except Exception:
+                pass
+
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(record)
+            except queue.Full:
+                # מנוי איטי - זרוק את האירוע הישן ביותר כדי לא לחסום את המעדכן
+                try:
+                    subscriber.get_nowait()
+                    subscriber.put_nowait(record)
+                except (queue.Empty, queue.Full):
+                    pass
+
+        return record
+
+    def reporter(self, **context):
+        """יצירת פונקציית דיווח - לכל אירוע נוספים context, ההקשר של הקריאה הנוכחית (context())
+        והנתונים של האירוע, בסדר הזה"""
+        def report(event, **data):
+            return self.publish(event, **{**context, **self._context.get(), **data})
+        return report
+
+    @contextlib.contextmanager
+    def context(self, **fields):
+        """הקשר לכל האירועים שמדווחים מתוך הבלוק (למשל action של המשימה ו-stage של הצינור)"""
+        token = self._context.set({**self._context.get(), **fields})
+        try:
+            yield
+        finally:
+            self._context.reset(token)
+
+    def add_listener(self, listener):
+        """רישום callback סינכרוני שנקרא על כל אירוע (למשל איסוף מדדים)"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def subscribe(self, last_event_id=None, subscriber=None):
+        """הרשמה לאירועים - מחזיר תור שאליו יגיעו האירועים החדשים
+
+        subscriber - תור משלך (כל אובייקט עם put_nowait, למשל תור של לולאת asyncio);
+        ברירת המחדל היא queue.Queue חסום בגודל subscriber_queue_size.
+        """
+        if subscriber is None:
+            subscriber = queue.Queue(maxsize=self.subscriber_queue_size)
+
+        with self._lock:
+            if last_event_id is not None:
+                for record in self._history:
+                    if record['id'] > last_event_id:
+                        subscriber.put_nowait(record)
+            self._subscribers.add(subscriber)
+
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """ביטול הרשמה"""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
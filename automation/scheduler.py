@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Update Scheduler for Trading Project 002
+עדכונים אוטומטיים ברקע - מעקב אחרי שינויי .md ופעולות מתוזמנות לפי מרווח זמן
+"""
+
+import re
+import sys
+import threading
+import time
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+# יחידות זמן למרווחים (למשל 30m, 1h, 1d)
+INTERVAL_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_interval(value):
+    """המרת מרווח כמו '15m' / '2h' / '1d' / '90' לשניות"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*', str(value).lower())
+    if not match:
+        raise ValueError(f"מרווח זמן לא תקין: {value}")
+    return float(match.group(1)) * INTERVAL_UNITS[match.group(2) or 's']
+
+
+class MarkdownWatcher:
+    def __init__(self, root, poll_interval=2.0):
+        """מעקב אחרי קבצי .md בתיקיית הפרויקט - inotify אם זמין, אחרת polling"""
+        self.root = root
+        self.poll_interval = poll_interval
+        self._inotify = None
+        self._snapshot = None
+
+        if INotify is not None:
+            try:
+                self._inotify = INotify()
+                # מחיקה ושינוי שם (MOVED_FROM) מדווחים כשינוי - הבנייה מסירה את העמודים הישנים
+                self._inotify.add_watch(str(root), inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO
+                                        | inotify_flags.MOVED_FROM | inotify_flags.CREATE
+                                        | inotify_flags.DELETE)
+            except OSError:
+                self._inotify = None
+
+        if self._inotify is None:
+            self._snapshot = self._scan()
+
+    @property
+    def mode(self):
+        return 'inotify' if self._inotify is not None else 'polling'
+
+    def wait_for_changes(self, timeout):
+        """המתנה לשינויים עד timeout שניות - מחזיר set של שמות קבצי .md שהשתנו, נוצרו או נמחקו"""
+        if self._inotify is not None:
+            events = self._inotify.read(timeout=int(timeout * 1000))
+            return {event.name for event in events if event.name.endswith('.md')}
+
+        time.sleep(min(timeout, self.poll_interval))
+        current = self._scan()
+        changed = {name for name in current.keys() | self._snapshot.keys()
+                   if current.get(name) != self._snapshot.get(name)}
+        self._snapshot = current
+        return changed
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+
+    def _scan(self):
+        snapshot = {}
+        for md_file in self.root.glob("*.md"):
+            try:
+                stat = md_file.stat()
+                snapshot[md_file.name] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+        return snapshot
+
+
+class UpdateScheduler:
+    def __init__(self, automation_server, watch=True, intervals=None, debounce_seconds=2.0,
+                 poll_interval=2.0):
+        """מתזמן עדכונים - רץ ב-thread משלו ומגיש משימות לתור של השרת
+
+        watch - בניית HTML מחדש לקבצי .md שהשתנו
+        intervals - {action: interval} למשל {'update_conversations': '1h', 'github_sync': 86400}
+        debounce_seconds - כמה זמן לחכות לשקט אחרי רצף שינויים לפני בנייה
+        """
+        self.automation_server = automation_server
+        self.watch = watch
+        self.intervals = {action: parse_interval(value) for action, value in (intervals or {}).items()}
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval = poll_interval
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._watcher = None
+
+    def start(self):
+        """הפעלת ה-thread של המתזמן"""
+        if self.watch:
+            self._watcher = MarkdownWatcher(self.automation_server.project_root, self.poll_interval)
+            print(f"[SCHEDULER] מעקב אחרי קבצי .md ({self._watcher.mode})")
+            if INotify is None and sys.platform.startswith('linux'):
+                print("[SCHEDULER] ל-inotify במקום polling: pip install inotify_simple (אופציונלי)")
+        for action, seconds in self.intervals.items():
+            print(f"[SCHEDULER] {action} כל {int(seconds)} שניות")
+
+        self._thread = threading.Thread(target=self._run, name='automation-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """עצירת המתזמן"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self._watcher:
+            self._watcher.close()
+
+    def _run(self):
+        now = time.monotonic()
+        next_due = {action: now + seconds for action, seconds in self.intervals.items()}
+        pending = set()
+        last_change = None
+
+        while not self._stop.is_set():
+            now = time.monotonic()
+
+            # פעולות מתוזמנות
+            for action, due in next_due.items():
+                if now >= due:
+                    self._submit(action)
+                    next_due[action] = now + self.intervals[action]
+
+            # שינויים שנאספו ושקטו מספיק זמן - בנייה אחת לכולם
+            # קובץ שנשמר בזמן שבנייה שלו כבר רצה מקבל ריצת המשך - הבנייה הנוכחית קראה גרסה ישנה
+            if pending and now - last_change >= self.debounce_seconds:
+                if self._submit('update_docs', follow_up=True, md_files=sorted(pending)):
+                    pending = set()
+                else:
+                    # התור מלא - השינויים נשמרים וננסה שוב אחרי debounce נוסף
+                    last_change = now
+
+            timeout = self._next_timeout(now, next_due, pending, last_change)
+            if self._watcher is not None:
+                changed = self._watcher.wait_for_changes(timeout)
+                if changed:
+                    pending.update(changed)
+                    last_change = time.monotonic()
+            else:
+                self._stop.wait(timeout)
+
+    def _next_timeout(self, now, next_due, pending, last_change):
+        """זמן ההמתנה עד האירוע הבא (פעולה מתוזמנת או סוף debounce)"""
+        deadlines = list(next_due.values())
+        if pending:
+            deadlines.append(last_change + self.debounce_seconds)
+        timeout = min(deadlines) - now if deadlines else self.poll_interval
+        return max(0.05, min(timeout, self.poll_interval))
+
+    def _submit(self, action, follow_up=False, **params):
+        """הגשת פעולה לשרת - מחזיר True אם המשימה התקבלה (חדשה או מצטרפת לקיימת)"""
+        job, attached = self.automation_server.submit_action(action, follow_up=follow_up, **params)
+        if job is None:
+            print(f"[SCHEDULER] התור מלא - {action} נדחה לסבב הבא")
+            return False
+        if not attached:
+            details = f" ({', '.join(params['md_files'])})" if params.get('md_files') else ''
+            print(f"[SCHEDULER] הופעל {action}{details} - משימה {job.id}")
+        return True
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Search Index for Trading Project 002
+אינדקס הפוך לחיפוש בתיעוד - עברית ואנגלית, מחולק לקבצים לפי האות הראשונה של המילה
+"""
+
+import json
+import os
+import re
+from collections import Counter
+
+try:
+    from .atomic_files import write_text_if_changed
+except ImportError:
+    from atomic_files import write_text_if_changed
+
+INDEX_VERSION = 3
+
+# מספר קבצי ה-shard באינדקס גדול - מילה נכנסת ל-shard לפי האות הראשונה שלה (קוד unicode
+# מודולו המספר), והחיפוש בדפדפן טוען רק את ה-shard של המילה
+SHARD_COUNT = 16
+
+# אינדקס קטן (עד כמה מילים שונות) נשמר כ-shard אחד - טעינה אחת במקום הרבה קבצים זעירים
+SINGLE_SHARD_MAX_TOKENS = 20000
+
+MIN_TOKEN_LENGTH = 2
+
+# ניקוד וטעמים
+HEBREW_MARKS = re.compile(r'[\u0591-\u05c7]')
+
+WORD_PATTERN = re.compile(r'[^\W_]+')
+
+HEBREW_WORD = re.compile(r'[\u05d0-\u05ea]+$')
+
+# אותיות שימוש שנצמדות לתחילת מילה (וה-, ב-, ל-, מ-, ש-, כ-)
+HEBREW_PREFIXES = 'והבלמשכ'
+
+# מילים שכיחות שלא שווה לאנדקס
+STOP_WORDS = {
+    'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'is', 'are', 'with', 'by', 'as', 'at', 'be',
+    'it', 'an', 'this', 'that', 'from',
+    'של', 'את', 'על', 'עם', 'או', 'גם', 'כל', 'לא', 'זה', 'הוא', 'היא', 'אם', 'כי', 'יש', 'אין'
+}
+
+
+def tokenize(text):
+    """פירוק טקסט למילים לאינדקס
+
+    אותיות קטנות, בלי ניקוד; למילה עברית עם אותיות שימוש בתחילתה נוספות גם
+    הצורות בלעדיהן (והמסחר → המסחר, מסחר), כך שחיפוש "מסחר" ימצא אותה.
+    """
+    tokens = []
+    for word in WORD_PATTERN.findall(HEBREW_MARKS.sub('', text).lower()):
+        if len(word) < MIN_TOKEN_LENGTH or word in STOP_WORDS:
+            continue
+        tokens.append(word)
+
+        if HEBREW_WORD.match(word):
+            stripped = word
+            for _ in range(2):
+                if len(stripped) > 3 and stripped[0] in HEBREW_PREFIXES:
+                    stripped = stripped[1:]
+                    if stripped not in STOP_WORDS:
+                        tokens.append(stripped)
+                else:
+                    break
+    return tokens
+
+
+def shard_key(token, shard_count):
+    """שם קובץ ה-shard של מילה - קוד ה-unicode של האות הראשונה מודולו shard_count, ב-hex"""
+    return format(ord(token[0]) % shard_count, 'x')
+
+
+class SearchIndex:
+    def __init__(self, directory):
+        """אינדקס בתיקייה - index.json עם רשימת המסמכים ו-shard_<key>.json עם המילים
+
+        לכל מסמך מספר קצר (id) שמשמש ב-shards: {token: {id: מספר הופעות}}.
+        state.json (לא נטען בדפדפן) שומר לכל מסמך באילו shards הוא מופיע ואת מספר המילים
+        בכל shard - כך נטענים ונכתבים רק ה-shards של המסמכים שהשתנו.
+        """
+        self.directory = directory
+        self.documents = {}
+        self.shard_count = 1
+        self._doc_shards = {}
+        self._shard_sizes = {}
+        self._shards = {}
+        self._changed = set()
+        self._fresh = True
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.directory, 'index.json'), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION:
+            # פורמט ישן - האינדקס נבנה מחדש וה-shards הישנים נמחקים בשמירה
+            return
+
+        self.documents = data.get('documents', {})
+        self.shard_count = data.get('shard_count', 1)
+        self._fresh = False
+        try:
+            with open(os.path.join(self.directory, 'state.json'), 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self._doc_shards = {doc_id: state['doc_shards'][doc_id] for doc_id in self.documents}
+            self._shard_sizes = state['shard_sizes']
+        except (OSError, ValueError, KeyError, TypeError):
+            # אין מפת מסמכים - טוענים הכל פעם אחת ובונים אותה מחדש
+            self._load_all()
+            if self._changed:
+                # וגם shard חסר או פגום - אין דרך לדעת מה היה בו, האינדקס נבנה מחדש
+                self.documents = {}
+                self.shard_count = 1
+                self._doc_shards = {}
+                self._shards = {}
+                self._changed = set()
+                self._fresh = True
+
+    def _shard(self, key):
+        """ה-shard לפי הצורך - נטען מהדיסק בפעם הראשונה שנוגעים בו"""
+        shard = self._shards.get(key)
+        if shard is not None:
+            return shard
+
+        shard = {}
+        if not self._fresh:
+            try:
+                with open(os.path.join(self.directory, f'shard_{key}.json'), 'r', encoding='utf-8') as f:
+                    shard = json.load(f)
+            except (OSError, ValueError):
+                shard = None
+        if not isinstance(shard, dict):
+            # shard חסר או פגום - המסמכים שהופיעו בו יוסרו ויאונדקסו מחדש בבנייה הבאה
+            self._shards[key] = shard = {}
+            self._changed.add(key)
+            for doc_id in [doc_id for doc_id, keys in self._doc_shards.items() if key in keys]:
+                self.remove_document(doc_id)
+            return shard
+
+        self._shards[key] = shard
+        return shard
+
+    def _load_all(self):
+        """טעינת כל ה-shards ובניית מפת המסמכים מחדש"""
+        for index in range(self.shard_count):
+            self._shard(format(index, 'x'))
+
+        by_short_id = {document['id']: doc_id for doc_id, document in self.documents.items()}
+        self._doc_shards = {doc_id: '' for doc_id in self.documents}
+        for key, shard in sorted(self._shards.items()):
+            for short_id in {short_id for postings in shard.values() for short_id in postings}:
+                doc_id = by_short_id.get(short_id)
+                if doc_id is not None:
+                    self._doc_shards[doc_id] += key
+        self._dirty = True
+
+    def needs_update(self, doc_id, source_hash):
+        """האם תוכן המסמך השתנה מאז שאונדקס"""
+        return self.documents.get(doc_id, {}).get('source') != source_hash
+
+    def add_document(self, doc_id, text, source_hash, title=None, url=None, parent=None):
+        """אינדוקס (מחדש) של מסמך
+
+        parent - המסמך שהעמוד שייך אליו (עמודים של מסמך מחולק)
+        """
+        self.remove_document(doc_id)
+
+        short_id = self._next_id()
+        keys = set()
+        for token, count in Counter(tokenize(text)).items():
+            key = shard_key(token, self.shard_count)
+            self._shard(key).setdefault(token, {})[short_id] = count
+            keys.add(key)
+        self._changed.update(keys)
+
+        self.documents[doc_id] = {
+            'id': short_id,
+            'title': title or doc_id,
+            'url': url or doc_id,
+            'source': source_hash
+        }
+        if parent:
+            self.documents[doc_id]['parent'] = parent
+        self._doc_shards[doc_id] = ''.join(sorted(keys))
+        self._dirty = True
+
+    def remove_document(self, doc_id):
+        """הסרת מסמך מהמילים שבהן הופיע - נסרקים רק ה-shards שלו"""
+        document = self.documents.pop(doc_id, None)
+        keys = self._doc_shards.pop(doc_id, '')
+        if document is None:
+            return
+
+        short_id = document['id']
+        for key in keys:
+            shard = self._shard(key)
+            for token in [token for token, postings in shard.items() if short_id in postings]:
+                del shard[token][short_id]
+                if not shard[token]:
+                    del shard[token]
+            self._changed.add(key)
+        self._dirty = True
+
+    def remove_pages(self, parent, keep=()):
+        """הסרת העמודים של מסמך מחולק (חוץ מ-keep)"""
+        for doc_id in [doc_id for doc_id, document in self.documents.items()
+                       if document.get('parent') == parent and doc_id not in keep]:
+            self.remove_document(doc_id)
+
+    def _next_id(self):
+        """מספר פנוי למסמך חדש (מספרים של מסמכים שהוסרו חוזרים לשימוש)"""
+        used = {document['id'] for document in self.documents.values()}
+        short_id = 0
+        while str(short_id) in used:
+            short_id += 1
+        return str(short_id)
+
+    def prune(self, existing_ids):
+        """הסרת מסמכים שהמקור שלהם כבר לא קיים (עמודים נשארים כל עוד המסמך שלהם קיים)"""
+        for doc_id in [doc_id for doc_id, document in self.documents.items()
+                       if document.get('parent', doc_id) not in existing_ids]:
+            self.remove_document(doc_id)
+
+    def _reshard(self, shard_count):
+        """חלוקה מחדש של כל המילים כשהאינדקס עובר את סף ה-shard הבודד (בכיוון כלשהו)"""
+        self._load_all()
+        postings = {}
+        for shard in self._shards.values():
+            postings.update(shard)
+
+        self.shard_count = shard_count
+        self._shards = {format(index, 'x'): {} for index in range(shard_count)}
+        for token, token_postings in postings.items():
+            self._shards[shard_key(token, shard_count)][token] = token_postings
+        self._changed = set(self._shards)
+        self._load_all()
+
+    def save(self):
+        """כתיבת ה-shards שהשתנו, index.json ו-state.json - מחזיר את הקבצים שנכתבו"""
+        if not self._dirty:
+            return []
+
+        sizes = dict(self._shard_sizes)
+        sizes.update({key: len(shard) for key, shard in self._shards.items()})
+        shard_count = 1 if sum(sizes.values()) <= SINGLE_SHARD_MAX_TOKENS else SHARD_COUNT
+        if shard_count != self.shard_count:
+            self._reshard(shard_count)
+
+        keys = [format(index, 'x') for index in range(self.shard_count)]
+        if self._fresh:
+            # אינדקס חדש - כל ה-shards נכתבים, גם ריקים, במקום קבצים מפורמט קודם
+            self._changed.update(keys)
+        self._shard_sizes = {key: len(self._shards[key]) if key in self._shards else sizes.get(key, 0)
+                             for key in keys}
+
+        os.makedirs(self.directory, exist_ok=True)
+        written = []
+        for key in sorted(self._changed & set(keys)):
+            path = os.path.join(self.directory, f'shard_{key}.json')
+            if write_text_if_changed(path, json.dumps(self._shard(key), ensure_ascii=False, sort_keys=True,
+                                                      separators=(',', ':'))):
+                written.append(path)
+
+        # shards שלא שייכים לחלוקה הנוכחית (אינדקס שגדל או קטן, או פורמט קודם)
+        for name in sorted(os.listdir(self.directory)):
+            if name.startswith('shard_') and name.endswith('.json') and name[6:-5] not in keys:
+                os.unlink(os.path.join(self.directory, name))
+                written.append(os.path.join(self.directory, name))
+
+        path = os.path.join(self.directory, 'index.json')
+        data = {'version': INDEX_VERSION, 'shard_count': self.shard_count,
+                'min_token_length': MIN_TOKEN_LENGTH, 'documents': self.documents}
+        if write_text_if_changed(path, json.dumps(data, ensure_ascii=False, sort_keys=True,
+                                                  separators=(',', ':'))):
+            written.append(path)
+
+        path = os.path.join(self.directory, 'state.json')
+        state = {'doc_shards': self._doc_shards, 'shard_sizes': self._shard_sizes}
+        if write_text_if_changed(path, json.dumps(state, ensure_ascii=False, sort_keys=True,
+                                                  separators=(',', ':'))):
+            written.append(path)
+
+        self._changed = set()
+        self._fresh = False
+        self._dirty = False
+        return written
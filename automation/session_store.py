@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Session Store for Trading Project 002
+מאגר סשנים append-only (JSONL) מאחורי conversation_log.md - הוספה בעלות קבועה,
+ועדכון היומן רק בזנב שלו (הסשן החדש והסטטיסטיקות), בלי לכתוב מחדש את כל הקובץ
+"""
+
+import json
+import os
+
+# כמה בייטים מסוף הקובץ נקראים כדי למצוא את הרשומה האחרונה / את כותרת הסטטיסטיקות
+TAIL_BYTES = 64 * 1024
+
+
+def _read_tail(f, size, tail_bytes):
+    start = max(0, size - tail_bytes)
+    f.seek(start)
+    return start, f.read(size - start)
+
+
+class SessionStore:
+    def __init__(self, path):
+        """קובץ JSONL - שורה לכל סשן, נכתבת פעם אחת ולא משתנה"""
+        self.path = path
+
+    def append(self, record):
+        """הוספת סשן - כתיבה אחת לסוף הקובץ ו-fsync לפני שממשיכים לעדכן את היומן"""
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        os.makedirs(os.path.dirname(os.fspath(self.path)) or '.', exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            if f.tell() > 0 and not self._ends_with_newline():
+                # שורה חלקית מכתיבה שנקטעה - הרשומה החדשה מתחילה בשורה משלה
+                f.write('\n')
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _ends_with_newline(self):
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def mark_rendered(self, session):
+        """סימון שהסשן נכתב ליומן במלואו - מכאן היומן שייך למשתמש ולא משוחזר מהמאגר"""
+        self.append({'session': session, 'rendered': True})
+
+    def records(self):
+        """כל הסשנים לפי הסדר (generator) - שורה פגומה וסימוני rendered מדולגים"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if not record.get('rendered'):
+                        yield record
+        except OSError:
+            return
+
+    def last(self):
+        """הרשומה האחרונה (סשן או סימון rendered) - נקראת מסוף הקובץ בלבד"""
+        try:
+            with open(self.path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                _, data = _read_tail(f, size, TAIL_BYTES)
+        except OSError:
+            return None
+
+        for line in reversed(data.splitlines()):
+            try:
+                return json.loads(line.decode('utf-8'))
+            except ValueError:
+                continue
+        return None
+
+    def unrendered(self):
+        """הסשן האחרון אם הכתיבה שלו ליומן לא אושרה (mark_rendered), אחרת None"""
+        record = self.last()
+        if record is None or record.get('rendered'):
+            return None
+        return record
+
+
+def insert_before_marker(path, text, marker, tail_bytes=TAIL_BYTES, replace_from=None):
+    """הכנסת text לפני ההופעה האחרונה של marker בזנב הקובץ (או בסופו אם אין)
+
+    replace_from - אם הוא מופיע בזנב, כל מה שמההופעה האחרונה שלו ועד ה-marker (או עד
+    סוף הקובץ) מוחלף ב-text - למשל עותק קטוע של אותו סשן.
+    רק מה שאחרי נקודת ההכנסה נכתב מחדש: seek, כתיבת הטקסט והזנב, truncate ו-fsync.
+    מחזיר את מספר הבייטים שנכתבו.
+    """
+    payload = text.encode('utf-8')
+    marker = marker.encode('utf-8')
+    with open(path, 'r+b') as f:
+        size = os.fstat(f.fileno()).st_size
+        start, data = _read_tail(f, size, tail_bytes)
+        position = data.rfind(marker)
+        cut = data.rfind(replace_from.encode('utf-8')) if replace_from else -1
+        if cut >= 0:
+            offset, rest = start + cut, data[position:] if position > cut else b''
+        elif position >= 0:
+            offset, rest = start + position, data[position:]
+        else:
+            offset, rest = size, b''
+
+        f.seek(offset)
+        f.write(payload + rest)
+        f.truncate()
+        f.flush()
+        os.fsync(f.fileno())
+    return len(payload) + len(rest)
+
+
+def tail_contains(path, text, tail_bytes=TAIL_BYTES):
+    """האם text מופיע בזנב הקובץ"""
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            _, data = _read_tail(f, size, tail_bytes)
+    except OSError:
+        return False
+    return text.encode('utf-8') in data
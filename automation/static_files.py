@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Static Files for Trading Project 002
+הגשת קבצי ה-HTML של הפרויקט עם ETag, תגובות 304 ודחיסה שמורה בזיכרון
+"""
+
+import gzip
+import hashlib
+import re
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# סוגי קבצים שמותר להגיש
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+    '.json': 'application/json; charset=utf-8',
+    '.svg': 'image/svg+xml',
+    '.png': 'image/png',
+    '.ico': 'image/x-icon'
+}
+
+COMPRESSIBLE_SUFFIXES = {'.html', '.css', '.js', '.json', '.svg'}
+
+# תיקיות שלא מוגשות לעולם (הגדרות, טוקנים, קוד)
+BLOCKED_DIRS = {'automation'}
+
+# קבצים קטנים מזה לא נדחסים - התקורה גדולה מהחיסכון
+MIN_COMPRESS_BYTES = 1024
+
+# שם קובץ עם hash תוכן (למשל docs.3f2a9c1b.css) - ניתן לשמור במטמון לתמיד
+HASHED_NAME_PATTERN = re.compile(r'\.[0-9a-f]{8,}\.[a-z0-9]+$')
+
+
+class StaticEntry:
+    def __init__(self, path, body, stat):
+        """קובץ סטטי טעון עם ETag וגרסאות דחוסות"""
+        self.path = path
+        self.body = body
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        self.mtime = stat.st_mtime
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.content_type = CONTENT_TYPES[path.suffix.lower()]
+        self.compressible = (path.suffix.lower() in COMPRESSIBLE_SUFFIXES
+                             and len(body) >= MIN_COMPRESS_BYTES)
+        self.cache_control = ('public, max-age=31536000, immutable'
+                              if HASHED_NAME_PATTERN.search(path.name) else 'no-cache')
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    @property
+    def last_modified(self):
+        return formatdate(self.mtime, usegmt=True)
+
+    def etag(self, encoding=None):
+        """ETag חזק - שונה לכל ייצוג (encoding) של אותו תוכן"""
+        suffix = f'-{encoding}' if encoding else ''
+        return f'"{self.digest}{suffix}"'
+
+    def all_etags(self):
+        return {self.etag(), self.etag('gzip'), self.etag('br')}
+
+    def encoded_body(self, encoding):
+        """גוף דחוס - נדחס פעם אחת ונשמר עד שהקובץ משתנה"""
+        if encoding is None:
+            return self.body
+
+        with self._lock:
+            if encoding not in self._encoded:
+                if encoding == 'br':
+                    self._encoded[encoding] = brotli.compress(self.body, quality=11)
+                else:
+                    self._encoded[encoding] = gzip.compress(self.body, compresslevel=9, mtime=0)
+            return self._encoded[encoding]
+
+
+class StaticFileCache:
+    def __init__(self, root):
+        """מטמון קבצים סטטיים תחת תיקיית הפרויקט"""
+        self.root = Path(root).resolve()
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, url_path):
+        """המרת נתיב URL לקובץ בפרויקט - None אם אסור או לא קיים"""
+        relative = url_path.lstrip('/') or 'project_dashboard.html'
+        parts = Path(relative).parts
+
+        if any(part.startswith('.') or part == '..' for part in parts):
+            return None
+        if parts and parts[0] in BLOCKED_DIRS:
+            return None
+
+        path = (self.root / relative).resolve()
+        if self.root not in path.parents:
+            return None
+        if path.suffix.lower() not in CONTENT_TYPES or not path.is_file():
+            return None
+
+        return path
+
+    def get(self, path):
+        """קבלת קובץ מהמטמון - נטען מחדש רק אם הקובץ השתנה בדיסק"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.signature == signature:
+                return entry
+
+        try:
+            body = path.read_bytes()
+        except OSError:
+            return None
+
+        entry = StaticEntry(path, body, stat)
+        with self._lock:
+            self._entries[path] = entry
+        return entry
+
+
+def negotiate_encoding(accept_encoding, entry):
+    """בחירת דחיסה לפי Accept-Encoding (עם q-values) - br עדיף על gzip"""
+    if not entry.compressible or not accept_encoding:
+        return None
+
+    accepted = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    def allowed(name):
+        return accepted.get(name, accepted.get('*', 0.0)) > 0
+
+    if brotli is not None and allowed('br'):
+        return 'br'
+    if allowed('gzip'):
+        return 'gzip'
+    return None
+
+
+def is_not_modified(headers, entry):
+    """בדיקת If-None-Match / If-Modified-Since"""
+    if_none_match = headers.get('If-None-Match')
+    if if_none_match:
+        if if_none_match.strip() == '*':
+            return True
+        etags = entry.all_etags()
+        return any(tag.strip() in etags for tag in if_none_match.split(','))
+
+    if_modified_since = headers.get('If-Modified-Since')
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(entry.mtime) <= since
+
+    return False
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio server backend
+זרמי /events פתוחים לא תופסים את ה-executor - בקשות קצרות ממשיכות לקבל תשובה
+"""
+
+import http.client
+import json
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+try:
+    from .async_server import AsyncAutomationServer
+    from .automation_server import AutomationServer
+except ImportError:
+    from async_server import AsyncAutomationServer
+    from automation_server import AutomationServer
+
+# יותר לקוחות SSE מאשר workers ב-executor
+SSE_CLIENTS = 40
+WORKERS = 4
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _read_head(sock):
+    data = b''
+    while b'\r\n\r\n' not in data:
+        chunk = sock.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    head, _, rest = data.partition(b'\r\n\r\n')
+    return head.decode('latin-1'), rest
+
+
+class AsyncServerEventsTest(unittest.TestCase):
+    def setUp(self):
+        self.project_root = tempfile.TemporaryDirectory()
+        self.port = _free_port()
+        self.automation = AutomationServer(project_root=self.project_root.name, port=self.port,
+                                           backend='asyncio')
+        self.server = AsyncAutomationServer(self.automation, '127.0.0.1', self.port,
+                                            max_workers=WORKERS)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.clients = []
+
+        deadline = time.monotonic() + 5
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.02)
+
+    def tearDown(self):
+        for client in self.clients:
+            client.close()
+        self.automation.stopping.set()
+        self.server.shutdown()
+        self.thread.join(5)
+        self.server.server_close()
+        self.automation.job_queue.shutdown()
+        self.project_root.cleanup()
+
+    def _open_events(self):
+        client = socket.create_connection(('127.0.0.1', self.port), timeout=5)
+        self.clients.append(client)
+        client.sendall(b'GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        head, rest = _read_head(client)
+        self.assertTrue(head.startswith('HTTP/1.1 200'), head)
+        self.assertIn('text/event-stream', head)
+        return client, rest
+
+    def test_jobs_responds_while_many_event_streams_are_open(self):
+        streams = [self._open_events() for _ in range(SSE_CLIENTS)]
+
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+        try:
+            started = time.monotonic()
+            connection.request('GET', '/jobs')
+            response = connection.getresponse()
+            body = json.loads(response.read())
+            elapsed = time.monotonic() - started
+        finally:
+            connection.close()
+
+        self.assertEqual(response.status, 200)
+        self.assertTrue(body['success'])
+        self.assertLess(elapsed, 2)
+
+        # וכל הזרמים עדיין מקבלים אירועים
+        self.automation.progress_bus.publish('test_event', action='test')
+        for client, rest in streams:
+            data = rest
+            while b'event: test_event' not in data:
+                chunk = client.recv(4096)
+                self.assertTrue(chunk)
+                data += chunk
+
+
+if __name__ == '__main__':
+    unittest.main()
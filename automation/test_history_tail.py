@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental history reader
+המשך קריאה אחרי הוספה, קיצוץ והחלפת קובץ, ושורה חלקית שנשארת לקריאה הבאה
+"""
+
+import os
+import tempfile
+import unittest
+
+try:
+    from .history_tail import end_state, read_new_lines
+except ImportError:
+    from history_tail import end_state, read_new_lines
+
+
+class HistoryTailTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'ConsoleHost_history.txt')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write(self, text, mode='w'):
+        with open(self.path, mode, encoding='utf-8', newline='') as f:
+            f.write(text)
+
+    def _replace(self, text):
+        """קובץ חדש באותו נתיב (inode אחר) - כמו סבב לוגים"""
+        replacement = self.path + '.new'
+        with open(replacement, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        os.replace(replacement, self.path)
+
+    def test_appended_lines_only(self):
+        self._write('git status\ngit add .\n')
+        lines, state, reason = read_new_lines(self.path)
+        self.assertEqual(reason, 'initial')
+        self.assertEqual(lines, ['git status', 'git add .'])
+
+        self._write('git commit\n', mode='a')
+        lines, state, reason = read_new_lines(self.path, state)
+        self.assertEqual(reason, 'appended')
+        self.assertEqual(lines, ['git commit'])
+
+        lines, _, reason = read_new_lines(self.path, state)
+        self.assertEqual((lines, reason), ([], 'appended'))
+
+    def test_partial_line_waits_for_newline(self):
+        self._write('python run.py\npython upd')
+        lines, state, _ = read_new_lines(self.path)
+        self.assertEqual(lines, ['python run.py'])
+        self.assertEqual(state['offset'], len('python run.py\n'))
+
+        self._write('ate.py\n', mode='a')
+        lines, state, reason = read_new_lines(self.path, state)
+        self.assertEqual(reason, 'appended')
+        self.assertEqual(lines, ['python update.py'])
+
+    def test_crlf_partial_line(self):
+        self._write('dir\r\ncd automation')
+        lines, state, _ = read_new_lines(self.path)
+        self.assertEqual(lines, ['dir'])
+
+        self._write('\r\n', mode='a')
+        lines, _, _ = read_new_lines(self.path, state)
+        self.assertEqual(lines, ['cd automation'])
+
+    def test_truncated_file_resumes_after_last_read_line(self):
+        self._write('one\ntwo\nthree\n')
+        _, state, _ = read_new_lines(self.path)
+
+        # נכתב מחדש באותו קובץ, קצר מה-offset - השורות הישנות הושמטו מתחילתו
+        self._write('three\nfour\n')
+        lines, state, reason = read_new_lines(self.path, state)
+        self.assertEqual(reason, 'truncated')
+        self.assertEqual(lines, ['four'])
+        self.assertEqual(state['offset'], len('three\nfour\n'))
+
+    def test_rotated_file_resumes_after_last_read_line(self):
+        self._write('one\ntwo\nthree\n')
+        _, state, _ = read_new_lines(self.path)
+
+        self._replace('two\nthree\nfour\nfive\n')
+        lines, _, reason = read_new_lines(self.path, state)
+        self.assertEqual(reason, 'rotated')
+        self.assertEqual(lines, ['four', 'five'])
+
+    def test_rotated_file_without_last_line_is_read_from_start(self):
+        self._write('one\ntwo\n')
+        _, state, _ = read_new_lines(self.path)
+
+        self._replace('alpha\nbeta\n')
+        lines, _, reason = read_new_lines(self.path, state)
+        self.assertEqual(reason, 'rotated')
+        self.assertEqual(lines, ['alpha', 'beta'])
+
+    def test_rotation_detected_by_head_when_inode_is_reused(self):
+        first = ''.join(f'command {number}\n' for number in range(40))
+        self._write(first)
+        _, state, _ = read_new_lines(self.path)
+
+        # אותו inode, תוכן אחר בתחילת הקובץ וארוך יותר מה-offset
+        second = ''.join(f'other {number}\n' for number in range(60))
+        self._write(second)
+        lines, _, reason = read_new_lines(self.path, state)
+        self.assertEqual(reason, 'rotated')
+        self.assertEqual(lines, second.splitlines())
+
+    def test_missing_file_keeps_state(self):
+        self._write('one\n')
+        _, state, _ = read_new_lines(self.path)
+        os.unlink(self.path)
+
+        lines, new_state, reason = read_new_lines(self.path, state)
+        self.assertEqual((lines, reason), ([], 'missing'))
+        self.assertEqual(new_state, state)
+
+    def test_initial_read_skips_cut_first_line(self):
+        self._write(''.join(f'line {number}\n' for number in range(100)))
+        lines, _, reason = read_new_lines(self.path, initial_tail_bytes=30)
+        self.assertEqual(reason, 'initial')
+        self.assertEqual(lines, ['line 97', 'line 98', 'line 99'])
+
+    def test_end_state_skips_existing_content(self):
+        self._write('old one\nold two\n')
+        state = end_state(self.path)
+
+        self._write('new\n', mode='a')
+        lines, _, reason = read_new_lines(self.path, state)
+        self.assertEqual(reason, 'appended')
+        self.assertEqual(lines, ['new'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for the job queue
+single-flight: בקשה כפולה מצטרפת למשימה הקיימת; follow_up מתזמן ריצה אחת נוספת אחרי ריצה פעילה
+"""
+
+import threading
+import unittest
+
+try:
+    from .job_queue import JobQueue, STATUS_DONE, STATUS_QUEUED, STATUS_RUNNING
+except ImportError:
+    from job_queue import JobQueue, STATUS_DONE, STATUS_QUEUED, STATUS_RUNNING
+
+TIMEOUT = 5
+
+
+class _BlockingAction:
+    def __init__(self):
+        """פעולה שנתקעת עד release() - סופרת כמה פעמים רצה"""
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.runs = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.runs += 1
+        self.started.set()
+        self.release.wait(TIMEOUT)
+        return {'success': True, 'runs': self.runs}
+
+
+class JobQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.queue = JobQueue(max_workers=1, max_pending=4)
+        self.action = _BlockingAction()
+
+    def tearDown(self):
+        self.action.release.set()
+        self.queue.shutdown(wait=True)
+
+    def _start_running(self, key='docs'):
+        job, attached = self.queue.submit('update_docs', self.action, key=key)
+        self.assertFalse(attached)
+        self.assertTrue(self.action.started.wait(TIMEOUT))
+        self.assertEqual(job.status, STATUS_RUNNING)
+        return job
+
+    def test_duplicate_request_attaches_to_running_job(self):
+        job = self._start_running()
+
+        again, attached = self.queue.submit('update_docs', self.action, key='docs')
+        self.assertIs(again, job)
+        self.assertTrue(attached)
+        self.assertEqual(job.attached_requests, 1)
+
+        self.action.release.set()
+        self.assertTrue(job.wait(TIMEOUT))
+        self.assertEqual(job.status, STATUS_DONE)
+        self.assertEqual(self.action.runs, 1)
+
+    def test_different_keys_do_not_attach(self):
+        job = self._start_running(key='docs:a.md')
+
+        other, attached = self.queue.submit('update_docs', self.action, key='docs:b.md')
+        self.assertIsNot(other, job)
+        self.assertFalse(attached)
+
+        self.action.release.set()
+        self.assertTrue(other.wait(TIMEOUT))
+        self.assertEqual(self.action.runs, 2)
+
+    def test_follow_up_runs_once_after_running_job(self):
+        job = self._start_running()
+
+        follow_up, attached = self.queue.submit('update_docs', self.action, key='docs', follow_up=True)
+        self.assertIsNot(follow_up, job)
+        self.assertFalse(attached)
+        self.assertEqual(follow_up.status, STATUS_QUEUED)
+
+        # עוד שינויים בזמן שהריצה רצה - מצטרפים לאותה ריצת המשך
+        again, attached = self.queue.submit('update_docs', self.action, key='docs', follow_up=True)
+        self.assertIs(again, follow_up)
+        self.assertTrue(attached)
+
+        # בקשה רגילה עדיין מצטרפת לריצה הפעילה
+        plain, attached = self.queue.submit('update_docs', self.action, key='docs')
+        self.assertIs(plain, job)
+        self.assertTrue(attached)
+
+        self.action.release.set()
+        self.assertTrue(follow_up.wait(TIMEOUT))
+        self.assertTrue(job.finished)
+        self.assertEqual(follow_up.status, STATUS_DONE)
+        self.assertEqual(self.action.runs, 2)
+        self.assertGreaterEqual(follow_up._started_clock, job._finished_clock)
+
+    def test_follow_up_attaches_to_job_that_has_not_started(self):
+        self._start_running(key='other')
+        queued, _ = self.queue.submit('update_docs', self.action, key='docs')
+        self.assertEqual(queued.status, STATUS_QUEUED)
+
+        # הריצה עוד לא התחילה - היא תקרא את הקבצים העדכניים בעצמה
+        again, attached = self.queue.submit('update_docs', self.action, key='docs', follow_up=True)
+        self.assertIs(again, queued)
+        self.assertTrue(attached)
+
+        self.action.release.set()
+        self.assertTrue(queued.wait(TIMEOUT))
+        self.assertEqual(self.action.runs, 2)
+
+    def test_new_run_after_job_finished(self):
+        job = self._start_running()
+        self.action.release.set()
+        self.assertTrue(job.wait(TIMEOUT))
+
+        again, attached = self.queue.submit('update_docs', self.action, key='docs')
+        self.assertIsNot(again, job)
+        self.assertFalse(attached)
+        self.assertTrue(again.wait(TIMEOUT))
+        self.assertEqual(self.action.runs, 2)
+
+    def test_full_queue_rejects_new_work(self):
+        self._start_running(key='key-0')
+        for index in range(1, self.queue.max_pending):
+            job, _ = self.queue.submit('update_docs', self.action, key=f'key-{index}')
+            self.assertIsNotNone(job)
+
+        self.assertEqual(self.queue.submit('update_docs', self.action, key='overflow'), (None, False))
+        # גם ריצת המשך נספרת במגבלת התור
+        self.assertEqual(self.queue.submit('update_docs', self.action, key='key-0', follow_up=True),
+                         (None, False))
+
+
+if __name__ == '__main__':
+    unittest.main()
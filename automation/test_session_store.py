@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the session store and the conversation log repair
+סשן שלא נכתב עד הסוף משוחזר מהמאגר; יומן שהמשתמש ערך אחרי כתיבה מלאה לא נוגעים בו
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    from .session_store import SessionStore, insert_before_marker
+    from .update_conversations import ConversationUpdater, STATISTICS_MARKER
+except ImportError:
+    from session_store import SessionStore, insert_before_marker
+    from update_conversations import ConversationUpdater, STATISTICS_MARKER
+
+
+def _session(number, body='בדיקת מערכת'):
+    return f"\n\n## 🎯 **Session #{number:03d}** - בדיקה\n\n### 📋 **סיכום:**\n- {body}\n"
+
+
+class SessionStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SessionStore(os.path.join(self.directory.name, 'automation', 'sessions.jsonl'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_records_skip_rendered_markers_and_torn_lines(self):
+        self.store.append({'session': 1, 'markdown': 'a'})
+        self.store.mark_rendered(1)
+        # כתיבה שנקטעה באמצע שורה
+        with open(self.store.path, 'a', encoding='utf-8') as f:
+            f.write('{"session": 2, "mark')
+        self.store.append({'session': 3, 'markdown': 'c'})
+
+        self.assertEqual([record['session'] for record in self.store.records()], [1, 3])
+        self.assertEqual(self.store.unrendered()['session'], 3)
+
+        self.store.mark_rendered(3)
+        self.assertIsNone(self.store.unrendered())
+
+    def test_insert_before_marker_keeps_the_tail(self):
+        path = os.path.join(self.directory.name, 'log.md')
+        Path(path).write_text('# יומן\n\n## 📈 **סטטיסטיקות**\nסה"כ: 1\n', encoding='utf-8')
+
+        insert_before_marker(path, 'סשן חדש\n\n', '## 📈')
+        self.assertEqual(Path(path).read_text(encoding='utf-8'),
+                         '# יומן\n\nסשן חדש\n\n## 📈 **סטטיסטיקות**\nסה"כ: 1\n')
+
+    def test_insert_without_marker_appends(self):
+        path = os.path.join(self.directory.name, 'log.md')
+        Path(path).write_text('# יומן\n', encoding='utf-8')
+
+        insert_before_marker(path, 'סשן\n', '## 📈')
+        self.assertEqual(Path(path).read_text(encoding='utf-8'), '# יומן\nסשן\n')
+
+    def test_replace_from_overwrites_only_the_torn_copy(self):
+        path = os.path.join(self.directory.name, 'log.md')
+        session = _session(2)
+        Path(path).write_text('# יומן' + _session(1) + session[:len(session) // 2], encoding='utf-8')
+
+        insert_before_marker(path, session, '## 📈', replace_from='\n\n## 🎯 **Session #002**')
+        self.assertEqual(Path(path).read_text(encoding='utf-8'), '# יומן' + _session(1) + session)
+
+
+class ConversationLogRepairTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        root = Path(self.directory.name)
+        (root / 'automation').mkdir()
+        self.updater = ConversationUpdater(root)
+        self.log = self.updater.conversation_log
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(self.updater.update_conversation_log(_session(2), 2))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _sync(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.updater._sync_log_with_store()
+
+    def test_rendered_session_is_in_the_log_before_statistics(self):
+        text = self.log.read_text(encoding='utf-8')
+        self.assertIn(_session(2), text)
+        if STATISTICS_MARKER in text:
+            self.assertLess(text.index(_session(2)), text.index(STATISTICS_MARKER))
+        self.assertFalse(self._sync())
+
+    def test_user_edits_after_render_are_kept(self):
+        edited = self.log.read_text(encoding='utf-8').replace('בדיקת מערכת', 'בדיקת מערכת ✓')
+        edited += '\nהערה ידנית בסוף היומן\n'
+        self.log.write_text(edited, encoding='utf-8')
+
+        self.assertFalse(self._sync())
+        self.assertEqual(self.log.read_text(encoding='utf-8'), edited)
+
+    def test_torn_render_is_repaired_from_store(self):
+        before = self.log.read_text(encoding='utf-8')
+        session = _session(3)
+        # קריסה אחרי השמירה במאגר, באמצע הכתיבה ליומן
+        self.updater.session_store.append({'session': 3, 'markdown': session})
+        self.log.write_text(before + session[:len(session) // 2], encoding='utf-8')
+
+        self.assertTrue(self._sync())
+        self.assertEqual(self.log.read_text(encoding='utf-8'), before + session)
+        # מסומן כ-rendered - סנכרון נוסף לא נוגע ביומן
+        self.assertFalse(self._sync())
+
+    def test_missing_session_is_added_from_store(self):
+        before = self.log.read_text(encoding='utf-8')
+        session = _session(3)
+        # קריסה אחרי השמירה במאגר ולפני שהיומן נפתח
+        self.updater.session_store.append({'session': 3, 'markdown': session})
+
+        self.assertTrue(self._sync())
+        position = before.rfind(STATISTICS_MARKER)
+        if position < 0:
+            position = len(before)
+        self.assertEqual(self.log.read_text(encoding='utf-8'),
+                         before[:position] + session + before[position:])
+
+    def test_unmarked_session_already_in_log_is_only_marked(self):
+        before = self.log.read_text(encoding='utf-8')
+        session = _session(3)
+        # קריסה אחרי הכתיבה ליומן ולפני mark_rendered
+        self.updater.session_store.append({'session': 3, 'markdown': session})
+        self.log.write_text(before + session, encoding='utf-8')
+
+        self.assertFalse(self._sync())
+        self.assertEqual(self.log.read_text(encoding='utf-8'), before + session)
+        self.assertIsNone(self.updater.session_store.unrendered())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,10 +10,31 @@ import re
 from datetime import datetime, timedelta
 from pathlib import Path
 import subprocess
+import threading
+import time
+
+try:
+    from .file_cache import FileBackedCache
+    from .atomic_files import atomic_write_text
+    from .activity_sources import default_sources
+    from .activity_classifier import DEFAULT_CLASSIFIER
+    from .session_store import SessionStore, TAIL_BYTES, insert_before_marker, tail_contains
+except ImportError:
+    from file_cache import FileBackedCache
+    from atomic_files import atomic_write_text
+    from activity_sources import default_sources
+    from activity_classifier import DEFAULT_CLASSIFIER
+    from session_store import SessionStore, TAIL_BYTES, insert_before_marker, tail_contains
+
+# כותרת הסטטיסטיקות ביומן - סשנים חדשים נכנסים לפניה
+STATISTICS_MARKER = "## 📈 **סטטיסטיקות"
 
 class ConversationUpdater:
-    def __init__(self, project_root=None):
-        """אתחול מעדכן השיחות"""
+    def __init__(self, project_root=None, progress=None):
+        """אתחול מעדכן השיחות
+
+        progress - callback אופציונלי progress(event, **data) לדיווח התקדמות
+        """
         if project_root is None:
             self.project_root = Path(__file__).parent.parent
         else:
@@ -22,8 +43,31 @@ class ConversationUpdater:
         self.conversation_log = self.project_root / "conversation_log.md"
         self.last_update_file = self.project_root / "automation" / "last_conversation_update.json"
         
-        # טען זמן העדכון האחרון
-        self.last_update_time = self._load_last_update_time()
+        # מאגר הסשנים (שורה לכל סשן) - היומן נבנה ממנו בהדרגה
+        self.session_store = SessionStore(self.project_root / "automation" / "sessions.jsonl")
+        self.progress = progress
+        
+        # מצב שנגזר מקבצים נשמר בין ריצות ומתרענן רק כשהקבצים משתנים
+        self._state_cache = FileBackedCache()
+        self._lock = threading.Lock()
+        
+        # טבלת כללי הסיווג - מקומפלת פעם אחת לכל התהליך
+        self.classifier = DEFAULT_CLASSIFIER
+        
+        # מיקום הקריאה בכל קובץ היסטוריה - נשמר רק אחרי ריצה שהצליחה
+        self._pending_offsets = {}
+        
+    @property
+    def last_update_time(self):
+        """זמן העדכון האחרון - נטען מחדש רק כשקובץ המעקב או היומן השתנו"""
+        return self._state_cache.get('last_update_time',
+                                     [self.last_update_file, self.conversation_log],
+                                     self._load_last_update_time)
+        
+    def _report(self, event, **data):
+        """דיווח אירוע התקדמות (אם הוגדר callback)"""
+        if self.progress:
+            self.progress(event, **data)
         
     def _load_last_update_time(self):
         """טעינת זמן העדכון האחרון"""
@@ -40,17 +84,41 @@ class ConversationUpdater:
             return datetime.now() - timedelta(days=1)
     
     def _save_last_update_time(self):
-        """שמירת זמן העדכון הנוכחי"""
+        """שמירת זמן העדכון הנוכחי (ומיקומי הקריאה בקבצי ההיסטוריה)"""
+        self._save_state(last_update=datetime.now().isoformat(),
+                         session_updated=self._get_current_session_number())
+    
+    def _save_history_offsets(self):
+        """שמירת מיקומי הקריאה בלבד - כשלא נוצר סשן, זמן העדכון נשאר כמו שהוא"""
+        if self._pending_offsets:
+            self._save_state()
+    
+    def _save_state(self, **updates):
+        """עדכון קובץ המעקב (כתיבה אטומית) - שדות אחרים שבו נשמרים"""
         try:
+            data = self._load_state()
+            if 'last_update' not in data:
+                data['last_update'] = self.last_update_time.isoformat()
+            data.update(updates)
+            offsets = data.get('history_offsets', {})
+            offsets.update(self._pending_offsets)
+            data['history_offsets'] = offsets
+            
             os.makedirs(self.last_update_file.parent, exist_ok=True)
-            with open(self.last_update_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'last_update': datetime.now().isoformat(),
-                    'session_updated': self._get_current_session_number()
-                }, f, ensure_ascii=False, indent=2)
+            atomic_write_text(self.last_update_file, json.dumps(data, ensure_ascii=False, indent=2))
+            self._pending_offsets = {}
         except Exception as e:
             print(f"[WARNING] לא ניתן לשמור זמן עדכון: {e}")
     
+    def _load_state(self):
+        """תוכן קובץ המעקב כמילון (ריק אם אין)"""
+        try:
+            with open(self.last_update_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
     def _get_last_session_time(self):
         """חילוץ זמן מהסשן האחרון בלוג"""
         try:
@@ -72,7 +140,12 @@ class ConversationUpdater:
         return datetime.now() - timedelta(days=1)
     
     def _get_current_session_number(self):
-        """מציאת מספר הסשן הנוכחי"""
+        """מציאת מספר הסשן הנוכחי (שמור במטמון עד שהיומן משתנה)"""
+        return self._state_cache.get('session_number', [self.conversation_log],
+                                     self._parse_current_session_number)
+    
+    def _parse_current_session_number(self):
+        """חישוב מספר הסשן הנוכחי מתוך היומן"""
         try:
             if not self.conversation_log.exists():
                 return 1
@@ -92,78 +165,60 @@ class ConversationUpdater:
     def scan_terminal_history(self):
         """סריקת היסטוריית הטרמינל עבור פעילות Claude Code"""
         activities = []
+        since = self.last_update_time
+        states = self._load_state().get('history_offsets', {})
+        
+        # כל מקור מסנן לפי since בעצמו - רשומות ישנות לא נוצרות בכלל
+        for source in self.activity_sources(states):
+            found = 0
+            try:
+                for record in source.activities(since):
+                    activity = self._command_activity(record) if record['type'] == 'command' else record
+                    if activity:
+                        activities.append(activity)
+                        found += 1
+            except Exception as e:
+                # ה-state של מקור שנכשל לא נשמר - הוא ייקרא שוב בריצה הבאה
+                print(f"[WARNING] שגיאה בקריאת {source.name} ({source.path}): {e}")
+                continue
+            
+            if source.state is not None:
+                self._pending_offsets[source.key] = source.state
+            self._report('history_read', source=source.name, activities=found)
         
         try:
-            # נסה לקרוא מ-PowerShell history
-            powershell_history = self._get_powershell_history()
-            if powershell_history:
-                activities.extend(self._parse_powershell_activities(powershell_history))
-            
             # נסה לקרוא מ-CMD history אם קיים
             cmd_activities = self._get_cmd_activities()
             if cmd_activities:
                 activities.extend(cmd_activities)
-            
-            # חפש קבצי לוג נוספים
-            log_activities = self._scan_log_files()
-            if log_activities:
-                activities.extend(log_activities)
                 
         except Exception as e:
             print(f"[WARNING] שגיאה בסריקת היסטוריה: {e}")
         
         return self._filter_relevant_activities(activities)
     
-    def _get_powershell_history(self):
-        """קריאת היסטוריית PowerShell"""
-        try:
-            # נתיב היסטוריית PowerShell
-            history_path = Path.home() / "AppData/Roaming/Microsoft/Windows/PowerShell/PSReadLine/ConsoleHost_history.txt"
-            
-            if not history_path.exists():
-                return []
-            
-            # קרא רק שורות מהזמן האחרון
-            with open(history_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            # סנן פעילות רלוונטית מהזמן האחרון
-            recent_lines = []
-            file_mod_time = datetime.fromtimestamp(history_path.stat().st_mtime)
-            
-            if file_mod_time > self.last_update_time:
-                # קח את השורות האחרונות (משערים לפי מיקום)
-                recent_lines = lines[-200:]  # קח 200 השורות האחרונות
-            
-            return recent_lines
-            
-        except Exception as e:
-            print(f"[WARNING] לא ניתן לקרוא היסטוריית PowerShell: {e}")
-            return []
+    def activity_sources(self, states=None):
+        """מקורות הפעילות בסריקה - PowerShell, bash, zsh, fish וקבצי הלוג בפרויקט"""
+        return default_sources(self.project_root, states)
     
-    def _parse_powershell_activities(self, history_lines):
-        """פרסר פעילויות מהיסטוריית PowerShell"""
-        activities = []
-        
-        claude_keywords = [
-            'claude', 'anthropic', 'claude-code', 'npx @anthropic-ai/claude-code',
-            'trading project', 'project 002'
-        ]
-        
-        for line in history_lines:
-            line = line.strip().lower()
-            
-            # בדוק אם יש קשר ל-Claude או לפרויקט
-            if any(keyword in line for keyword in claude_keywords):
-                activity = {
-                    'type': 'claude_activity',
-                    'command': line,
-                    'timestamp': datetime.now(),  # נעדכן מאוחר יותר אם נמצא
-                    'description': self._analyze_command(line)
-                }
-                activities.append(activity)
-        
-        return activities
+    def _command_activity(self, record):
+        """פעילות מפקודה בהיסטוריה - רק אם יש לה קשר ל-Claude או לפרויקט"""
+        line = record['command'].strip().lower()
+        
+        # סיווג, קשר ל-Claude ורלוונטיות - בהתאמה אחת של הביטוי המקומפל
+        classification = self.classifier.classify_command(line)
+        if classification is None:
+            return None
+        
+        return {
+            'type': 'claude_activity',
+            'source': record['source'],
+            'command': line,
+            'timestamp': record['timestamp'],
+            'category': classification.category,
+            'description': classification.description,
+            'relevant': classification.relevant
+        }
     
     def _get_cmd_activities(self):
         """סריקת פעילויות CMD (אם קיימות)"""
@@ -172,11 +227,13 @@ class ConversationUpdater:
         activities = []
         
         try:
+            since = self.last_update_time
+            
             # חפש קבצים שנוצרו/שונו לאחרונה בפרויקט
             for file_path in self.project_root.rglob("*"):
                 if file_path.is_file():
                     mod_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                    if mod_time > self.last_update_time:
+                    if mod_time > since:
                         activity = {
                             'type': 'file_change',
                             'file': file_path.name,
@@ -189,76 +246,21 @@ class ConversationUpdater:
         
         return activities
     
-    def _scan_log_files(self):
-        """סריקת קבצי לוג בפרויקט"""
-        activities = []
-        
-        # חפש קבצי לוג אפשריים
-        log_patterns = ['*.log', '*.txt', 'debug*', 'error*']
-        
-        for pattern in log_patterns:
-            for log_file in self.project_root.rglob(pattern):
-                if log_file.is_file():
-                    try:
-                        mod_time = datetime.fromtimestamp(log_file.stat().st_mtime)
-                        if mod_time > self.last_update_time:
-                            # נסה לקרוא תוכן רלוונטי
-                            with open(log_file, 'r', encoding='utf-8') as f:
-                                content = f.read()[-1000:]  # קח 1000 תווים אחרונים
-                            
-                            if 'claude' in content.lower() or 'error' in content.lower():
-                                activity = {
-                                    'type': 'log_entry',
-                                    'file': log_file.name,
-                                    'timestamp': mod_time,
-                                    'description': f"פעילות בלוג: {log_file.name}"
-                                }
-                                activities.append(activity)
-                    except:
-                        continue
-        
-        return activities
-    
     def _analyze_command(self, command):
         """ניתוח פקודה והחזרת תיאור ברור"""
-        command = command.lower()
-        
-        if 'claude-code' in command or 'npx @anthropic-ai' in command:
-            return "הפעלת Claude Code"
-        elif 'git' in command:
-            if 'commit' in command:
-                return "ביצוע Git commit"
-            elif 'push' in command:
-                return "ביצוע Git push"
-            elif 'pull' in command:
-                return "ביצוע Git pull"
-            else:
-                return "פעילות Git"
-        elif 'python' in command or '.py' in command:
-            return "הרצת סקריפט Python"
-        elif 'mkdir' in command or 'md ' in command:
-            return "יצירת תיקייה"
-        elif 'touch' in command or 'new-item' in command:
-            return "יצירת קובץ חדש"
-        elif 'edit' in command or 'code' in command:
-            return "עריכת קבצים"
-        else:
-            return f"פקודת טרמינל: {command[:50]}"
+        return self.classifier.classify(command.lower()).description
     
     def _filter_relevant_activities(self, activities):
         """סינון פעילויות רלוונטיות לפרויקט"""
         relevant = []
         
-        project_keywords = [
-            'trading', 'project', '002', 'claude', 'mstr', 
-            'html', 'dashboard', 'automation'
-        ]
-        
         for activity in activities:
-            # בדוק רלוונטיות לפי מילות מפתח
-            text_to_check = f"{activity.get('command', '')} {activity.get('description', '')}".lower()
+            # פקודות כבר סווגו; לשאר בודקים את הפקודה והתיאור
+            if activity.get('relevant', None) is None:
+                text_to_check = f"{activity.get('command', '')} {activity.get('description', '')}"
+                activity['relevant'] = self.classifier.is_relevant(text_to_check)
             
-            if any(keyword in text_to_check for keyword in project_keywords):
+            if activity['relevant']:
                 relevant.append(activity)
         
         return relevant
@@ -318,16 +320,10 @@ class ConversationUpdater:
         achievements = []
         
         for activity in activities:
-            desc = activity.get('description', '').lower()
-            
-            if 'commit' in desc:
-                achievements.append("ביצוע שמירה בגיט")
-            elif 'קובץ' in desc and 'עודכן' in desc:
-                achievements.append(f"עדכון קובץ: {activity.get('file', 'קובץ')}")
-            elif 'claude' in desc:
-                achievements.append("שימוש במערכת Claude Code")
-            elif 'python' in desc:
-                achievements.append("הרצת סקריפט Python")
+            achievement = self.classifier.achievement(activity.get('description', ''),
+                                                      activity.get('file', 'קובץ'))
+            if achievement:
+                achievements.append(achievement)
         
         return achievements
     
@@ -394,34 +390,66 @@ class ConversationUpdater:
         
         return '\n'.join(formatted[:5])  # הגבל ל-5 פעילויות
     
-    def update_conversation_log(self, session_content):
-        """עדכון קובץ יומן השיחות"""
+    def update_conversation_log(self, session_content, session_num=None, activities_count=0):
+        """עדכון קובץ יומן השיחות
+
+        הסשן נשמר קודם במאגר ה-append-only (עם fsync), ורק אחר כך נכנס ליומן לפני
+        הסטטיסטיקות - רק זנב הקובץ נכתב מחדש, לא כל ההיסטוריה.
+        """
         try:
-            # קרא תוכן נוכחי
-            if self.conversation_log.exists():
-                with open(self.conversation_log, 'r', encoding='utf-8') as f:
-                    current_content = f.read()
-            else:
-                current_content = self._create_initial_log()
+            if session_num is None:
+                session_num = self._get_current_session_number()
             
-            # הוסף סשן חדש לפני הסטטיסטיקות
-            if "## 📈 **סטטיסטיקות" in current_content:
-                parts = current_content.split("## 📈 **סטטיסטיקות")
-                new_content = parts[0] + session_content + "\n## 📈 **סטטיסטיקות" + parts[1]
-            else:
-                new_content = current_content + session_content
+            self.session_store.append({
+                'session': session_num,
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'activities': activities_count,
+                'markdown': session_content
+            })
             
-            # שמור קובץ מעודכן
-            with open(self.conversation_log, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            written = self._render_session(session_content)
+            self.session_store.mark_rendered(session_num)
             
             print(f"✓ עודכן יומן השיחות עם סשן חדש")
+            self._report('session_created', file=self.conversation_log.name, session=session_num,
+                         bytes=written)
             return True
             
         except Exception as e:
             print(f"✗ שגיאה בעדכון יומן: {str(e)}")
             return False
     
+    def _render_session(self, session_content, replace_from=None):
+        """הכנסת סשן ליומן לפני הסטטיסטיקות - מחזיר כמה בייטים נכתבו"""
+        if not self.conversation_log.exists():
+            atomic_write_text(self.conversation_log, self._create_initial_log())
+        return insert_before_marker(self.conversation_log, session_content, STATISTICS_MARKER,
+                                    replace_from=replace_from)
+    
+    def _sync_log_with_store(self):
+        """השלמת הסשן האחרון מהמאגר אם הכתיבה שלו ליומן לא הסתיימה (קריסה באמצע)
+
+        רק סשן שלא סומן כ-rendered נבדק - סשן שנכתב במלואו לא משוחזר לעולם, כך
+        ששינויים ידניים ביומן (למשל סימון משימות) נשמרים. אם הכותרת שלו חסרה הוא
+        נוסף; אם הוא נקטע - העותק הקטוע מוחלף בעותק מהמאגר.
+        """
+        try:
+            pending = self.session_store.unrendered()
+            if not pending or not self.conversation_log.exists():
+                return False
+            markdown = pending['markdown']
+            repaired = not tail_contains(self.conversation_log, markdown,
+                                         tail_bytes=TAIL_BYTES + len(markdown.encode('utf-8')))
+            if repaired:
+                self._render_session(markdown,
+                                     replace_from=f"\n\n## 🎯 **Session #{pending['session']:03d}**")
+                print(f"[REPAIR] סשן #{pending['session']:03d} שוחזר ליומן מתוך המאגר")
+            self.session_store.mark_rendered(pending['session'])
+            return repaired
+        except Exception as e:
+            print(f"[WARNING] לא ניתן לסנכרן את היומן עם המאגר: {e}")
+            return False
+    
     def _create_initial_log(self):
         """יצירת יומן שיחות ראשוני אם לא קיים"""
         return f"""# 💬 יומן שיחות - Trading Project 002
@@ -448,33 +476,54 @@ class ConversationUpdater:
     
     def run_conversation_update(self):
         """הרצת עדכון מלא של יומן השיחות"""
+        with self._lock:
+            return self._run_conversation_update()
+    
+    def _run_conversation_update(self):
+        self._pending_offsets = {}
+        self._sync_log_with_store()
         print(f"[CONV] מתחיל עדכון יומן שיחות - Trading Project 002")
         print(f"[DATE] {datetime.now().strftime('%d בספטמבר %Y, %H:%M')}")
         print(f"עדכון אחרון: {self.last_update_time.strftime('%d/%m/%Y %H:%M')}")
         print("=" * 50)
+        started = time.monotonic()
+        self._report('conversations_started', since=self.last_update_time.isoformat())
         
         # סרוק פעילויות חדשות
         print("סורק פעילות בטרמינל...")
         activities = self.scan_terminal_history()
+        self._report('history_scanned', activities=len(activities),
+                     elapsed_ms=round((time.monotonic() - started) * 1000, 1))
         
         if not activities:
             print("[INFO] לא נמצאו פעילויות חדשות מאז העדכון האחרון")
+            # השורות שנקראו לא רלוונטיות - לא לקרוא אותן שוב
+            self._save_history_offsets()
+            self._report('conversations_finished', new_activities=0,
+                         elapsed_ms=round((time.monotonic() - started) * 1000, 1))
             return {'success': True, 'new_activities': 0}
         
         print(f"📄 נמצאו {len(activities)} פעילויות חדשות")
         
         # יצור סשן חדש
         print("[UPDATE] יוצר סשן חדש ביומן...")
+        session_num = self._get_current_session_number()
         session_content = self.create_new_session(activities)
         
         # עדכן יומן השיחות
-        if self.update_conversation_log(session_content):
+        if self.update_conversation_log(session_content, session_num, len(activities)):
+            # הסשן שנוסף ידוע - אין צורך לפרסר את היומן מחדש
+            self._state_cache.prime('session_number', [self.conversation_log], session_num + 1)
+            
             # שמור זמן עדכון
             self._save_last_update_time()
             
             print("=" * 50)
             print(f"[SUCCESS] יומן השיחות עודכן בהצלחה!")
             print(f"📋 פעילויות שנמצאו: {len(activities)}")
+            self._report('conversations_finished', new_activities=len(activities),
+                         session_created=True,
+                         elapsed_ms=round((time.monotonic() - started) * 1000, 1))
             
             return {
                 'success': True,
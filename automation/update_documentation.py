@@ -5,16 +5,77 @@ Documentation Updater for Trading Project 002
 """
 
 import os
+import argparse
 import json
-import markdown
 from datetime import datetime
 from pathlib import Path
-import shutil
-import hashlib
+import importlib.metadata
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    from .build_manifest import BuildManifest, hash_bytes, hash_text
+    from .page_template import (PageLayout, add_link_titles, nav_links_from_file_map, strip_volatile,
+                                stylesheet_href, write_stylesheet)
+    from .dependency_graph import DependencyGraph, extract_links
+    from .pagination import index_markdown, paginate, should_paginate
+    from .fragment_cache import FragmentCache
+    from .atomic_files import atomic_write_text, write_text_if_changed
+    from .search_index import SearchIndex
+except ImportError:
+    from build_manifest import BuildManifest, hash_bytes, hash_text
+    from page_template import (PageLayout, add_link_titles, nav_links_from_file_map, strip_volatile,
+                               stylesheet_href, write_stylesheet)
+    from dependency_graph import DependencyGraph, extract_links
+    from pagination import index_markdown, paginate, should_paginate
+    from fragment_cache import FragmentCache
+    from atomic_files import atomic_write_text, write_text_if_changed
+    from search_index import SearchIndex
+
+# גרסת המחולל - להעלות כשמשנים לוגיקה שמשפיעה על הפלט מחוץ לתבנית
+GENERATOR_VERSION = '5'
+
+# הרחבות markdown שבהן משתמשים בהמרה
+MARKDOWN_EXTENSIONS = ['tables', 'fenced_code']
+
+# תיקיית אינדקס החיפוש (יחסית לשורש הפרויקט) - מוגשת לדשבורד ע"י השרת
+SEARCH_DIR = 'search'
+
+# מתחת למספר הזה של קבצים לבנייה - המרה רגילה (הפעלת processes עולה יותר מהחיסכון)
+PARALLEL_MIN_FILES = 4
+
+
+def convert_markdown_file(md_file):
+    """קריאת קובץ MD והמרתו ל-HTML (גוף בלבד)
+
+    פונקציה ברמת המודול כדי שתעבור pickle ל-ProcessPoolExecutor.
+    מחזיר (md_content, html_content, convert_seconds).
+    """
+    started = time.monotonic()
+    with open(md_file, 'r', encoding='utf-8') as f:
+        md_content = f.read()
+    
+    # markdown נטען רק כשיש באמת מה להמיר
+    import markdown
+    html_content = markdown.markdown(md_content, extensions=MARKDOWN_EXTENSIONS)
+    return md_content, html_content, time.monotonic() - started
+
+
+def _process_pool(workers):
+    """pool להמרה - spawn ולא fork, כי התהליך הראשי הוא שרת עם threads"""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
 
 class DocumentationUpdater:
-    def __init__(self, project_root=None):
-        """אתחול מעדכן התיעוד"""
+    def __init__(self, project_root=None, progress=None, workers=1):
+        """אתחול מעדכן התיעוד
+
+        progress - callback אופציונלי progress(event, **data) לדיווח התקדמות
+        workers - מספר processes להמרה במקביל (1 = בלי pool, 0 = לפי מספר המעבדים)
+        """
         if project_root is None:
             # התיקייה הראשית של הפרויקט (אחד למעלה מ-automation)
             self.project_root = Path(__file__).parent.parent
@@ -23,57 +84,354 @@ class DocumentationUpdater:
         
         self.timestamp = datetime.now().strftime("%d בספטמבר %Y, %H:%M")
         self.updated_files = []
+        self.source_files = []
+        self.progress = progress
+        self.workers = workers or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        
+        # מניפסט בנייה - hash של המקור, התבנית והגדרות ההמרה לכל קובץ
+        self.manifest_path = self.project_root / "automation" / "build_manifest.json"
+        self.manifest = None
+        self._build_inputs = {}
+        self._page_titles = {}
+        self.layout = None
+        
+        # hash של קבצים לפי (mtime, גודל) - נשמר בין ריצות של אותו מופע
+        self._hash_cache = {}
+        
+        # מטמון גוף ה-HTML שהופק מכל מקור (בלי עטיפת העמוד)
+        self.fragment_cache = FragmentCache(str(self.project_root / "automation" / "fragment_cache"))
+        
+    def _report(self, event, **data):
+        """דיווח אירוע התקדמות (אם הוגדר callback)"""
+        if self.progress:
+            self.progress(event, **data)
         
     def scan_md_files(self):
         """סריקת כל קבצי .md בפרויקט"""
         md_files = []
-        for md_file in self.project_root.glob("*.md"):
+        for md_file in sorted(self.project_root.glob("*.md")):  # סדר קבוע בין ריצות
             if md_file.name not in ['README.md']:  # השאר README כמו שהוא
                 md_files.append(md_file)
         return md_files
     
     def check_if_update_needed(self, md_file):
         """בדיקה אם הקובץ זקוק לעדכון"""
-        html_file = md_file.with_suffix('.html')
+        return self.get_rebuild_reason(md_file) is not None
+    
+    def get_rebuild_reason(self, md_file):
+        """הסיבה לבנייה מחדש לפי המניפסט (None אם הפלט עדכני)
+
+        משווים hash של תוכן המקור, של התבנית ושל הגדרות ההמרה - לא זמני קבצים,
+        כך ש-git checkout או העתקה לא גורמים לבנייה מיותרת או מפוספסת.
+        """
+        inputs = {
+            'source': hash_bytes(md_file.read_bytes()),
+            'template': self._template_hash(),
+            'options': self._options_hash()
+        }
+        self._build_inputs[md_file.name] = inputs
         
-        if not html_file.exists():
+        return self._get_manifest().rebuild_reason(md_file.name, inputs, self._document_outputs(md_file))
+    
+    def _document_outputs(self, md_file):
+        """כל קבצי הפלט של מסמך - העמוד שלו ועמודי ה-_pNNN שנרשמו לו במניפסט"""
+        outputs = {md_file.with_suffix('.html')}
+        outputs.update(md_file.with_name(name)
+                       for name in self._get_manifest().get(md_file.name, 'outputs', []))
+        return sorted(outputs)
+    
+    def _get_manifest(self):
+        if self.manifest is None:
+            self.manifest = BuildManifest(self.manifest_path)
+        return self.manifest
+    
+    def _template_hash(self):
+        """hash של תבנית העמוד (שלד, סגנונות וניווט) - שינוי מחייב בנייה מחדש של כל העמודים"""
+        return hash_text(GENERATOR_VERSION + self._get_layout().signature)
+    
+    def _options_hash(self):
+        """hash של הגדרות ההמרה (הרחבות וגרסת markdown)"""
+        if not hasattr(self, '_cached_options_hash'):
+            try:
+                markdown_version = importlib.metadata.version('markdown')
+            except importlib.metadata.PackageNotFoundError:
+                markdown_version = 'unknown'
+            self._cached_options_hash = hash_text(json.dumps(
+                {'extensions': MARKDOWN_EXTENSIONS, 'markdown': markdown_version}, sort_keys=True))
+        return self._cached_options_hash
+    
+    def md_to_html(self, md_file, converted=None):
+        """המרת קובץ MD ל-HTML מעוצב
+
+        converted - תוצאת convert_markdown_file אם ההמרה כבר נעשתה ב-process אחר
+        """
+        started = time.monotonic()
+        try:
+            # קרא והמר תוכן MD (אם לא הומר כבר)
+            if converted is None:
+                converted = convert_markdown_file(md_file)
+                started = time.monotonic()
+            md_content, html_content, convert_seconds = converted
+            
+            # קבע כותרת מהקובץ או מהתוכן
+            title = self._extract_title(md_content, md_file.stem)
+            
+            # יצירת HTML מלא עם סגנון
+            full_html = self._create_full_html(html_content, title, md_file)
+            
+            # שמור HTML - רק אם התוכן השתנה (בלי להתחשב בזמן היצירה), ובכתיבה אטומית
+            html_file = md_file.with_suffix('.html')
+            written = write_text_if_changed(html_file, full_html, normalize=strip_volatile)
+            
+            # רשום במניפסט מאילו קלטים נבנה הפלט
+            inputs = self._build_inputs.get(md_file.name) or {
+                'source': hash_text(md_content),
+                'template': self._template_hash(),
+                'options': self._options_hash()
+            }
+            self._get_manifest().record(md_file.name, inputs, [html_file], title=title,
+                                        links=extract_links(html_content))
+            
+            if written:
+                print(f"[SUCCESS] עודכן: {html_file.name} מתוך {md_file.name}")
+                self.updated_files.append(html_file.name)
+            else:
+                print(f"[SAME] ללא שינוי בתוכן: {html_file.name} (לא נכתב)")
+            self.source_files.append(md_file.name)
+            self._report('file_converted', file=md_file.name, output=html_file.name, written=written,
+                         bytes=len(full_html.encode('utf-8')) if written else 0,
+                         elapsed_ms=round((convert_seconds + time.monotonic() - started) * 1000, 1))
             return True
             
-        # השווה timestamps
-        md_time = md_file.stat().st_mtime
-        html_time = html_file.stat().st_mtime
+        except Exception as e:
+            self._report_failure(md_file, e, started)
+            return False
+    
+    def _report_failure(self, md_file, error, started):
+        print(f"[ERROR] שגיאה בעדכון {md_file.name}: {str(error)}")
+        self._report('file_failed', file=md_file.name, error=str(error),
+                     elapsed_ms=round((time.monotonic() - started) * 1000, 1))
+    
+    def convert_files(self, md_files):
+        """המרת רשימת קבצים - במקביל ב-process pool אם הוגדרו workers
+
+        גוף HTML שכבר הומר מאותו מקור ועם אותן הגדרות נלקח ממטמון הפרגמנטים,
+        כך ששינוי בעטיפת העמוד לא מפעיל את markdown בכלל. את השאר ממירים
+        (ב-pool אם יש מספיק); כתיבת ה-HTML והמניפסט נעשות כאן, לפי סדר
+        הרשימה, כך ש-updated_files יוצא זהה להמרה רגילה. שגיאה בקובץ אחד
+        (כולל קריסת worker) מסמנת רק אותו כנכשל. מסמכים ארוכים נבנים כעמודים
+        נפרדים (build_paginated). מחזיר את מספר הקבצים שהומרו.
+        """
+        paginated = {md_file.name for md_file in md_files if should_paginate(md_file)}
+        regular = [md_file for md_file in md_files if md_file.name not in paginated]
+        converted = {md_file.name: self._cached_fragment(md_file) for md_file in regular}
+        to_convert = [md_file for md_file in regular if converted[md_file.name] is None]
+        if len(to_convert) < len(regular):
+            print(f"[CACHE] {len(regular) - len(to_convert)} קבצים ממטמון הפרגמנטים (בלי המרת markdown)")
+        
+        if self.workers <= 1 or len(to_convert) < PARALLEL_MIN_FILES:
+            updated_count = self._apply_conversions(md_files, converted, convert_markdown_file)
+        else:
+            workers = min(self.workers, len(to_convert))
+            print(f"[DOCS] ממיר {len(to_convert)} קבצים ב-{workers} processes")
+            with _process_pool(workers) as pool:
+                futures = {md_file.name: pool.submit(convert_markdown_file, md_file)
+                           for md_file in to_convert}
+                recovered = {}
+                
+                def convert(md_file):
+                    if md_file.name not in recovered:
+                        try:
+                            return futures[md_file.name].result()
+                        except BrokenProcessPool:
+                            # worker קרס - כל מה שלא הסתיים נשבר יחד איתו; ממירים אותם מחדש
+                            unfinished = [other for other in to_convert
+                                          if isinstance(futures[other.name].exception(), BrokenProcessPool)]
+                            recovered.update(self._convert_after_crash(unfinished, workers))
+                    result = recovered[md_file.name]
+                    if isinstance(result, Exception):
+                        raise result
+                    return result
+                
+                updated_count = self._apply_conversions(md_files, converted, convert)
+        
+        if to_convert or paginated:
+            self.fragment_cache.trim()
+        return updated_count
+    
+    def _convert_after_crash(self, md_files, workers):
+        """המרה מחדש של קבצים שה-pool שלהם קרס - {שם: תוצאה או Exception}
+
+        כל סבב רץ ב-pool חדש; קבצים שהסתיימו נשמרים והשאר עוברים לסבב הבא. סבב
+        שלא התקדם בכלל מריץ את הקובץ הראשון לבד - כך רק הקובץ שמפיל את ה-worker נכשל.
+        """
+        print(f"[WARNING] worker קרס - {len(md_files)} קבצים מומרים מחדש ב-pool חדש")
+        results = {}
+        groups = [list(md_files)]
+        while groups:
+            group = groups.pop(0)
+            with _process_pool(min(workers, len(group))) as pool:
+                futures = {md_file.name: pool.submit(convert_markdown_file, md_file) for md_file in group}
+            broken = []
+            for md_file in group:
+                try:
+                    results[md_file.name] = futures[md_file.name].result()
+                except BrokenProcessPool:
+                    broken.append(md_file)
+                except Exception as e:
+                    results[md_file.name] = e
+            
+            if not broken:
+                continue
+            if len(group) == 1:
+                results[group[0].name] = BrokenProcessPool(f"ה-worker קרס בהמרת {group[0].name}")
+            elif len(broken) == len(group):
+                # אף קובץ לא הסתיים - הראשון רץ לבד, והשאר אחריו
+                groups[:0] = [broken[:1], broken[1:]]
+            else:
+                groups.insert(0, broken)
+        return results
+    
+    def _apply_conversions(self, md_files, converted, convert):
+        """כתיבת העמודים לפי הסדר - convert(md_file) ממיר קובץ שלא נמצא במטמון"""
+        updated_count = 0
+        for md_file in md_files:
+            if md_file.name not in converted:
+                if self.build_paginated(md_file):
+                    updated_count += 1
+                continue
+            
+            started = time.monotonic()
+            result = converted[md_file.name]
+            if result is None:
+                try:
+                    result = convert(md_file)
+                except Exception as e:
+                    self._report_failure(md_file, e, started)
+                    continue
+                self._store_fragment(md_file, result[1])
+            
+            if self.md_to_html(md_file, result):
+                updated_count += 1
         
-        return md_time > html_time
+        return updated_count
     
-    def md_to_html(self, md_file):
-        """המרת קובץ MD ל-HTML מעוצב"""
+    def build_paginated(self, md_file):
+        """בניית מסמך ארוך כעמוד אינדקס ועמודים של N חלקים
+
+        לכל עמוד רשומה משלו במניפסט לפי hash של התוכן שלו, כך שסשן חדש ביומן
+        בונה רק את העמוד האחרון ואת האינדקס - העלות לא גדלה עם ההיסטוריה.
+        """
+        started = time.monotonic()
         try:
-            # קרא תוכן MD
             with open(md_file, 'r', encoding='utf-8') as f:
                 md_content = f.read()
             
-            # המר ל-HTML
-            html_content = markdown.markdown(md_content, extensions=['tables', 'fenced_code'])
+            preamble, pages = paginate(md_file.name, md_content)
+            if not pages:
+                # אין כותרות לחלק לפיהן - עמוד אחד רגיל
+                return self.md_to_html(md_file)
             
-            # קבע כותרת מהקובץ או מהתוכן
             title = self._extract_title(md_content, md_file.stem)
+            inputs = self._build_inputs.get(md_file.name) or {
+                'source': hash_text(md_content),
+                'template': self._template_hash(),
+                'options': self._options_hash()
+            }
+            # המסמך עצמו לא השתנה - נבנה רק כי כותרת של עמוד שהוא מקשר אליו השתנתה
+            rewrap = self._get_manifest().rebuild_reason(md_file.name, inputs,
+                                                         self._document_outputs(md_file)) is None
+            units = [(f"{md_file.name}#{page.filename}", md_file.with_name(page.filename), page.markdown,
+                      f"{title} - עמוד {page.number}") for page in pages]
+            units.append((f"{md_file.name}#index", md_file.with_suffix('.html'),
+                          index_markdown(preamble, pages), title))
             
-            # יצירת HTML מלא עם סגנון
-            full_html = self._create_full_html(html_content, title, md_file)
+            links = set()
+            rendered = 0
+            for key, output, text, page_title in units:
+                unit_links, unit_rendered = self._render_unit(md_file, key, output, text, page_title,
+                                                              force=rewrap)
+                links.update(unit_links)
+                rendered += unit_rendered
             
-            # שמור HTML
-            html_file = md_file.with_suffix('.html')
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(full_html)
+            # עמודים שכבר לא קיימים (המסמך התקצר)
+            current = {output.name for _, output, _, _ in units}
+            for old_page in sorted(md_file.parent.glob(f"{md_file.stem}_p[0-9][0-9][0-9].html")):
+                if old_page.name not in current:
+                    old_page.unlink()
+                    self._get_manifest().discard(f"{md_file.name}#{old_page.name}")
+                    self.updated_files.append(old_page.name)
+            
+            # כל העמודים נרשמים כפלט של המסמך - עמוד שנמחק מחייב בנייה גם כשהמקור לא השתנה
+            self._get_manifest().record(md_file.name, inputs, sorted(current),
+                                        title=title, links=sorted(links - current))
             
-            print(f"[SUCCESS] עודכן: {html_file.name} מתוך {md_file.name}")
-            self.updated_files.append(html_file.name)
+            print(f"[SUCCESS] {md_file.name}: {len(pages)} עמודים, {rendered} נבנו מחדש")
+            self.source_files.append(md_file.name)
+            self._report('file_converted', file=md_file.name, output=md_file.with_suffix('.html').name,
+                          pages=len(pages), pages_rendered=rendered,
+                          elapsed_ms=round((time.monotonic() - started) * 1000, 1))
             return True
             
         except Exception as e:
-            print(f"[ERROR] שגיאה בעדכון {md_file.name}: {str(e)}")
+            self._report_failure(md_file, e, started)
             return False
     
+    def _render_unit(self, md_file, key, output, text, title, force=False):
+        """בניית עמוד אחד של מסמך מחולק אם התוכן שלו השתנה - (קישורים, האם נבנה)"""
+        manifest = self._get_manifest()
+        source_hash = hash_text(text)
+        inputs = {'source': source_hash, 'template': self._template_hash(), 'options': self._options_hash()}
+        if not force and manifest.rebuild_reason(key, inputs, [output]) is None:
+            return manifest.get(key, 'links', []), False
+        
+        cache_key = hash_text(source_hash + inputs['options'])
+        html_content = self.fragment_cache.get(cache_key)
+        if html_content is None:
+            import markdown
+            html_content = markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS)
+            self.fragment_cache.put(cache_key, html_content)
+        
+        full_html = self._create_full_html(html_content, title, md_file)
+        if write_text_if_changed(output, full_html, normalize=strip_volatile):
+            self.updated_files.append(output.name)
+        
+        links = extract_links(html_content)
+        manifest.record(key, inputs, [output], title=title, links=links)
+        return links, True
+    
+    def _fragment_key(self, md_file):
+        """מפתח במטמון הפרגמנטים - hash של המקור ושל הגדרות ההמרה"""
+        inputs = self._build_inputs.get(md_file.name)
+        if not inputs:
+            return None
+        return hash_text(inputs['source'] + inputs['options'])
+    
+    def _cached_fragment(self, md_file):
+        """(md_content, html_content, 0) מהמטמון, או None אם צריך להמיר"""
+        key = self._fragment_key(md_file)
+        if key is None:
+            return None
+        
+        html_content = self.fragment_cache.get(key)
+        if html_content is None:
+            return None
+        try:
+            with open(md_file, 'r', encoding='utf-8') as f:
+                return f.read(), html_content, 0.0
+        except (OSError, UnicodeDecodeError):
+            return None
+    
+    def _store_fragment(self, md_file, html_content):
+        key = self._fragment_key(md_file)
+        if key is None:
+            return
+        try:
+            self.fragment_cache.put(key, html_content)
+        except OSError as e:
+            print(f"[WARNING] לא ניתן לשמור במטמון הפרגמנטים: {e}")
+    
     def _extract_title(self, md_content, default_title):
         """חילוץ כותרת מתוכן MD"""
         lines = md_content.split('\n')
@@ -85,269 +443,110 @@ class DocumentationUpdater:
     def _create_full_html(self, html_content, title, source_file):
         """יצירת HTML מלא עם סגנון מתואם"""
         file_stats = self._get_file_stats(source_file)
+        # קישורים לעמודים אחרים מקבלים את הכותרת שלהם - ולכן העמוד תלוי בה
+        html_content = add_link_titles(html_content, self._page_titles)
+        return self._get_layout().render(title, html_content, source_file.name,
+                                         file_stats['size_kb'], file_stats['modified'])
+    
+    def _get_layout(self):
+        """תבנית העמוד לריצה הנוכחית - ניווט מ-file_map.json וגיליון סגנונות משותף"""
+        if self.layout is None:
+            file_map = self._read_file_map()
+            nav_links = nav_links_from_file_map(file_map) if file_map else []
+            self.layout = PageLayout(stylesheet_href(), nav_links, self.timestamp)
+        return self.layout
+    
+    def _read_file_map(self):
+        """תוכן file_map.json, או None אם אין"""
+        file_map_path = self.project_root / "file_map.json"
+        if not file_map_path.exists():
+            return None
+        with open(file_map_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def plan_build(self, md_files, all_md_files=None):
+        """תוכנית הבנייה המינימלית - מה לבנות ולמה, לפני שמבצעים משהו
+
+        קובץ שהמקור, התבנית או הגדרות ההמרה שלו השתנו - נבנה. עמודים שתלויים
+        (לפי file_map.json והקישורים בעמודים שנוצרו) בעמוד שהכותרת שלו השתנתה,
+        או שנוסף/הוסר, נעטפים מחדש - גם אם הם מחוץ ל-md_files. תלויים שלא נוצרים
+        מ-MD (כמו הדשבורד) מדווחים כ-stale.
+        """
+        all_md_files = all_md_files if all_md_files is not None else md_files
+        manifest = self._get_manifest()
+        candidates = {md_file.name for md_file in md_files}
+        
+        build = {}
+        changed_pages = set()
+        self._page_titles = {}
+        for md_file in all_md_files:
+            page = md_file.with_suffix('.html').name.lower()
+            title = manifest.get(md_file.name, 'title')
+            if md_file.name in candidates:
+                reason = self.get_rebuild_reason(md_file)
+                if reason:
+                    build[md_file.name] = reason
+                if reason in ('new', 'source_changed'):
+                    try:
+                        with open(md_file, 'r', encoding='utf-8') as f:
+                            new_title = self._extract_title(f.read(), md_file.stem)
+                    except (OSError, UnicodeDecodeError):
+                        new_title = title
+                    if new_title != title:
+                        changed_pages.add(page)
+                        title = new_title
+            if title:
+                self._page_titles[page] = title
+        
+        # מקורות שנמחקו - העמוד שלהם נעלם
+        existing = {md_file.name for md_file in all_md_files}
+        removed = [name for name in manifest.entries if '#' not in name and name not in existing]
+        changed_pages.update(Path(name).with_suffix('.html').name.lower() for name in removed)
+        
+        # MD → העמוד שלו → עמודים שתלויים בו (file_map.json או קישור בגוף העמוד)
+        graph = DependencyGraph.from_file_map(self._read_file_map())
+        for md_file in all_md_files:
+            page = md_file.with_suffix('.html').name
+            graph.add_edge(md_file.name, page)
+            graph.add_links(page, manifest.get(md_file.name, 'links', []))
+        for name in removed:
+            graph.add_edge(name, Path(name).with_suffix('.html').name)
+        
+        # ממשיכים רק דרך עמודים שהכותרת שלהם באמת משתנה - עטיפה מחדש לא משנה כותרת
+        seeds = [name for name in list(build) + removed
+                 if Path(name).with_suffix('.html').name.lower() in changed_pages]
+        dependents = graph.dependents(seeds, expand=lambda node: node in changed_pages)
+        
+        by_page = {md_file.with_suffix('.html').name.lower(): md_file for md_file in all_md_files}
+        rewrap = {}
+        stale = {}
+        for page, cause in dependents.items():
+            if page in changed_pages:
+                continue
+            md_file = by_page.get(page)
+            if md_file is None:
+                stale[page] = cause
+            elif md_file.name not in build:
+                if md_file.name not in self._build_inputs:
+                    self.get_rebuild_reason(md_file)
+                rewrap[md_file.name] = cause
         
-        return f"""<!DOCTYPE html>
-<html lang="he" dir="rtl">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} - Trading Project 002</title>
-    <style>
-        * {{
-            box-sizing: border-box;
-            margin: 0;
-            padding: 0;
-        }}
-        
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-            color: #333;
-            line-height: 1.6;
-            margin: 0;
-            padding: 20px;
-            min-height: 100vh;
-        }}
-        
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 15px;
-            padding: 30px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-            position: relative;
-        }}
-        
-        .back-btn {{
-            position: absolute;
-            top: 20px;
-            right: 20px;
-            background: linear-gradient(45deg, #4caf50, #66bb6a);
-            color: white;
-            padding: 10px 15px;
-            border: none;
-            border-radius: 25px;
-            text-decoration: none;
-            font-weight: bold;
-            font-size: 14px;
-            transition: all 0.3s ease;
-        }}
-        
-        .back-btn:hover {{
-            background: linear-gradient(45deg, #66bb6a, #4caf50);
-            transform: translateY(-2px);
-            box-shadow: 0 5px 15px rgba(76, 175, 80, 0.4);
-        }}
-        
-        .header {{
-            text-align: center;
-            border-bottom: 3px solid #6f42c1;
-            padding-bottom: 20px;
-            margin-bottom: 30px;
-        }}
-        
-        .header h1 {{
-            color: #1e3c72;
-            font-size: 2.5em;
-            margin-bottom: 10px;
-            font-weight: 300;
-        }}
-        
-        .file-info {{
-            background: linear-gradient(120deg, #e3f2fd 0%, #bbdefb 100%);
-            padding: 15px;
-            border-radius: 10px;
-            margin: 20px 0;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            border-right: 4px solid #6f42c1;
-        }}
-        
-        h1, h2, h3 {{
-            color: #1e3c72;
-        }}
-        
-        h2 {{
-            border-right: 4px solid #6f42c1;
-            padding-right: 15px;
-            margin-top: 30px;
-        }}
-        
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-            background: white;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            border-radius: 8px;
-            overflow: hidden;
-        }}
-        
-        th, td {{
-            padding: 12px;
-            text-align: right;
-            border-bottom: 1px solid #ddd;
-        }}
-        
-        th {{
-            background: #f5f5f5;
-            font-weight: bold;
-            color: #333;
-        }}
-        
-        tr:hover {{
-            background: #f9f9f9;
-        }}
-        
-        code {{
-            background: #f5f5f5;
-            padding: 2px 6px;
-            border-radius: 4px;
-            font-family: 'Courier New', monospace;
-        }}
-        
-        pre {{
-            background: #f5f5f5;
-            padding: 15px;
-            border-radius: 8px;
-            overflow-x: auto;
-            border-right: 4px solid #6f42c1;
-        }}
-        
-        blockquote {{
-            border-right: 4px solid #6f42c1;
-            padding: 10px 20px;
-            margin: 20px 0;
-            background: #f9f9f9;
-            border-radius: 0 8px 8px 0;
-        }}
-        
-        ul, ol {{
-            padding-right: 30px;
-        }}
-        
-        li {{
-            margin-bottom: 8px;
-        }}
-        
-        .highlight {{
-            background: linear-gradient(120deg, #fff3cd 0%, #ffeaa7 100%);
-            padding: 15px;
-            border-radius: 8px;
-            border-right: 4px solid #ffc107;
-            margin: 15px 0;
-        }}
-        
-        .timestamp {{
-            text-align: center;
-            color: #666;
-            font-size: 0.9em;
-            margin-top: 30px;
-            padding-top: 20px;
-            border-top: 2px solid #eee;
-        }}
-        
-        .quick-access-section {{
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 15px;
-            padding: 25px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-            margin-top: 30px;
-        }}
-        
-        .quick-access-section h2 {{
-            color: #1e3c72;
-            margin-bottom: 20px;
-            text-align: center;
-        }}
-        
-        .quick-access {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 10px;
-        }}
-        
-        .quick-btn {{
-            background: linear-gradient(45deg, #6f42c1, #8e44ad);
-            color: white;
-            padding: 6px 10px;
-            border: none;
-            border-radius: 15px;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            font-weight: bold;
-            text-decoration: none;
-            text-align: center;
-            display: block;
-            font-size: 0.75em;
-        }}
-        
-        .quick-btn:hover {{
-            background: linear-gradient(45deg, #8e44ad, #6f42c1);
-            transform: translateY(-2px);
-            box-shadow: 0 5px 15px rgba(111, 66, 193, 0.4);
-        }}
-        
-        @media (max-width: 768px) {{
-            .container {{
-                padding: 20px;
-                margin: 10px;
-            }}
-            
-            .file-info {{
-                flex-direction: column;
-                gap: 10px;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <a href="project_dashboard.html" class="back-btn">🏠 חזרה לדשבורד</a>
-        
-        <div class="header">
-            <h1>{title}</h1>
-        </div>
-        
-        <div class="file-info">
-            <div><strong>📄 גודל קובץ:</strong> {file_stats['size_kb']} KB</div>
-            <div><strong>🕒 עודכן:</strong> {file_stats['modified']}</div>
-            <div><strong>🔄 נוצר אוטומטית מ:</strong> {source_file.name}</div>
-        </div>
-        
-        <div class="content">
-            {html_content}
-        </div>
-        
-        <!-- Quick Access Section -->
-        <div class="quick-access-section">
-            <h2>⚡ גישה מהירה</h2>
-            <div class="quick-access">
-                <a href="project_dashboard.html" class="quick-btn">🏠 דשבורד</a>
-                <a href="readme.html" class="quick-btn">📖 README</a>
-                <a href="prd.html" class="quick-btn">📋 PRD</a>
-                <a href="current_status.html" class="quick-btn">📊 מצב נוכחי</a>
-                <a href="conversation_log.html" class="quick-btn">💬 יומן שיחות</a>
-                <a href="tasks.html" class="quick-btn">🎯 משימות</a>
-                <a href="database.html" class="quick-btn">🗃️ מאגר נתונים</a>
-                <a href="strategy.html" class="quick-btn">[DOCS] אסטרטגיה</a>
-                <a href="statistics.html" class="quick-btn">📊 סטטיסטיקות</a>
-                <a href="interactive_brokers.html" class="quick-btn">🔗 IB חיבור</a>
-                <a href="file_map.html" class="quick-btn">🗂️ מפת קבצים</a>
-                <a href="rtl_editor.html" class="quick-btn">[UPDATE] RTL Editor</a>
-            </div>
-        </div>
-        
-        <div class="timestamp">
-            [DATE] HTML נוצר: {self.timestamp}<br>
-            🔄 עדכון אוטומטי מקובץ המקור<br>
-            🤖 נוצר על ידי מערכת העדכון האוטומטית
-        </div>
-    </div>
-</body>
-</html>"""
+        return {
+            'build': sorted(build.items()),
+            'rewrap': sorted(rewrap.items()),
+            'stale': sorted(stale.items()),
+            'unchanged': sorted(candidates - set(build) - set(rewrap))
+        }
+    
+    def _print_plan(self, plan):
+        print(f"[PLAN] לבנייה: {len(plan['build'])} | לעטיפה מחדש (תלויות): {len(plan['rewrap'])} | "
+              f"עדכניים: {len(plan['unchanged'])}")
+        for name, reason in plan['build']:
+            print(f"  [BUILD] {name}: {reason}")
+        for name, cause in plan['rewrap']:
+            print(f"  [REWRAP] {name}: תלוי בכותרת של {cause}")
+        for page, cause in plan['stale']:
+            print(f"  [STALE] {page}: תלוי ב-{cause} - לא נוצר אוטומטית, לבדיקה ידנית")
     
     def _get_file_stats(self, file_path):
         """קבלת סטטיסטיקות קובץ"""
@@ -360,77 +559,276 @@ class DocumentationUpdater:
         except:
             return {'size_kb': 0, 'modified': 'לא ידוע'}
     
+    def remove_outputs(self, names):
+        """מחיקת עמודי ה-HTML שנבנו ממקורות שנמחקו (כולל עמודי _pNNN) והרשומות שלהם במניפסט
+
+        נמחקים רק קבצים שהמניפסט רשם כפלט של המקור - לא קבצי HTML שנכתבו ידנית.
+        """
+        manifest = self._get_manifest()
+        for name in names:
+            outputs = []
+            for key in [key for key in manifest.entries if key.split('#', 1)[0] == name]:
+                for output in manifest.get(key, 'outputs', []):
+                    try:
+                        (self.project_root / output).unlink()
+                    except FileNotFoundError:
+                        continue
+                    outputs.append(output)
+                manifest.discard(key)
+            
+            self.updated_files.extend(outputs)
+            # גם מחיקת המקור עצמו נכנסת לסינכרון
+            self.source_files.append(name)
+            print(f"[SUCCESS] {name} נמחק - הוסרו {len(outputs)} עמודי HTML")
+            self._report('file_removed', file=name, outputs=outputs)
+    
+    def update_search_index(self, md_files, prune=False, removed=()):
+        """עדכון אינדקס החיפוש עבור מסמכים שהמקור שלהם השתנה - מחזיר את הקבצים שנכתבו
+
+        רק מסמכים שהתוכן שלהם השתנה מאונדקסים מחדש (במסמך מחולק - רק העמודים שהשתנו),
+        ורק shards שהתוכן שלהם השתנה נכתבים לדיסק.
+        """
+        started = time.monotonic()
+        try:
+            index = SearchIndex(str(self.project_root / SEARCH_DIR))
+            indexed = 0
+            for md_file in md_files:
+                inputs = self._build_inputs.get(md_file.name)
+                doc_id = md_file.with_suffix('.html').name
+                if not inputs or not index.needs_update(doc_id, inputs['source']):
+                    continue
+                try:
+                    with open(md_file, 'r', encoding='utf-8') as f:
+                        md_content = f.read()
+                except (OSError, UnicodeDecodeError):
+                    continue
+                title = self._extract_title(md_content, md_file.stem)
+                preamble, pages = paginate(md_file.name, md_content) if should_paginate(md_file) else ('', [])
+                if not pages:
+                    index.add_document(doc_id, md_content, inputs['source'], title=title)
+                    index.remove_pages(doc_id)
+                    indexed += 1
+                    continue
+                
+                # מסמך מחולק מאונדקס לפי עמודים - סשן חדש ביומן מאנדקס מחדש רק את העמוד האחרון
+                index.add_document(doc_id, index_markdown(preamble, pages), inputs['source'], title=title)
+                indexed += 1
+                for page in pages:
+                    page_hash = hash_text(page.markdown)
+                    if index.needs_update(page.filename, page_hash):
+                        index.add_document(page.filename, page.markdown, page_hash,
+                                           title=f"{title} - עמוד {page.number}", parent=doc_id)
+                        indexed += 1
+                index.remove_pages(doc_id, keep={page.filename for page in pages})
+            
+            for name in removed:
+                doc_id = Path(name).with_suffix('.html').name
+                index.remove_document(doc_id)
+                index.remove_pages(doc_id)
+            if prune:
+                index.prune({md_file.with_suffix('.html').name for md_file in md_files})
+            
+            written = [os.path.relpath(path, self.project_root).replace(os.sep, '/')
+                       for path in index.save()]
+            if written:
+                print(f"[SEARCH] אינדקס החיפוש עודכן ({indexed} מסמכים, {len(written)} קבצים)")
+            self._report('search_index_updated', documents=indexed, files_written=len(written),
+                         elapsed_ms=round((time.monotonic() - started) * 1000, 1))
+            return written
+            
+        except Exception as e:
+            print(f"[ERROR] שגיאה בעדכון אינדקס החיפוש: {str(e)}")
+            return []
+    
     def update_file_map(self):
-        """עדכון file_map.json עם הקבצים החדשים"""
+        """עדכון file_map.json - מעבר אחד על תיקיית הפרויקט, כתיבה רק אם משהו השתנה
+
+        לכל קובץ שמופיע במפה נשמרים גודל, hash של התוכן ומצב הקובץ המזווג;
+        last_modified מתעדכן רק כשהתוכן עצמו השתנה (לא כש-git checkout נוגע ב-mtime).
+        """
+        started = time.monotonic()
         try:
             file_map_path = self.project_root / "file_map.json"
             
             if file_map_path.exists():
                 with open(file_map_path, 'r', encoding='utf-8') as f:
-                    file_map = json.load(f)
+                    original = f.read()
+                file_map = json.loads(original)
             else:
-                return
+                return False
             
-            # עדכן תאריך עדכון אחרון
-            file_map["project_info"]["last_updated"] = datetime.now().strftime("%Y-%m-%d")
+            # מעבר יחיד על התיקייה - שמות וסטטיסטיקות של כל הקבצים
+            files = {}
+            with os.scandir(self.project_root) as scan:
+                for entry in scan:
+                    if entry.is_file():
+                        files[entry.name] = entry
+            
+            # עדכן רק רשומות שהמידע שלהן השתנה
+            changed_entries = 0
+            for section in file_map.get("file_structure", {}).values():
+                if not isinstance(section, dict):
+                    continue
+                for name, info in section.items():
+                    if isinstance(info, dict) and name in files:
+                        if self._refresh_file_entry(info, files[name], files):
+                            changed_entries += 1
             
             # עדכן סטטיסטיקות
-            html_files = len(list(self.project_root.glob("*.html")))
-            md_files = len(list(self.project_root.glob("*.md")))
+            html_files = sum(1 for name in files if name.endswith('.html'))
+            md_files = sum(1 for name in files if name.endswith('.md'))
             
             file_map["statistics"]["by_type"]["html"] = html_files
             file_map["statistics"]["by_type"]["markdown"] = md_files
             file_map["statistics"]["total_files"] = html_files + md_files + 1  # +1 for JSON
             
-            # שמור עדכון
-            with open(file_map_path, 'w', encoding='utf-8') as f:
-                json.dump(file_map, f, ensure_ascii=False, indent=4)
+            if json.dumps(file_map, ensure_ascii=False, indent=4) == original:
+                print("[SKIP] file_map.json עדכני")
+                return False
+            
+            # עדכן תאריך עדכון אחרון (רק כשיש שינוי אמיתי) ושמור
+            file_map["project_info"]["last_updated"] = datetime.now().strftime("%Y-%m-%d")
+            atomic_write_text(file_map_path, json.dumps(file_map, ensure_ascii=False, indent=4))
             
-            print(f"[SUCCESS] עודכן file_map.json")
+            print(f"[SUCCESS] עודכן file_map.json ({changed_entries} רשומות)")
+            self._report('file_map_updated', entries_changed=changed_entries,
+                         elapsed_ms=round((time.monotonic() - started) * 1000, 1))
+            return True
             
         except Exception as e:
             print(f"[ERROR] שגיאה בעדכון file_map: {str(e)}")
+            return False
+    
+    def _refresh_file_entry(self, info, entry, files):
+        """עדכון רשומת קובץ ב-file_map לפי מצבו בדיסק - מחזיר True אם משהו השתנה"""
+        stat = entry.stat()
+        content_hash = self._file_hash(entry.path, stat)
+        updates = {'size_bytes': stat.st_size, 'content_hash': content_hash}
+        
+        # תאריך שינוי רק כשהתוכן השתנה מאז הפעם הקודמת
+        if info.get('content_hash') not in (None, content_hash):
+            updates['last_modified'] = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d")
+        
+        if info.get('paired_file'):
+            updates['paired_status'] = 'ok' if info['paired_file'] in files else 'missing'
+        
+        changed = any(info.get(key) != value for key, value in updates.items())
+        info.update(updates)
+        return changed
+    
+    def _file_hash(self, path, stat):
+        """hash של תוכן קובץ - מחושב מחדש רק כש-mtime או הגודל השתנו"""
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._hash_cache.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        with open(path, 'rb') as f:
+            content_hash = hash_bytes(f.read())
+        self._hash_cache[path] = (signature, content_hash)
+        return content_hash
+    
+    def run_full_update(self, md_files=None, dry_run=False):
+        """הרצת עדכון מלא של כל התיעוד
+
+        md_files - שמות קבצי MD אופציונליים; אם ניתנו, רק הם (והעמודים התלויים בהם) נבנים.
+                   בכל ריצה עמודים של מקורות שנמחקו מוסרים (HTML, מניפסט ואינדקס החיפוש)
+        dry_run - רק חישוב והדפסת תוכנית הבנייה, בלי לכתוב דבר
+        """
+        with self._lock:
+            # מצב לכל ריצה - המופע עצמו משמש לאורך חיי השרת
+            self.timestamp = datetime.now().strftime("%d בספטמבר %Y, %H:%M")
+            self.updated_files = []
+            self.source_files = []
+            self.manifest = BuildManifest(self.manifest_path)
+            self._build_inputs = {}
+            self.layout = None
+            return self._run_full_update(md_files, dry_run)
     
-    def run_full_update(self):
-        """הרצת עדכון מלא של כל התיעוד"""
+    def _run_full_update(self, only_files, dry_run=False):
         print(f"[DOCS] מתחיל עדכון תיעוד - Trading Project 002")
         print(f"[DATE] {self.timestamp}")
         print("=" * 50)
+        started = time.monotonic()
         
         # סרוק קבצי MD
-        md_files = self.scan_md_files()
+        all_md_files = md_files = self.scan_md_files()
+        if only_files is not None:
+            only_files = set(only_files)
+            md_files = [md_file for md_file in md_files if md_file.name in only_files]
         print(f"נמצאו {len(md_files)} קבצי Markdown")
+        self._report('docs_started', files_found=len(md_files))
         
-        if not md_files:
+        # מקורות שנמחקו או ששמם שונה - יש להם רשומה במניפסט אבל אין קובץ MD
+        existing = {md_file.name for md_file in all_md_files}
+        removed = sorted(name for name in self._get_manifest().entries
+                         if '#' not in name and name not in existing)
+        
+        if not md_files and not removed:
             print("[INFO] לא נמצאו קבצי MD לעדכון")
+            self._report('docs_finished', files_updated=0,
+                         elapsed_ms=round((time.monotonic() - started) * 1000, 1))
             return {'success': True, 'files_updated': 0}
         
-        # עדכן כל קובץ שזקוק לכך
-        updated_count = 0
-        for md_file in md_files:
-            if self.check_if_update_needed(md_file):
-                if self.md_to_html(md_file):
-                    updated_count += 1
-            else:
-                print(f"[SKIP] מדולג: {md_file.name} (עדכני)")
+        # תוכנית בנייה - מה השתנה ומי תלוי בזה
+        plan = self.plan_build(md_files, all_md_files)
+        self._print_plan(plan)
+        self._report('build_plan', build=len(plan['build']), rewrap=len(plan['rewrap']),
+                     stale=len(plan['stale']), unchanged=len(plan['unchanged']))
+        if dry_run:
+            return {'success': True, 'dry_run': True, 'files_updated': 0, 'plan': plan}
+        
+        for name in plan['unchanged']:
+            self._report('file_skipped', file=name, reason='up_to_date')
+        
+        planned = {name for name, _ in plan['build'] + plan['rewrap']}
+        to_build = [md_file for md_file in all_md_files if md_file.name in planned]
+        if to_build:
+            write_stylesheet(self.project_root)
+        self.convert_files(to_build)
+        self.remove_outputs(removed)
+        # רק קבצים שנכתבו (או נמחקו) בפועל - המרה שיצאה זהה לקיים לא נספרת
+        updated_count = len(self.updated_files)
+        
+        # עדכן את אינדקס החיפוש - רק מסמכים שהתוכן שלהם השתנה, ובלי מסמכים שנמחקו
+        search_files = self.update_search_index(md_files, prune=only_files is None, removed=removed)
+        
+        # שמור מניפסט (בהרצה מלאה - גם ניקוי מקורות שנמחקו)
+        if only_files is None:
+            self.manifest.prune({md_file.name for md_file in md_files})
+        self.manifest.save()
         
         # עדכן file_map
-        self.update_file_map()
+        file_map_updated = self.update_file_map()
         
         print("=" * 50)
         print(f"[SUCCESS] הושלם! עודכנו {updated_count} קבצים")
         print(f"רשימת קבצים שעודכנו: {', '.join(self.updated_files) if self.updated_files else 'אף אחד'}")
+        self._report('docs_finished', files_updated=updated_count,
+                     elapsed_ms=round((time.monotonic() - started) * 1000, 1))
         
         return {
             'success': True,
             'files_updated': updated_count,
-            'updated_files': self.updated_files
+            'updated_files': self.updated_files,
+            'source_files': self.source_files,
+            'stylesheet': self.layout.stylesheet_href if self.layout else None,
+            'search_files': search_files,
+            'plan': plan,
+            'file_map_updated': file_map_updated
         }
 
 def main():
     """הרצה עצמאית"""
-    updater = DocumentationUpdater()
-    result = updater.run_full_update()
+    parser = argparse.ArgumentParser(description='עדכון תיעוד MD→HTML')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='מספר processes להמרה במקביל (0 = לפי מספר המעבדים)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='הצגת תוכנית הבנייה בלי לבנות')
+    args = parser.parse_args()
+    
+    updater = DocumentationUpdater(workers=args.jobs)
+    result = updater.run_full_update(dry_run=args.dry_run)
     
     if result['success']:
         print(f"\n🎉 עדכון התיעוד הושלם בהצלחה!")